@@ -22,16 +22,19 @@ from .npdist import Distribution
 
 # Order does not matter for these
 from .samplespace import ScalarSampleSpace, SampleSpace, CartesianProduct
+from .npbatch import DistributionBatch
 from .distconst import *
 from .bgm import *
 from .helpers import copypmf
 from .cdisthelpers import joint_from_factors
 from .algorithms import pruned_samplespace, expanded_samplespace
+from .planner import evaluate
 
 import dit.algorithms
 import dit.divergences
 import dit.example_dists
 import dit.inference
+import dit.local
 import dit.other
 import dit.pid
 import dit.profiles
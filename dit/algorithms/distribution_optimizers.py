@@ -225,10 +225,12 @@ class BaseDistOptimizer(BaseOptimizer):
         pmf[pmf < cutoff] = 0
         pmf /= pmf.sum()
 
-        new_dist = self.dist.copy()
-        new_dist.pmf = pmf.ravel()
+        new_dist = Distribution.from_dense_pmf(pmf, self.dist._sample_space,
+                                               prng=self.dist.prng)
+        new_dist._new_mask(from_mask=self.dist._mask)
         if sparse:
             new_dist.make_sparse()
+        new_dist._expand_outcomes()
 
         new_dist.set_rv_names(self.dist.get_rv_names())
 
@@ -5,10 +5,13 @@ Functions for computing minimal sufficient statistics.
 
 from collections import defaultdict
 
+import numpy as np
+
 from .lattice import dist_from_induced_sigalg, insert_join, insert_rv
 from .prune_expand import pruned_samplespace
 from ..helpers import flatten, parse_rvs, normalize_rvs
 from ..math import sigma_algebra
+from ..params import ditParams
 from ..samplespace import CartesianProduct
 
 __all__ = ['info_trim',
@@ -18,28 +21,6 @@ __all__ = ['info_trim',
           ]
 
 
-def partial_match(first, second, places):
-    """
-    Returns whether `second` is a marginal outcome at `places` of `first`.
-
-    Parameters
-    ----------
-    first : iterable
-        The un-marginalized outcome.
-    second : iterable
-        The smaller, marginalized outcome.
-    places : list
-        The locations of `second` in `first`.
-
-    Returns
-    -------
-    match : bool
-        Whether `first` and `second` match or not.
-
-    """
-    return tuple([first[i] for i in places]) == tuple(second)
-
-
 def mss_sigalg(dist, rvs, about=None, rv_mode=None):
     """
     Construct the sigma algebra for the minimal sufficient statistic of `rvs`
@@ -79,20 +60,26 @@ def mss_sigalg(dist, rvs, about=None, rv_mode=None):
     """
     mapping = parse_rvs(dist, rvs, rv_mode=rv_mode)[1]
 
-    partition = defaultdict(list)
-
-    md, cds = dist.condition_on(rvs=about, crvs=rvs, rv_mode=rv_mode)
-
-    for marg, cd in zip(md.outcomes, cds):
-        matches = [o for o in dist.outcomes if partial_match(o, marg, mapping)]
-        for c in partition.keys():
-            if c.is_approx_equal(cd):
-                partition[c].extend(matches)
+    # The outcomes of `dist`, grouped by their values of `rvs`.
+    matches = defaultdict(list)
+    for o in dist.outcomes:
+        matches[tuple([o[i] for i in mapping])].append(o)
+
+    md, cds = dist.condition_on(rvs=about, crvs=rvs, rv_mode=rv_mode,
+                                lazy=True)
+
+    # Group the rows of the conditional pmf that are approximately equal.
+    rtol, atol = ditParams['rtol'], ditParams['atol']
+    partition = []
+    for marg, row in zip(md.outcomes, cds.pmf):
+        for c, part in partition:
+            if np.allclose(c, row, rtol=rtol, atol=atol):
+                part.extend(matches[tuple(marg)])
                 break
         else:
-            partition[cd].extend(matches)
+            partition.append((row, list(matches[tuple(marg)])))
 
-    mss_sa = sigma_algebra(map(frozenset, partition.values()))
+    mss_sa = sigma_algebra(frozenset(part) for _, part in partition)
 
     return mss_sa
 
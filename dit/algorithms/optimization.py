@@ -23,11 +23,14 @@ from boltons.iterutils import pairwise
 import numpy as np
 from scipy.optimize import basinhopping, differential_evolution, minimize
 
-from .. import Distribution, insert_rvf, modify_outcomes
+from .. import insert_rvf, modify_outcomes
+from ..distconst import CodedRVFunction
 from ..algorithms.channelcapacity import channel_capacity
 from ..exceptions import ditException, OptimizationException
-from ..helpers import flatten, normalize_rvs, parse_rvs
+from ..helpers import flatten, group_codes, normalize_rvs, parse_rvs
 from ..math import prod, sample_simplex
+from ..npdist import Distribution
+from ..samplespace import CartesianProduct
 from ..utils import partitions, powerset
 from ..utils.optimization import (BasinHoppingCallBack,
                                   BasinHoppingInnerCallBack,
@@ -45,7 +48,48 @@ __all__ = [
 ]
 
 
-svdvals = lambda m: np.linalg.svd(m, compute_uv=False)
+def _uniquifier_rvf(dist, var, unq):
+    """
+    Construct a random variable numbering the joint values of `var`.
+
+    This is equivalent to calling `unq` on the values of `var` in each outcome
+    of `dist`, in order, but is evaluated on the integer codes of the outcomes.
+
+    Parameters
+    ----------
+    dist : Distribution
+        The distribution the random variable will be added to.
+    var : tuple
+        The indices of the random variables whose values are numbered.
+    unq : Uniquifier
+        The Uniquifier recording the numbering.
+
+    Returns
+    -------
+    func : CodedRVFunction
+        The random variable function.
+    """
+    alphabets = dist._sample_space.alphabets
+
+    def func(codes):
+        n = len(codes[0])
+        uniques, inverse = group_codes([codes[i] for i in var], n)
+
+        # number the values in order of first appearance, as unq would.
+        first = np.full(len(uniques), n, dtype=int)
+        np.minimum.at(first, inverse, np.arange(n))
+        order = np.argsort(first, kind='mergesort')
+        rank = np.empty(len(order), dtype=int)
+        for j in order:
+            rank[j] = unq(tuple(alphabets[i][c] for i, c in zip(var, uniques[j])))
+
+        return rank[inverse]
+
+    def scalar(outcome):
+        return (unq(tuple(outcome[i] for i in var)),)
+
+    return CodedRVFunction(func, alphabets, range(len(dist)), scalar=scalar)
+
 
 class BaseOptimizer(with_metaclass(ABCMeta, object)):
     """
@@ -86,7 +130,7 @@ class BaseOptimizer(with_metaclass(ABCMeta, object)):
         self._unqs = []
         for var in self._true_rvs + [self._true_crvs]:
             unq = Uniquifier()
-            self._dist = insert_rvf(self._dist, lambda x: (unq(tuple(x[i] for i in var)),))
+            self._dist = insert_rvf(self._dist, _uniquifier_rvf(self._dist, var, unq))
             self._unqs.append(unq)
 
         self._dist.make_dense()
@@ -570,41 +614,16 @@ class BaseOptimizer(with_metaclass(ABCMeta, object)):
         mc : func
             The maximum correlation.
         """
-        idx_xy = tuple(self._all_vars - (rv_x | rv_y))
-        idx_x = tuple(self._all_vars - rv_x)
-        idx_y = tuple(self._all_vars - rv_y)
-
-        def maximum_correlation(pmf):
-            """
-            Compute the specified maximum correlation.
-
-            Parameters
-            ----------
-            pmf : np.ndarray
-                The joint probability distribution.
-
-            Returns
-            -------
-            mi : float
-                The mutual information.
-            """
-            pmf_xy = pmf.sum(axis=idx_xy)
-            pmf_x = pmf.sum(axis=idx_x)[:, np.newaxis]
-            pmf_y = pmf.sum(axis=idx_y)[np.newaxis, :]
-
-            Q = pmf_xy / (np.sqrt(pmf_x)*np.sqrt(pmf_y))
-            Q[np.isnan(Q)] = 0
-
-            mc = svdvals(Q)[1]
-
-            return mc
-
-        return maximum_correlation
+        return self._conditional_maximum_correlation(rv_x, rv_y, set())
 
     def _conditional_maximum_correlation(self, rv_x, rv_y, rv_z):
         """
         Compute the conditional maximum correlation.
 
+        The second singular values for all values of Z are computed at once,
+        and for large alphabets each evaluation starts from the singular
+        vectors found by the previous one.
+
         Parameters
         ----------
         rv_x : collection
@@ -619,9 +638,15 @@ class BaseOptimizer(with_metaclass(ABCMeta, object)):
         cmc : func
             The conditional maximum correlation.
         """
-        idx_xyz = tuple(self._all_vars - (rv_x | rv_y | rv_z))
-        idx_xz = tuple(self._all_vars - (rv_x | rv_z))
-        idx_yz = tuple(self._all_vars - (rv_y | rv_z))
+        # Imported here, as dit.divergences imports this module.
+        from ..divergences.maximum_correlation import (_correlation_matrices,
+                                                       _second_singular_values)
+
+        rvs = [sorted(rv) for rv in (rv_x, rv_y, rv_z)]
+        kept = sorted(rv_x | rv_y | rv_z)
+        idx_xyz = tuple(self._all_vars - set(kept))
+        axes = [kept.index(i) for rv in rvs for i in rv]
+        state = {}
 
         def conditional_maximum_correlation(pmf):
             """
@@ -634,16 +659,18 @@ class BaseOptimizer(with_metaclass(ABCMeta, object)):
 
             Returns
             -------
-            mi : float
-                The mutual information.
+            cmc : float
+                The conditional maximum correlation.
             """
-            p_xyz = pmf.sum(axis=idx_xyz)
-            p_xz = pmf.sum(axis=idx_xz)[:, np.newaxis, :]
-            p_yz = pmf.sum(axis=idx_yz)[np.newaxis, :, :]
+            p_xyz = pmf.sum(axis=idx_xyz).transpose(axes)
+            shape = p_xyz.shape
+            sizes = [int(np.prod(shape[:len(rvs[0])])),
+                     int(np.prod(shape[len(rvs[0]):len(shape) - len(rvs[2])])),
+                     int(np.prod(shape[len(shape) - len(rvs[2]):]))]
+            Q, u, v = _correlation_matrices(p_xyz.reshape(sizes))
+            sigmas, state['guess'] = _second_singular_values(Q, u, v, state.get('guess'))
 
-            Q = np.where(p_xyz, p_xyz / (np.sqrt(p_xz * p_yz)), 0)
-
-            cmc = max([svdvals(np.squeeze(m))[1] for m in np.dsplit(Q, Q.shape[2])])
+            cmc = sigmas.max()
 
             return cmc
 
@@ -1249,13 +1276,20 @@ class BaseAuxVarOptimizer(BaseNonConvexOptimizer):
             string = False
 
         joint = self.construct_full_joint(x)
-        outcomes, pmf = zip(*[(o, p) for o, p in np.ndenumerate(joint) if p > cutoff])
+        joint = np.where(joint > cutoff, joint, 0.0)
+
+        # restrict each variable to the symbols that remain after the cutoff
+        support = [np.unique(idx) for idx in np.nonzero(joint)]
+        joint = joint[np.ix_(*support)]
 
         # normalize, in case cutoffs removed a significant amount of pmf
-        pmf = np.asarray(pmf)
-        pmf /= pmf.sum()
+        joint /= joint.sum()
 
-        d = Distribution(outcomes, pmf)
+        sample_space = CartesianProduct([tuple(s.tolist()) for s in support])
+        # Outcomes are only built for the support.
+        d = Distribution.from_dense_pmf(joint, sample_space)
+        d.make_sparse()
+        d._expand_outcomes()
 
         mapping = {}
         for i, unq in zip(sorted(self._n + i for i in self._rvs | self._crvs), self._unqs):
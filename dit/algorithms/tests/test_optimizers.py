@@ -50,6 +50,15 @@ def test_maxent_2():
     assert d2.is_approx_equal(d1_maxent, rtol=1e-3, atol=1e-3)
 
 
+def test_maxent_outcomes():
+    """
+    Test that the outcomes of the maximum entropy distribution are a tuple.
+    """
+    d = maxent_dist(Xor(), [[0, 1], [1, 2]])
+    assert isinstance(d.outcomes, tuple)
+    assert isinstance(d.outcomes[:2], tuple)
+
+
 @pytest.mark.slow
 def test_maxent_3():
     """
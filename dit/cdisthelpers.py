@@ -3,10 +3,13 @@ Helper functions related to conditional distributions.
 
 """
 
+from itertools import compress
+
 import numpy as np
 
 from .exceptions import ditException
 from .helpers import copypmf
+from .npcdist import ConditionalDistribution
 
 import dit
 
@@ -20,6 +23,15 @@ def cdist_array(cdists, base='linear', mode='asis'):
     Returns a 2D array for P(Y|X). Rows are X, columns are Y.
 
     """
+    if isinstance(cdists, ConditionalDistribution):
+        if mode == 'dense':
+            return cdists.to_array(base=base, dense=True)
+        # Sparse rows are trimmed, so they match the array only if no
+        # conditional probability is null.
+        null = np.isclose(cdists.pmf, cdists.ops.zero)
+        if mode == 'asis' and not (cdists.is_sparse() and null.any()):
+            return cdists.to_array(base=base)
+
     dists = [copypmf(d, base=base, mode=mode) for d in cdists]
     return np.vstack(dists)
 
@@ -83,20 +95,31 @@ def joint_from_factors(mdist, cdists, strict=True):
 
     """
     # We assume that the mask is the same each dist in cdists.
-    cdist_mask = cdists[0]._mask
+    if isinstance(cdists, ConditionalDistribution):
+        # Work with the array, rather than building each distribution.
+        first = cdists.dist
+        YgX_pmf = cdists.to_array(base='linear')
+        if cdists.is_sparse():
+            keep = ~np.isclose(cdists.pmf, cdists.ops.zero)
+        else:
+            keep = np.ones(YgX_pmf.shape, dtype=bool)
+    else:
+        first = cdists[0]
+        YgX_pmf = cdist_array(cdists)
+        keep = None
+    cdist_mask = first._mask
 
     # Raise exception if mdist and cdists are not compatible.
-    compatible = mask_is_complementary(mdist._mask, cdists[0]._mask)
+    compatible = mask_is_complementary(mdist._mask, first._mask)
     if strict and not compatible:
         msg = 'Incompatible masks for ``mdist`` and ``cdists``.'
         raise ditException(msg)
 
     if not compatible:
         cdist_mask = [True] * mdist.outcome_length()
-        cdist_mask.extend([False] * cdists[0].outcome_length())
+        cdist_mask.extend([False] * first.outcome_length())
 
     # Make sure mdist has the proper number of outcomes.
-    YgX_pmf = cdist_array(cdists)
     if len(mdist) != YgX_pmf.shape[0]:
         # Maybe it is not trim.
         mdist = mdist.copy(base='linear')
@@ -119,21 +142,29 @@ def joint_from_factors(mdist, cdists, strict=True):
     # The joint probabilities
     XY_pmf = YgX_pmf * X_pmf[:, np.newaxis]
 
-    ctor = cdists[0]._outcome_ctor
+    ctor = first._outcome_ctor
     # We can't use NumPy for the outcomes, since an array of tuples is
     # automatically turned into a 2D array. We could initialize as a 1D
     # object array, but we'd still have to populate through for loops.
     # So we might as well avoid NumPy here.
     outcomes = []
     for i, X in enumerate(X_outcomes):
-        tmp = [ctor(outcome_iter(X, Y, cdist_mask)) for Y in cdists[i].outcomes]
+        if keep is None:
+            Y_outcomes = cdists[i].outcomes
+        else:
+            Y_outcomes = compress(first.outcomes, keep[i])
+        tmp = [ctor(outcome_iter(X, Y, cdist_mask)) for Y in Y_outcomes]
         outcomes.extend(tmp)
 
-    d = dit.Distribution(outcomes, list(XY_pmf.flat),
-                         sparse=True, trim=False)
+    if keep is None:
+        XY_pmf = list(XY_pmf.flat)
+    else:
+        XY_pmf = list(XY_pmf[keep])
+
+    d = dit.Distribution(outcomes, XY_pmf, sparse=True, trim=False)
 
     X_rv_names = mdist.get_rv_names()
-    Y_rv_names = cdists[0].get_rv_names()
+    Y_rv_names = first.get_rv_names()
     if X_rv_names and Y_rv_names:
         rv_names = outcome_iter(X_rv_names, Y_rv_names, cdist_mask)
         d.set_rv_names(list(rv_names))
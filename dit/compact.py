@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compact, integer-coded storage for the outcomes of joint distributions.
+
+A distribution with many outcomes spends most of its memory on the outcome
+objects themselves and on the dictionary mapping them to their positions. When
+the sample space is a Cartesian product, an outcome is fully determined by the
+position of each of its symbols within the alphabet of its random variable.
+`CompactOutcomes` stores only those positions, as one small unsigned integer
+array per random variable, and builds outcome objects on demand.
+
+Since the alphabets of a Cartesian product are ordered, the codes of an
+outcome are also its mixed-radix index within the sample space. So sorting by
+codes is the same as sorting by the sample space, and lookups can be done with
+a binary search over those indexes. That is what `CompactIndex` does.
+
+"""
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:
+    # Py 2.x and < 3.3
+    from collections import Mapping, Sequence
+
+import numpy as np
+from six.moves import map, range, zip # pylint: disable=redefined-builtin
+
+from .helpers import get_outcome_ctor
+
+__all__ = [
+    'CompactOutcomes',
+    'CompactIndex',
+]
+
+
+def code_dtype(n):
+    """
+    Returns the smallest unsigned integer dtype able to code `n` symbols.
+
+    Parameters
+    ----------
+    n : int
+        The size of the alphabet.
+
+    Returns
+    -------
+    dtype : np.dtype
+        The dtype of the codes.
+
+    """
+    return np.min_scalar_type(max(n - 1, 0))
+
+
+class CompactOutcomes(Sequence):
+    """
+    An immutable sequence of outcomes, stored as integer codes.
+
+    Attributes
+    ----------
+    codes : tuple of NumPy arrays
+        For each random variable, the position of its symbol in its alphabet
+        for every outcome.
+
+    alphabets : tuple of tuples
+        The alphabet of each random variable.
+
+    outcome_class : class
+        The class of the outcomes.
+
+    """
+    # Outcomes are decoded in chunks while iterating, to bound memory usage.
+    _chunk = 2**16
+
+    def __init__(self, codes, alphabets, outcome_class, length=None):
+        """
+        Initialize the outcomes.
+
+        Parameters
+        ----------
+        codes : sequence of arrays
+            For each random variable, the codes of its symbols.
+        alphabets : sequence of sequences
+            The alphabet of each random variable.
+        outcome_class : class
+            The class of the outcomes.
+        length : int, None
+            The number of outcomes. This is required only when there are no
+            random variables, and is otherwise taken from `codes`.
+
+        """
+        self.alphabets = tuple(tuple(alphabet) for alphabet in alphabets)
+        self.codes = tuple(np.asarray(c, dtype=code_dtype(len(alphabet)))
+                           for c, alphabet in zip(codes, self.alphabets))
+        self.outcome_class = outcome_class
+        self._ctor = get_outcome_ctor(outcome_class)
+        self._lookups = None
+        self._index = None
+        if length is None:
+            length = len(self.codes[0])
+        self._length = length
+
+    @classmethod
+    def from_product(cls, alphabets, outcome_class):
+        """
+        Returns every outcome of the Cartesian product of `alphabets`.
+
+        Parameters
+        ----------
+        alphabets : sequence of sequences
+            The alphabet of each random variable.
+        outcome_class : class
+            The class of the outcomes.
+
+        Returns
+        -------
+        outcomes : CompactOutcomes
+            The outcomes, in the order of the Cartesian product.
+
+        """
+        sizes = tuple(len(alphabet) for alphabet in alphabets)
+        length = int(np.prod(sizes, dtype=int))
+        codes = np.unravel_index(np.arange(length), sizes) if sizes else ()
+        return cls(codes, alphabets, outcome_class, length=length)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(np.arange(self._length)[i])
+        outcome = [alphabet[c[i]]
+                   for alphabet, c in zip(self.alphabets, self.codes)]
+        return self._ctor(outcome)
+
+    def __iter__(self):
+        if not self.codes:
+            for _ in range(self._length):
+                yield self._ctor(())
+            return
+
+        for start in range(0, self._length, self._chunk):
+            stop = start + self._chunk
+            columns = [list(map(alphabet.__getitem__, c[start:stop].tolist()))
+                       for alphabet, c in zip(self.alphabets, self.codes)]
+            for outcome in zip(*columns):
+                yield self._ctor(outcome)
+
+    def __contains__(self, outcome):
+        return outcome in self._get_index()
+
+    def __eq__(self, other):
+        if isinstance(other, CompactOutcomes):
+            return (self.alphabets == other.alphabets and
+                    len(self) == len(other) and
+                    all(np.array_equal(a, b)
+                        for a, b in zip(self.codes, other.codes)))
+        elif isinstance(other, (tuple, list)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __add__(self, other):
+        return tuple(self) + tuple(other)
+
+    def __radd__(self, other):
+        return tuple(other) + tuple(self)
+
+    def __repr__(self):
+        return '<{0}: {1} outcomes>'.format(self.__class__.__name__, len(self))
+
+    def index(self, outcome, *args):
+        """
+        Returns the position of `outcome`.
+
+        """
+        idx = self._get_index().get(outcome, None)
+        if idx is None:
+            raise ValueError('{0!r} is not in outcomes'.format(outcome))
+        return idx
+
+    def _get_index(self):
+        """
+        Returns the `CompactIndex` of the outcomes, building it only once.
+
+        """
+        if self._index is None:
+            self._index = CompactIndex(self)
+        return self._index
+
+    def encode(self, outcome):
+        """
+        Returns the codes of `outcome`, or `None` if it cannot be encoded.
+
+        Parameters
+        ----------
+        outcome : outcome
+            The outcome to encode.
+
+        Returns
+        -------
+        codes : tuple of int, None
+            The position of each symbol of `outcome` in its alphabet.
+
+        """
+        if self._lookups is None:
+            self._lookups = [dict(zip(alphabet, range(len(alphabet))))
+                             for alphabet in self.alphabets]
+        try:
+            if len(outcome) != len(self._lookups):
+                return None
+            return tuple(lookup[symbol]
+                         for lookup, symbol in zip(self._lookups, outcome))
+        except (KeyError, TypeError):
+            return None
+
+    def ravel(self):
+        """
+        Returns the index of each outcome within the Cartesian product.
+
+        Returns
+        -------
+        keys : NumPy array, shape (len(self),)
+            The mixed-radix index of each outcome.
+
+        Raises
+        ------
+        ValueError
+            If the Cartesian product is too large to be indexed by 64-bit
+            integers.
+
+        """
+        if not self.codes:
+            return np.zeros(self._length, dtype=int)
+        sizes = tuple(len(alphabet) for alphabet in self.alphabets)
+        return np.ravel_multi_index(self.codes, sizes)
+
+    def take(self, indexes):
+        """
+        Returns the outcomes at `indexes`.
+
+        Parameters
+        ----------
+        indexes : NumPy array
+            The integer positions, or a boolean mask, of the outcomes to keep.
+
+        Returns
+        -------
+        outcomes : CompactOutcomes
+            The selected outcomes.
+
+        """
+        indexes = np.asarray(indexes)
+        if indexes.dtype == bool:
+            length = int(indexes.sum())
+        else:
+            length = len(indexes)
+        codes = [c[indexes] for c in self.codes]
+        return CompactOutcomes(codes, self.alphabets, self.outcome_class,
+                               length=length)
+
+    def insert(self, i, codes):
+        """
+        Returns the outcomes with a new outcome inserted before position `i`.
+
+        Parameters
+        ----------
+        i : int
+            The position of the new outcome.
+        codes : tuple of ints
+            The codes of the new outcome, as returned by `encode`.
+
+        Returns
+        -------
+        outcomes : CompactOutcomes
+            The outcomes, including the new one.
+
+        """
+        columns = [np.insert(c, i, code) for c, code in zip(self.codes, codes)]
+        return CompactOutcomes(columns, self.alphabets, self.outcome_class,
+                               length=self._length + 1)
+
+
+class CompactIndex(Mapping):
+    """
+    A mapping from outcomes to their position in a `CompactOutcomes`.
+
+    The mixed-radix index of each outcome is computed on the first lookup.
+    Afterwards, lookups are binary searches over those indexes.
+
+    """
+    def __init__(self, outcomes):
+        self._outcomes = outcomes
+        self._keys = None
+        self._order = None
+        self._dict = None
+
+    def _prepare(self):
+        try:
+            keys = self._outcomes.ravel()
+        except ValueError:
+            # The sample space is too large for 64-bit indexes.
+            outcomes = self._outcomes
+            self._dict = dict(zip(outcomes, range(len(outcomes))))
+            return
+
+        if len(keys) > 1 and not np.all(keys[1:] > keys[:-1]):
+            self._order = np.argsort(keys, kind='mergesort')
+            keys = keys[self._order]
+        self._keys = keys
+
+    def __getitem__(self, outcome):
+        if self._keys is None and self._dict is None:
+            self._prepare()
+        if self._dict is not None:
+            return self._dict[outcome]
+
+        codes = self._outcomes.encode(outcome)
+        if codes is None:
+            raise KeyError(outcome)
+        if codes:
+            sizes = tuple(map(len, self._outcomes.alphabets))
+            key = np.ravel_multi_index(codes, sizes)
+        else:
+            key = 0
+
+        pos = int(np.searchsorted(self._keys, key))
+        if pos == len(self._keys) or self._keys[pos] != key:
+            raise KeyError(outcome)
+        if self._order is not None:
+            pos = int(self._order[pos])
+        return pos
+
+    def __iter__(self):
+        return iter(self._outcomes)
+
+    def __len__(self):
+        return len(self._outcomes)
@@ -19,9 +19,10 @@ from random import randint
 from .distribution import BaseDistribution
 from .exceptions import ditException
 from .helpers import parse_rvs
-from .npdist import Distribution
-from .npscalardist import ScalarDistribution
-from .utils import digits, powerset
+from .npdist import Distribution, _independent_product
+from .npscalardist import ScalarDistribution, _dense_product
+from .samplespace import CartesianProduct, SampleSpace
+from .utils import OrderedDict, digits, powerset
 from .validate import validate_pmf
 
 
@@ -36,6 +37,7 @@ __all__ = [
     'uniform_distribution',
     'uniform_scalar_distribution',
     'insert_rvf',
+    'CodedRVFunction',
     'RVFunctions',
     'product_distribution',
     'uniform',
@@ -566,6 +568,163 @@ def uniform(outcomes, base=None):
     return d
 
 
+class CodedRVFunction(object):
+    """
+    A random variable function which is evaluated on integer-coded outcomes.
+
+    Rather than being called once per outcome, the function receives all the
+    outcomes of a distribution as one array of codes per random variable, and
+    returns the code of the new random variable for each outcome. A code is
+    the index of a symbol within an alphabet, so the input codes index
+    `alphabets`, the alphabets of the sample space, and the output codes index
+    `alphabet`. This lets `insert_rvf` add the new random variable without any
+    Python calls per outcome.
+
+    Instances remain callable on a single outcome, so they can be used
+    wherever a random variable function is expected.
+
+    Attributes
+    ----------
+    alphabets : tuple of tuples
+        The alphabets of the random variables the function is applied to.
+
+    alphabet : tuple
+        The alphabet of the new random variable.
+
+    """
+    def __init__(self, func, alphabets, alphabet, ctor=tuple, scalar=None):
+        """
+        Initialize the random variable function.
+
+        Parameters
+        ----------
+        func : callable
+            A function which takes a list of code arrays, one per random
+            variable, and returns an integer array with the code of the new
+            random variable for each outcome.
+        alphabets : sequence of sequences
+            The alphabets indexed by the input codes.
+        alphabet : sequence
+            The alphabet indexed by the output codes.
+        ctor : callable
+            The outcome constructor used when called on a single outcome.
+        scalar : callable, None
+            An equivalent function of a single outcome. If `None`, then single
+            outcomes are encoded and passed to `func`.
+
+        """
+        self.func = func
+        self.alphabets = tuple(tuple(alphabet) for alphabet in alphabets)
+        self.alphabet = tuple(alphabet)
+        self.ctor = ctor
+        self._scalar = scalar
+        self._lookups = None
+
+    @classmethod
+    def from_table(cls, table, alphabets, alphabet, ctor=tuple):
+        """
+        Returns a random variable function defined by a lookup table.
+
+        Parameters
+        ----------
+        table : np.ndarray
+            An integer array with one axis per random variable, whose shape
+            is the sizes of `alphabets`. Each element is the code of the new
+            random variable for the corresponding outcome.
+        alphabets : sequence of sequences
+            The alphabets of the random variables.
+        alphabet : sequence
+            The alphabet of the new random variable.
+        ctor : callable
+            The outcome constructor used when called on a single outcome.
+
+        Returns
+        -------
+        func : CodedRVFunction
+            The random variable function.
+
+        """
+        table = np.asarray(table, dtype=int)
+
+        def func(codes):
+            return table[tuple(codes)]
+
+        return cls(func, alphabets, alphabet, ctor)
+
+    def codes(self, codes):
+        """
+        Returns the code of the new random variable for each outcome.
+
+        Parameters
+        ----------
+        codes : list of np.ndarray
+            For each random variable, the index of its symbol in its alphabet.
+
+        Returns
+        -------
+        new : np.ndarray
+            The index of the new symbol in `alphabet`, for each outcome.
+
+        """
+        return np.asarray(self.func(codes), dtype=int)
+
+    def __call__(self, outcome):
+        if self._scalar is not None:
+            return self._scalar(outcome)
+
+        if self._lookups is None:
+            self._lookups = [dict(zip(alphabet, range(len(alphabet))))
+                             for alphabet in self.alphabets]
+        codes = [np.array([lookup[symbol]])
+                 for lookup, symbol in zip(self._lookups, outcome)]
+        return self.ctor([self.alphabet[self.codes(codes)[0]]])
+
+
+def _insert_coded_rvfs(d, funcs, index):
+    """
+    Returns `d` with the random variables of coded functions added at `index`.
+
+    Returns `None` if the functions cannot be evaluated on the codes of `d`.
+
+    """
+    ss = d._sample_space
+    if not isinstance(d, Distribution) or \
+       not isinstance(ss, CartesianProduct) or \
+       any(isinstance(alphabet, SampleSpace) for alphabet in ss.alphabets):
+        return None
+    alphabets = tuple(tuple(alphabet) for alphabet in ss.alphabets)
+    if not all(isinstance(func, CodedRVFunction) and func.alphabets == alphabets
+               for func in funcs):
+        return None
+
+    columns = list(d._alphabet_codes())
+    alphabets = list(alphabets)
+    new_columns = [func.codes(columns) for func in funcs]
+    new_alphabets = [func.alphabet for func in funcs]
+
+    if index == -1:
+        index = len(columns)
+    else:
+        # Match the slicing in `insert_rvf`.
+        index = len(range(len(columns))[:index])
+    columns[index:index] = new_columns
+    alphabets[index:index] = new_alphabets
+
+    # Like the outcomes themselves, keep only the symbols which appear.
+    for i, (column, alphabet) in enumerate(zip(columns, alphabets)):
+        used = np.unique(column)
+        alphabets[i] = [alphabet[j] for j in used]
+        columns[i] = np.searchsorted(used, column)
+
+    d2 = Distribution.from_codes(np.column_stack(columns), alphabets,
+                                 pmf=d.pmf.copy(), base=d.get_base(),
+                                 outcome_class=d._outcome_class,
+                                 validate=False)
+    if not d.is_compact():
+        d2._expand_outcomes()
+    return d2
+
+
 def insert_rvf(d, func, index=-1):
     """
     Returns a new distribution with an added random variable at index `index`.
@@ -584,7 +743,9 @@ def insert_rvf(d, func, index=-1):
         value will be added to the outcome using `__add__`, and so it should be
         a hashable, orderable sequence (as every outcome must be). If a list of
         callables is provided, then multiple random variables are added
-        simultaneously and will appear in the same order as the list.
+        simultaneously and will appear in the same order as the list. If every
+        function is a `CodedRVFunction` over the sample space of `d`, then the
+        functions are evaluated on integer codes rather than on each outcome.
     index : int
         The index at which to insert the random variable. A value of -1 is
         will append the random variable to the end.
@@ -612,6 +773,11 @@ def insert_rvf(d, func, index=-1):
     else:
         funcs = func
 
+    # Coded functions add their random variables without iterating outcomes.
+    d2 = _insert_coded_rvfs(d, funcs, index)
+    if d2 is not None:
+        return d2
+
     partial_outcomes = [map(func, d.outcomes) for func in funcs]
 
     # Now "flatten" the new contributions.
@@ -674,6 +840,101 @@ class RVFunctions(object):
         self.ctor = d._outcome_ctor
         self.outcome_class = d._outcome_class
 
+        # Functions are coded when the sample space is a Cartesian product.
+        ss = d._sample_space
+        if isinstance(ss, CartesianProduct) and \
+           not any(isinstance(alphabet, SampleSpace) for alphabet in ss.alphabets):
+            self.sample_space = ss
+        else:
+            self.sample_space = None
+
+    def _coded(self, func, alphabet, scalar):
+        """
+        Returns `scalar` as a coded function, if the sample space allows it.
+
+        """
+        if self.sample_space is None:
+            return scalar
+        return CodedRVFunction(func, self.sample_space.alphabets, alphabet,
+                               self.ctor, scalar=scalar)
+
+    def _bit_alphabet(self):
+        """
+        Returns the alphabet of boolean random variables.
+
+        """
+        return (0, 1) if self.is_int else ('0', '1')
+
+    def _keys(self, outcomes):
+        """
+        Returns the sorted sample space indexes of `outcomes`, and the order
+        which sorts `outcomes`. Outcomes not in the sample space are dropped.
+
+        """
+        ss = self.sample_space
+        outcomes = [outcome for outcome in outcomes if outcome in ss]
+        keys = ss.index_many(outcomes) if outcomes else np.zeros(0, dtype=int)
+        order = np.argsort(keys, kind='mergesort')
+        return keys[order], order
+
+    def from_codes(self, func, alphabet):
+        """
+        Returns a random variable function evaluated on integer-coded outcomes.
+
+        Parameters
+        ----------
+        func : callable
+            A function which takes a list of code arrays, one per random
+            variable, where codes index the alphabets of the sample space. It
+            returns an integer array of indexes into `alphabet`.
+        alphabet : sequence
+            The alphabet of the new random variable.
+
+        Returns
+        -------
+        func : CodedRVFunction
+            The random variable function.
+
+        Raises
+        ------
+        ditException
+            If the sample space is not a Cartesian product.
+
+        """
+        if self.sample_space is None:
+            raise ditException('Coded functions require a Cartesian product.')
+        return CodedRVFunction(func, self.sample_space.alphabets, alphabet,
+                               self.ctor)
+
+    def from_table(self, table, alphabet):
+        """
+        Returns a random variable function defined by a lookup table.
+
+        Parameters
+        ----------
+        table : np.ndarray
+            An integer array with one axis per random variable, indexed by
+            the codes of the symbols in the alphabets of the sample space.
+            Each element is an index into `alphabet`.
+        alphabet : sequence
+            The alphabet of the new random variable.
+
+        Returns
+        -------
+        func : CodedRVFunction
+            The random variable function.
+
+        Raises
+        ------
+        ditException
+            If the sample space is not a Cartesian product.
+
+        """
+        if self.sample_space is None:
+            raise ditException('Coded functions require a Cartesian product.')
+        return CodedRVFunction.from_table(table, self.sample_space.alphabets,
+                                          alphabet, self.ctor)
+
     def xor(self, indices):
         """
         Returns a callable which returns the logical XOR of the given indices.
@@ -710,7 +971,20 @@ class RVFunctions(object):
                 result = outcome[indices[0]] != outcome[indices[1]]
                 return str(int(result))
 
-        return func
+        i, j = indices[0], indices[1]
+        if self.sample_space is None or \
+           not -self.L <= min(i, j) <= max(i, j) < self.L:
+            # The function may be meant for distributions with more variables.
+            return func
+
+        alphabets = self.sample_space.alphabets
+        table = np.array([[x != y for y in alphabets[j]] for x in alphabets[i]],
+                         dtype=int)
+
+        def coded(codes):
+            return table[codes[i], codes[j]]
+
+        return self._coded(coded, self._bit_alphabet(), func)
 
     def from_mapping(self, mapping, force=True):
         """
@@ -773,7 +1047,36 @@ class RVFunctions(object):
         def func(outcome):
             return mapping[outcome]
 
-        return func
+        if self.sample_space is None or not mapping:
+            return func
+        try:
+            if any(len(value) != 1 for value in mapping.values()):
+                # Values adding several random variables are not coded.
+                return func
+        except TypeError:
+            return func
+
+        ss = self.sample_space
+        keys, order = self._keys(list(mapping))
+        if not len(keys):
+            return func
+        values = [mapping[key][0] for key in mapping if key in ss]
+        alphabet = list(OrderedDict.fromkeys(values))
+        lookup = dict(zip(alphabet, range(len(alphabet))))
+        codes = np.array([lookup[value] for value in values], dtype=int)[order]
+
+        def coded(columns):
+            idx = ss.ravel(columns)
+            pos = np.searchsorted(keys, idx).clip(0, len(keys) - 1)
+            missing = keys[pos] != idx
+            if missing.any():
+                j = np.flatnonzero(missing)[0]
+                outcome = self.ctor([alphabet_i[c[j]] for alphabet_i, c
+                                     in zip(ss.alphabets, columns)])
+                raise KeyError(outcome)
+            return codes[pos]
+
+        return self._coded(coded, alphabet, func)
 
     def from_partition(self, partition):
         """
@@ -890,7 +1193,16 @@ class RVFunctions(object):
             def func(outcome):
                 result = outcome in outcomes
                 return str(int(result))
-        return func
+
+        if self.sample_space is None:
+            return func
+
+        keys, _ = self._keys(outcomes)
+
+        def coded(codes):
+            return np.in1d(self.sample_space.ravel(codes), keys)
+
+        return self._coded(coded, self._bit_alphabet(), func)
 
 
 def product_distribution(dist, rvs=None, rv_mode=None, base=None):
@@ -956,18 +1268,30 @@ def product_distribution(dist, rvs=None, rv_mode=None, base=None):
     ctor = dist._outcome_ctor
     ops = dist.ops
 
-    outcomes = []
-    pmf = []
-    for pairs in product(*[marg.zipped() for marg in marginals]):
-        outcome = []
-        prob = []
-        for pair in pairs:
-            outcome.extend(pair[0])
-            prob.append(pair[1])
-        outcomes.append(ctor(outcome))
-        pmf.append(ops.mult_reduce(prob))
-
-    d = Distribution(outcomes, pmf, validate=False)
+    if (all(isinstance(marg._sample_space, CartesianProduct)
+            for marg in marginals) and _dense_product(marginals)):
+        # The product pmf is the outer product of the dense marginals.
+        factors = []
+        for marg in marginals:
+            marg.make_dense()
+            factors.append((marg._sample_space.alphabets, marg.pmf))
+        d = _independent_product(factors, ops, dist._product)
+        d.make_sparse()
+        if not dist.is_compact():
+            d._expand_outcomes()
+    else:
+        outcomes = []
+        pmf = []
+        for pairs in product(*[marg.zipped() for marg in marginals]):
+            outcome = []
+            prob = []
+            for pair in pairs:
+                outcome.extend(pair[0])
+                prob.append(pair[1])
+            outcomes.append(ctor(outcome))
+            pmf.append(ops.mult_reduce(np.array(prob)))
+
+        d = Distribution(outcomes, pmf, base=ops.get_base(), validate=False)
 
     # Maybe we should use ditParams['base'] when base is None?
     if base is not None:
@@ -41,6 +41,10 @@ from .maximum_correlation import (
     maximum_correlation,
 )
 
+from .pairwise import (
+    pairwise_divergence,
+)
+
 from .variational_distance import (
     bhattacharyya_coefficient,
     chernoff_information,
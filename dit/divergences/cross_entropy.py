@@ -4,35 +4,22 @@ The cross entropy.
 
 import numpy as np
 
-from ..exceptions import InvalidOutcome
-from ..helpers import normalize_rvs
+from ..helpers import normalize_rvs, outcome_columns, parse_rvs
 from ..utils import flatten, unitful
 
 __all__ = ('cross_entropy',
           )
 
 
-def get_prob(d, o):
+def _marginal(d, rvs, rv_mode=None):
     """
-    Get the probability of `o`, if it's not in the sample space return 0.
-
-    Parameters
-    ----------
-    d : Distribution
-        The distribution to get the outcomes of.
-    o : object
-        The event to get the probability of.
-
-    Returns
-    -------
-    p : float
-        The probability of `o`.
+    The marginal of `d` on `rvs`, which is `d` itself if `rvs` are all of its
+    random variables.
     """
-    try:
-        p = d[o]
-    except InvalidOutcome:
-        p = 0
-    return p
+    indexes = parse_rvs(d, rvs, rv_mode)[1]
+    if indexes == tuple(range(d.outcome_length())):
+        return d
+    return d.marginal(rvs, rv_mode)
 
 
 def get_pmfs_like(d1, d2, rvs, rv_mode=None):
@@ -63,11 +50,13 @@ def get_pmfs_like(d1, d2, rvs, rv_mode=None):
     qs : ndarray
         A matching pmf from d2.
     """
-    dp = d1.marginal(rvs, rv_mode)
-    dq = d2.marginal(rvs, rv_mode)
+    dp = _marginal(d1, rvs, rv_mode)
+    dq = _marginal(d2, rvs, rv_mode)
     ps = dp.pmf
-    qs = np.asarray([get_prob(dq, o) for o in dp.outcomes])
-    return ps, qs
+    outcomes, (cols_p, cols_q) = outcome_columns([dp, dq])
+    qs = np.zeros(len(outcomes))
+    qs[cols_q] = dq.pmf
+    return ps, qs[cols_p]
 
 
 @unitful
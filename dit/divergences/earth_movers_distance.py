@@ -1,12 +1,37 @@
 """
 Implementation of the Earth Mover's Distance.
+
+The Earth Mover's Distance is the optimal value of a transportation problem.
+Two cases have closed forms: unit distances between distinct outcomes, where
+it is the variational distance, and numerical outcomes on the line, where it
+is the area between the two cumulative distribution functions. Otherwise the
+transportation problem is solved exactly with the network simplex method, or
+approximately with the Sinkhorn iteration of its entropically regularized
+form.
 """
 
+from __future__ import division
+
+import warnings
+
 import numpy as np
-from scipy.optimize import linprog
 
+from ..exceptions import ditException
 from ..helpers import normalize_pmfs, numerical_test
 
+__all__ = ('earth_movers_distance',
+           'earth_movers_distance_pmf',
+           'earth_movers_distance_pmfs',
+          )
+
+
+# The number of entries of the (pairs, m, n) arrays of a block of Sinkhorn.
+_BLOCK_ENTRIES = 2**22
+
+# The largest shifted distance, over the regularization, for which the
+# Sinkhorn kernel is computed directly: exp(-700) is still a normal float.
+_KERNEL_LIMIT = 700
+
 
 def categorical_distances(n):
     """
@@ -16,7 +41,7 @@ def categorical_distances(n):
     ----------
     n : int
         The size of the matrix.
-    
+
     Returns
     -------
     ds : np.ndarray
@@ -35,53 +60,392 @@ def numerical_distances(x_values, y_values):
         The real values on the x dimension.
     y_values : np.ndarray
         The real values on the y dimension.
-    
+
     Returns
     -------
     ds : np.ndarray
-        The matrix of distances.
+        The matrix of distances, whose entry (i, j) is
+        abs(x_values[i] - y_values[j]).
     """
-    xx, yy = np.meshgrid(x_values, y_values)
-    return abs(xx - yy)
+    return abs(np.subtract.outer(np.asarray(x_values, dtype=float),
+                                 np.asarray(y_values, dtype=float)))
 
 
-def earth_movers_distance_pmf(x, y, distances=None):
+def _categorical(ps, qs):
     """
-    Compute the Earth Mover's Distance between `p` and `q`.
+    The Earth Mover's Distance under unit distances between distinct
+    outcomes, which is the variational distance.
 
     Parameters
     ----------
-    p : np.ndarray
-        The first pmf.
-    q : np.ndarray
-        The second pmf.
-    distances : np.ndarray, None
-        The cost of moving probability from p[i] to q[j]. If None,
-        the cost is assumed to be i != j.
+    ps : np.ndarray, shape (..., n)
+        The first pmfs.
+    qs : np.ndarray, shape (..., n)
+        The second pmfs.
+
+    Returns
+    -------
+    emd : np.ndarray, shape (...)
+        The Earth Mover's Distance between each pair of pmfs.
+    """
+    return np.clip(ps - qs, 0, None).sum(axis=-1)
+
+
+def _line(x_values, ps, y_values, qs):
+    """
+    The Earth Mover's Distance between pmfs on the real line, which is the
+    area between their cumulative distribution functions.
+
+    Parameters
+    ----------
+    x_values : np.ndarray, shape (m,)
+        The outcomes of the first pmfs.
+    ps : np.ndarray, shape (..., m)
+        The first pmfs.
+    y_values : np.ndarray, shape (n,)
+        The outcomes of the second pmfs.
+    qs : np.ndarray, shape (..., n)
+        The second pmfs.
+
+    Returns
+    -------
+    emd : np.ndarray, shape (...)
+        The Earth Mover's Distance between each pair of pmfs.
+    """
+    values = np.concatenate([x_values, y_values]).astype(float)
+    order = np.argsort(values, kind='mergesort')
+    shape = np.broadcast(ps[..., 0], qs[..., 0]).shape
+    masses = np.concatenate([np.broadcast_to(ps, shape + ps.shape[-1:]),
+                             -np.broadcast_to(qs, shape + qs.shape[-1:])],
+                            axis=-1)
+    cdfs = np.cumsum(masses[..., order], axis=-1)[..., :-1]
+    return np.dot(abs(cdfs), np.diff(values[order]))
+
+
+def _network_simplex(p, q, distances):
+    """
+    Solve the transportation problem from `p` to `q` exactly.
+
+    The basis is a spanning tree of the supply and demand nodes, stored by
+    parent pointers, subtree sizes and a preorder of the nodes, in which each
+    subtree is contiguous. It starts from an artificial root, with an arc of
+    high cost from each supply node to it and from it to each demand node, so
+    that the initial tree is strongly feasible. The entering arc is the one
+    of most negative reduced cost among the first block of rows of the
+    distance matrix, searched cyclically, which has any; the leaving arc is
+    the last blocking arc of the cycle, which keeps the tree strongly
+    feasible and so prevents cycling [Ahuja, Magnanti and Orlin, "Network
+    Flows", 1993]. Each pivot costs a walk around the cycle, and a few array
+    operations to move the subtree cut off by the leaving arc.
+
+    Parameters
+    ----------
+    p : np.ndarray, shape (m,)
+        The supplies.
+    q : np.ndarray, shape (n,)
+        The demands.
+    distances : np.ndarray, shape (m, n)
+        The cost of moving a unit of probability from p[i] to q[j].
 
     Returns
     -------
     emd : float
-        The Earth Mover's Distance.
+        The cost of the optimal transport plan.
     """
-    n = len(x)
+    rows, cols = np.flatnonzero(p > 0), np.flatnonzero(q > 0)
+    if not len(rows) or not len(cols):
+        return 0.0
+    C = np.asarray(distances, dtype=float)[np.ix_(rows, cols)]
+    supply = p[rows]
+    demand = q[cols] * (supply.sum() / q[cols].sum())
+    m, n = C.shape
+
+    # Nodes 0 to m - 1 are supplies, m to m + n - 1 demands, and m + n is the
+    # root. Each other node has an arc to its parent: arc[u] is the index
+    # i * n + j of the arc from supply i to demand j, or -1 if artificial,
+    # and up[u] is whether it points from u to its parent. The subtree of u
+    # is order[pos[u]:pos[u] + size[u]].
+    root = m + n
+    big = (abs(C).max() + 1) * (root + 1)
+    parent = [root] * root + [-1]
+    arc = [-1] * root
+    up = [True] * m + [False] * n
+    flow = list(supply) + list(demand)
+    size = [1] * root + [root + 1]
+    order = np.roll(np.arange(root + 1), 1)
+    pos = np.argsort(order)
+    pi = np.concatenate([-big * np.ones(m), big * np.ones(n), [0]])
+
+    tol = 1e-12 * big
+    block = max(1, int(np.sqrt(m * n)) // n)
+    start = 0
+    while True:
+        # Find the entering arc from supply i to demand j.
+        for _ in range(0, m, block):
+            stop = min(start + block, m)
+            reduced = C[start:stop] + pi[start:stop, np.newaxis] - pi[m:root]
+            k = reduced.argmin()
+            sigma = reduced.flat[k]
+            i, j = start + k // n, m + k % n
+            start = stop % m
+            if sigma < -tol:
+                break
+        else:
+            break
+
+        # Find the apex of the cycle made by the entering arc, the first
+        # ancestor of i whose subtree contains j.
+        apex, at = i, pos[j]
+        while not pos[apex] <= at < pos[apex] + size[apex]:
+            apex = parent[apex]
+
+        # Find the last blocking arc, going around the cycle from the apex.
+        delta = np.inf
+        u = i
+        while u != apex:
+            if up[u] and flow[u] < delta:
+                delta, out, side = flow[u], u, i
+            u = parent[u]
+        u = j
+        while u != apex:
+            if not up[u] and flow[u] <= delta:
+                delta, out, side = flow[u], u, j
+            u = parent[u]
+
+        if delta > 0:
+            u = i
+            while u != apex:
+                flow[u] += -delta if up[u] else delta
+                u = parent[u]
+            u = j
+            while u != apex:
+                flow[u] += delta if up[u] else -delta
+                u = parent[u]
+
+        # Hang the subtree cut off by the leaving arc from the entering arc,
+        # reversing the path from the entering arc to the leaving arc.
+        other = j if side == i else i
+        path = [side]
+        while path[-1] != out:
+            path.append(parent[path[-1]])
+        cut, start_cut = size[out], pos[out]
+
+        # The new preorder of the subtree: each node of the path, followed by
+        # its descendants off of the path, from the entering arc down.
+        pieces = [order[pos[side]:pos[side] + size[side]]]
+        for below, u in zip(path, path[1:]):
+            pieces.append(order[pos[u]:pos[below]])
+            pieces.append(order[pos[below] + size[below]:pos[u] + size[u]])
+        subtree = np.concatenate(pieces)
+
+        u = parent[out]
+        while u != apex:
+            size[u] -= cut
+            u = parent[u]
+        u = other
+        while u != apex:
+            size[u] += cut
+            u = parent[u]
+
+        new = (other, i * n + j - m, side == i, delta, cut)
+        for u in path:
+            old = (parent[u], arc[u], up[u], flow[u], size[u])
+            parent[u], arc[u], up[u], flow[u], size[u] = new
+            new = (u, old[1], not old[2], old[3], cut - old[4])
+
+        rest = np.concatenate([order[:start_cut], order[start_cut + cut:]])
+        at = pos[other] + 1 - (cut if pos[other] > start_cut else 0)
+        order = np.concatenate([rest[:at], subtree, rest[at:]])
+        pos[order] = np.arange(root + 1)
+        pi[subtree] += -sigma if side == i else sigma
+
+    flows = [(arc[u], flow[u]) for u in range(root) if arc[u] >= 0]
+    if not flows:
+        return 0.0
+    arcs, flows = zip(*flows)
+    return float(np.dot(C.flat[list(arcs)], flows))
+
+
+def _log_sum_exp(a, axis):
+    """
+    log(exp(a).sum(axis)), without overflow.
+    """
+    top = a.max(axis=axis, keepdims=True)
+    top[~np.isfinite(top)] = 0
+    with np.errstate(divide='ignore'):
+        return np.log(np.exp(a - top).sum(axis=axis)) + top.squeeze(axis)
+
+
+def _sinkhorn(ps, qs, distances, epsilon, tol=1e-9, max_iter=10000):
+    """
+    Solve the entropically regularized transportation problems from each of
+    `ps` to each of `qs` with the Sinkhorn iteration.
+
+    Shifting a row or a column of the distances changes the cost of every
+    transport plan equally, so they are shifted to have a zero in each row
+    and column. If the kernel exp(-distances / regularization) then has no
+    entry too small for floating point, the pairs are scaled all at once by
+    matrix products with it. Otherwise the dual potentials are updated in
+    the log domain, a block of pairs at a time.
+
+    Parameters
+    ----------
+    ps : np.ndarray, shape (N, m)
+        The first pmfs.
+    qs : np.ndarray, shape (N, n)
+        The second pmfs.
+    distances : np.ndarray, shape (m, n)
+        The cost of moving a unit of probability from p[i] to q[j].
+    epsilon : float
+        The strength of the regularization, relative to the largest distance.
+    tol : float
+        The largest violation of the marginals of a returned transport plan.
+    max_iter : int
+        The largest number of iterations.
+
+    Returns
+    -------
+    emd : np.ndarray, shape (N,)
+        The cost of each regularized transport plan.
+    """
+    C = np.asarray(distances, dtype=float)
+    m, n = C.shape
+    reg = epsilon * max(abs(C).max(), 1e-300)
+    shifted = C - C.min(axis=1)[:, np.newaxis]
+    shifted = (shifted - shifted.min(axis=0)) / reg
+
+    converged = True
+    if shifted.max() < _KERNEL_LIMIT:
+        K = np.exp(-shifted)
+        P, Q = ps.T, qs.T
+        v = np.ones_like(Q)
+        for iteration in range(max_iter):
+            u = P / np.maximum(np.dot(K, v), 1e-300)
+            v = Q / np.maximum(np.dot(K.T, u), 1e-300)
+            if iteration % 10 == 0:
+                # The columns match Q, so check the rows against P.
+                error = abs(u * np.dot(K, v) - P).sum(axis=0).max()
+                if error < tol:
+                    break
+        else:
+            converged = False
+        emds = (u * np.dot(K * C, v)).sum(axis=0)
+
+    else:
+        with np.errstate(divide='ignore'):
+            log_ps, log_qs = np.log(ps), np.log(qs)
+        emds = np.empty(len(ps))
+        step = max(1, _BLOCK_ENTRIES // (m * n))
+        for start in range(0, len(ps), step):
+            block = slice(start, start + step)
+            p, log_p, log_q = ps[block], log_ps[block], log_qs[block]
+            g = np.zeros(log_q.shape)
+            for iteration in range(max_iter):
+                f = log_p - _log_sum_exp(g[:, np.newaxis, :] - shifted, 2)
+                g = log_q - _log_sum_exp(f[:, :, np.newaxis] - shifted, 1)
+                plan = np.exp(f[:, :, np.newaxis] + g[:, np.newaxis, :] - shifted)
+                if abs(plan.sum(axis=2) - p).sum(axis=1).max() < tol:
+                    break
+            else:
+                converged = False
+            emds[block] = (plan * C).sum(axis=(1, 2))
+
+    if not converged:
+        msg = "The Sinkhorn iteration did not converge; try a larger epsilon."
+        warnings.warn(msg)
+    return emds
+
+
+def earth_movers_distance_pmfs(xs, ys, distances=None, method='exact',
+                               epsilon=1e-2):
+    """
+    Compute the Earth Mover's Distance between many pairs of pmfs which share
+    one matrix of distances.
+
+    Parameters
+    ----------
+    xs : np.ndarray, shape (N, m)
+        The first pmfs.
+    ys : np.ndarray, shape (N, n)
+        The second pmfs.
+    distances : np.ndarray, None
+        The cost of moving probability from x[i] to y[j]. If None, the cost
+        is assumed to be i != j.
+    method : str
+        'exact' to solve each transportation problem with the network simplex
+        method, or 'sinkhorn' to solve their entropically regularized forms
+        all at once. Unit distances between distinct outcomes are always
+        computed exactly, as the variational distance.
+    epsilon : float
+        The strength of the entropic regularization of the 'sinkhorn' method,
+        relative to the largest distance.
+
+    Returns
+    -------
+    emds : np.ndarray, shape (N,)
+        The Earth Mover's Distance between each pair of pmfs.
+
+    Raises
+    ------
+    ditException
+        Raised if `method` is unknown, or if the pmfs don't match the
+        distances.
+    """
+    xs, ys = np.atleast_2d(xs).astype(float), np.atleast_2d(ys).astype(float)
+    if method not in ('exact', 'sinkhorn'):
+        msg = "Unknown method {0!r}. Valid methods are: exact, sinkhorn."
+        raise ditException(msg.format(method))
 
     if distances is None:
-        # assume categorical distribution
-        distances = categorical_distances(n)
+        if xs.shape[1] != ys.shape[1]:
+            msg = "Categorical pmfs must have the same number of outcomes."
+            raise ditException(msg)
+        return _categorical(xs, ys)
+
+    distances = np.asarray(distances, dtype=float)
+    if distances.shape != (xs.shape[1], ys.shape[1]):
+        msg = "The distances must have shape {0}."
+        raise ditException(msg.format((xs.shape[1], ys.shape[1])))
+    size = max(len(xs), len(ys))
+    xs = np.broadcast_to(xs, (size, xs.shape[1]))
+    ys = np.broadcast_to(ys, (size, ys.shape[1]))
 
-    eye = np.eye(n)
-    A = np.vstack([np.dstack([eye]*n).reshape(n, n**2), np.tile(eye, n)])
+    if method == 'sinkhorn':
+        return _sinkhorn(xs, ys, distances, epsilon)
+    return np.array([_network_simplex(x, y, distances) for x, y in zip(xs, ys)])
 
-    b = np.concatenate([x, y], axis=0)
 
-    c = distances.flatten()
+def earth_movers_distance_pmf(x, y, distances=None, method='exact',
+                              epsilon=1e-2):
+    """
+    Compute the Earth Mover's Distance between `x` and `y`.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        The first pmf.
+    y : np.ndarray
+        The second pmf.
+    distances : np.ndarray, None
+        The cost of moving probability from x[i] to y[j]. If None, the cost
+        is assumed to be i != j.
+    method : str
+        'exact' to solve the transportation problem with the network simplex
+        method, or 'sinkhorn' to solve its entropically regularized form.
+    epsilon : float
+        The strength of the entropic regularization of the 'sinkhorn' method,
+        relative to the largest distance.
 
-    res = linprog(c, A_eq=A, b_eq=b, bounds=[0, None])
+    Returns
+    -------
+    emd : float
+        The Earth Mover's Distance.
+    """
+    return earth_movers_distance_pmfs(x, y, distances, method, epsilon)[0]
 
-    return res.fun
 
-def earth_movers_distance(dist1, dist2, distances=None):
+def earth_movers_distance(dist1, dist2, distances=None, method='exact',
+                          epsilon=1e-2):
     """
     Compute the Earth Mover's Distance (EMD) between `dist1` and `dist2`. The EMD
     is the least amount of "probability mass flow" that must occur to transform
@@ -98,22 +462,39 @@ def earth_movers_distance(dist1, dist2, distances=None):
         If None, a distance matrix is constructed; if the distributions
         are categorical each non-equal event is considered at unit distance,
         and if numerical abs(x, y) is used as the distance.
+    method : str
+        'exact' to solve the transportation problem with the network simplex
+        method, or 'sinkhorn' to solve its entropically regularized form.
+        Unit distances and numerical outcomes are always computed exactly, in
+        closed form.
+    epsilon : float
+        The strength of the entropic regularization of the 'sinkhorn' method,
+        relative to the largest distance.
 
     Returns
     -------
     emd : float
         The Earth Mover's Distance.
+
+    Notes
+    -----
+    For numerical outcomes, the EMD is the area between the cumulative
+    distribution functions of `dist1` and `dist2`, computed in
+    O(n log n) time.
     """
     if distances is None:
         try:
             numerical_test(dist1)
             numerical_test(dist2)
-            p, q = dist1.pmf, dist2.pmf
-            distances = numerical_distances(dist1.outcomes, dist2.outcomes)
+            numerical = not (dist1.is_joint() or dist2.is_joint())
         except TypeError:
-            p, q = normalize_pmfs(dist1, dist2)
-            distances = categorical_distances(len(p))
+            numerical = False
+        if numerical:
+            x_values = np.asarray(dist1.outcomes, dtype=float)
+            y_values = np.asarray(dist2.outcomes, dtype=float)
+            return float(_line(x_values, dist1.pmf, y_values, dist2.pmf))
+        p, q = normalize_pmfs(dist1, dist2)
     else:
         p, q = dist1.pmf, dist2.pmf
 
-    return earth_movers_distance_pmf(p, q, distances)
+    return earth_movers_distance_pmf(p, q, distances, method, epsilon)
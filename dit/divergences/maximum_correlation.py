@@ -9,7 +9,137 @@ from ..exceptions import ditException
 from ..helpers import normalize_rvs
 
 
-svdvals = lambda m: np.linalg.svd(m, compute_uv=False)
+# Matrices at least this large in both dimensions find their second singular
+# value by Lanczos bidiagonalization rather than by a full SVD.
+_POWER_SIZE = 128
+
+
+def _correlation_matrices(pmf):
+    """
+    Construct the matrices whose second singular values are the maximum
+    correlations of X and Y given each value of Z.
+
+    Parameters
+    ----------
+    pmf : np.ndarray, shape (m, n, k)
+        The joint pmf of X, Y, and Z.
+
+    Returns
+    -------
+    Q : np.ndarray, shape (k, m, n)
+        Q[z, x, y] = p(x, y, z) / sqrt(p(x, z) p(y, z)).
+    u : np.ndarray, shape (k, m)
+        The left singular vectors sqrt(p(x | z)) for the singular value 1.
+    v : np.ndarray, shape (k, n)
+        The right singular vectors sqrt(p(y | z)) for the singular value 1.
+    """
+    pmf = np.ascontiguousarray(np.moveaxis(pmf, 2, 0), dtype=float)
+    pXZ = pmf.sum(axis=2)
+    pYZ = pmf.sum(axis=1)
+    pZ = pXZ.sum(axis=1, keepdims=True)
+    # p(x, y, z) > 0 implies p(x, z) p(y, z) > 0, so zeros stay zero.
+    scale = np.sqrt(pXZ[:, :, np.newaxis] * pYZ[:, np.newaxis, :])
+    Q = pmf / np.where(scale > 0, scale, 1)
+    pZ = np.where(pZ > 0, pZ, 1)
+    u = np.sqrt(pXZ / pZ)
+    v = np.sqrt(pYZ / pZ)
+    return Q, u, v
+
+
+def _second_singular_values(Q, u, v, guess=None, tol=1e-12, max_iter=100):
+    """
+    Compute the second singular value of each of a stack of matrices whose
+    largest singular value is 1.
+
+    Small matrices are decomposed by a single stacked SVD. For larger ones,
+    only the second singular value is needed: it is the largest singular
+    value of Q - u v^T, which is found for all of the matrices at once by
+    Golub-Kahan-Lanczos bidiagonalization, with full reorthogonalization
+    [Golub and Van Loan, "Matrix Computations", 2013, section 10.4]. It stops
+    once the largest Ritz values stop changing, and any which have not by
+    `max_iter` steps fall back to the SVD.
+
+    Parameters
+    ----------
+    Q : np.ndarray, shape (k, m, n)
+        The matrices.
+    u : np.ndarray, shape (k, m)
+        Their left singular vectors for the singular value 1.
+    v : np.ndarray, shape (k, n)
+        Their right singular vectors for the singular value 1.
+    guess : np.ndarray, shape (k, n), None
+        Starting right singular vectors for the bidiagonalization, such as
+        those returned by a previous call on nearby matrices.
+    tol : float
+        The relative change in the Ritz values, over four steps, at which the
+        bidiagonalization stops.
+    max_iter : int
+        The largest number of bidiagonalization steps.
+
+    Returns
+    -------
+    sigmas : np.ndarray, shape (k,)
+        The second singular value of each matrix.
+    vectors : np.ndarray, shape (k, n), None
+        The corresponding right singular vectors, if the bidiagonalization was
+        used.
+    """
+    k, m, n = Q.shape
+    if min(m, n) < 2:
+        return np.zeros(k), None
+    if min(m, n) < _POWER_SIZE:
+        return np.linalg.svd(Q, compute_uv=False)[:, 1], None
+
+    A = Q - u[:, :, np.newaxis] * v[:, np.newaxis, :]
+    if guess is None or guess.shape != (k, n):
+        guess = np.random.RandomState(0).rand(k, n)
+    steps = min(m, n, max_iter)
+
+    def unit(x):
+        norms = np.linalg.norm(x, axis=1)
+        return x / np.where(norms > 0, norms, 1)[:, np.newaxis], norms
+
+    def orthogonalize(x, basis):
+        # Classical Gram-Schmidt, twice, as a single pass loses orthogonality
+        # when singular values cluster.
+        for _ in range(2):
+            coefficients = np.matmul(basis, x[:, :, np.newaxis])[:, :, 0]
+            x = x - np.matmul(coefficients[:, np.newaxis], basis)[:, 0]
+        return x
+
+    # A V = U B, with B upper bidiagonal with diagonal alpha and superdiagonal
+    # beta. All products are of contiguous stacks, as rows.
+    U = np.zeros((k, steps, m))
+    V = np.zeros((k, steps + 1, n))
+    B = np.zeros((k, steps, steps))
+    V[:, 0] = unit(guess)[0]
+    sigmas = np.zeros(k)
+    vector = V[:, 0].copy()
+    for j in range(steps):
+        x = np.matmul(A, vector[:, :, np.newaxis])[:, :, 0]
+        x, B[:, j, j] = unit(orthogonalize(x, U[:, :j]))
+        U[:, j] = x
+        y = np.matmul(x[:, np.newaxis], A)[:, 0]
+        vector, beta = unit(orthogonalize(y, V[:, :j+1]))
+        V[:, j+1] = vector
+        if j + 1 < steps:
+            B[:, j, j+1] = beta
+
+        if j % 4 == 3:
+            previous = sigmas
+            sigmas = np.linalg.svd(B[:, :j+1, :j+1], compute_uv=False)[:, 0]
+            done = abs(sigmas - previous) <= tol * sigmas
+            if done.all():
+                break
+    else:
+        sigmas = np.linalg.svd(B, compute_uv=False)[:, 0]
+        if steps < min(m, n):
+            lost = ~done
+            sigmas[lost] = np.linalg.svd(Q[lost], compute_uv=False)[:, 1]
+
+    right = np.linalg.svd(B[:, :j+1, :j+1])[2]
+    vectors = np.matmul(right[:, :1], V[:, :j+1])[:, 0]
+    return sigmas, vectors
 
 
 def conditional_maximum_correlation_pmf(pmf):
@@ -28,13 +158,7 @@ def conditional_maximum_correlation_pmf(pmf):
     rho_max : float
         The conditional maximum correlation.
     """
-    pXYgZ = pmf / pmf.sum(axis=(0,1), keepdims=True)
-    pXgZ = pXYgZ.sum(axis=1, keepdims=True)
-    pYgZ = pXYgZ.sum(axis=0, keepdims=True)
-    Q = np.where(pmf, pXYgZ / (np.sqrt(pXgZ)*np.sqrt(pYgZ)), 0)
-    Q[np.isnan(Q)] = 0
-
-    rho_max = max([svdvals(np.squeeze(m))[1] for m in np.dsplit(Q, Q.shape[2])])
+    rho_max = _second_singular_values(*_correlation_matrices(pmf))[0].max()
 
     return rho_max
 
@@ -54,12 +178,7 @@ def maximum_correlation_pmf(pXY):
     rho_max : float
         The maximum correlation.
     """
-    pX = pXY.sum(axis=1, keepdims=True)
-    pY = pXY.sum(axis=0, keepdims=True)
-    Q = pXY / (np.sqrt(pX)*np.sqrt(pY))
-    Q[np.isnan(Q)] = 0
-
-    rho_max = svdvals(Q)[1]
+    rho_max = conditional_maximum_correlation_pmf(pXY[:, :, np.newaxis])
 
     return rho_max
 
@@ -0,0 +1,280 @@
+"""
+Divergences between every pair of a collection of distributions.
+
+The distributions are aligned once: each outcome of any of them is given a
+column, and their pmfs become the rows of a single matrix. The divergence
+matrix is then filled in blocks of rows and columns, with kernels which
+compute a whole block at once: matrix products for the Kullback-Leibler
+divergence and the Bhattacharyya coefficient, a batched Newton solver for
+the Chernoff information, and broadcasting otherwise.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from ..exceptions import ditException
+from ..helpers import align_pmfs
+from ..npbatch import DistributionBatch
+from .jensen_shannon_divergence import jensen_shannon_divergence
+from .kullback_leibler_divergence import (kullback_leibler_divergence,
+                                          relative_entropy)
+from .variational_distance import (bhattacharyya_coefficient,
+                                   chernoff_information,
+                                   chernoff_information_pmfs,
+                                   hellinger_distance,
+                                   variational_distance)
+
+__all__ = ('pairwise_divergence',
+          )
+
+
+# The number of entries of the (rows, columns, outcomes) arrays of a block.
+_BLOCK_ENTRIES = 2**22
+
+
+def _aligned_pmfs(dists):
+    """
+    Returns the pmfs of `dists` as the rows of a matrix over shared outcomes.
+
+    Parameters
+    ----------
+    dists : list of Distribution, DistributionBatch, np.ndarray
+        The distributions, a batch of them, or a 2D array of pmfs.
+
+    Returns
+    -------
+    pmfs : np.ndarray, shape (N, k)
+        The linear pmfs, with one column per outcome.
+    """
+    if isinstance(dists, DistributionBatch):
+        return dists.pmf
+    if isinstance(dists, np.ndarray):
+        if dists.ndim != 2:
+            msg = "An array of pmfs must have one row per distribution."
+            raise ditException(msg)
+        return np.asarray(dists, dtype=float)
+
+    return align_pmfs(dists)[1]
+
+
+def _entropies(pmfs):
+    """
+    The entropy, in bits, of each row.
+    """
+    logs = np.log2(np.where(pmfs > 0, pmfs, 1))
+    return -(pmfs * logs).sum(axis=-1)
+
+
+def _kullback_leibler(A, B):
+    """
+    The Kullback-Leibler divergence D(a || b) for each row a of A, b of B.
+    """
+    logs = np.log2(np.where(B > 0, B, 1))
+    D = -_entropies(A)[:, np.newaxis] - np.dot(A, logs.T)
+    # Probability where the second pmf has none.
+    missing = np.dot(A > 0, (B == 0).T.astype(float)) > 0
+    D[missing] = np.inf
+    return D
+
+
+def _bhattacharyya(A, B):
+    """
+    The Bhattacharyya coefficient for each row a of A, b of B.
+    """
+    return np.dot(np.sqrt(A), np.sqrt(B).T)
+
+
+def _hellinger(A, B):
+    """
+    The Hellinger distance for each row a of A, b of B.
+    """
+    return np.sqrt(np.clip(1 - _bhattacharyya(A, B), 0, None))
+
+
+def _variational(A, B):
+    """
+    The variational distance for each row a of A, b of B.
+    """
+    return abs(A[:, np.newaxis, :] - B[np.newaxis, :, :]).sum(axis=-1) / 2
+
+
+def _jensen_shannon(A, B):
+    """
+    The Jensen-Shannon divergence for each row a of A, b of B.
+    """
+    M = (A[:, np.newaxis, :] + B[np.newaxis, :, :]) / 2
+    H = (_entropies(A)[:, np.newaxis] + _entropies(B)[np.newaxis, :]) / 2
+    return _entropies(M) - H
+
+
+def _chernoff(A, B):
+    """
+    The Chernoff information for each row a of A, b of B.
+    """
+    return chernoff_information_pmfs(A[:, np.newaxis, :], B[np.newaxis, :, :])
+
+
+# Each metric, with its kernel and whether it is symmetric.
+_METRICS = {
+    'kullback_leibler_divergence': (_kullback_leibler, False),
+    'relative_entropy': (_kullback_leibler, False),
+    'jensen_shannon_divergence': (_jensen_shannon, True),
+    'hellinger_distance': (_hellinger, True),
+    'variational_distance': (_variational, True),
+    'bhattacharyya_coefficient': (_bhattacharyya, True),
+    'chernoff_information': (_chernoff, True),
+}
+
+_FUNCTIONS = {
+    kullback_leibler_divergence: 'kullback_leibler_divergence',
+    relative_entropy: 'relative_entropy',
+    jensen_shannon_divergence: 'jensen_shannon_divergence',
+    hellinger_distance: 'hellinger_distance',
+    variational_distance: 'variational_distance',
+    bhattacharyya_coefficient: 'bhattacharyya_coefficient',
+    chernoff_information: 'chernoff_information',
+}
+
+
+def _kernel(metric):
+    """
+    Returns the block kernel of `metric` and whether it is symmetric.
+    """
+    metric = _FUNCTIONS.get(metric, metric)
+    if metric in _METRICS:
+        return _METRICS[metric]
+    if callable(metric):
+        def kernel(A, B):
+            """
+            `metric` of each row a of A and b of B.
+            """
+            return np.array([[metric(a, b) for b in B] for a in A])
+        return kernel, False
+    msg = "Unknown metric {0!r}. Valid metrics are: {1}."
+    raise ditException(msg.format(metric, ', '.join(sorted(_METRICS))))
+
+
+def _blocks(n, size, symmetric):
+    """
+    The (rows, columns) slices covering an n by n matrix, or its upper
+    triangle if `symmetric`.
+    """
+    starts = range(0, n, size)
+    for i in starts:
+        for j in starts:
+            if not symmetric or j >= i:
+                yield slice(i, min(i + size, n)), slice(j, min(j + size, n))
+
+
+# The pmfs and metric of each worker process.
+_worker = {}
+
+
+def _init_worker(pmfs, metric):
+    """
+    Give a worker process the pmfs and the metric, once.
+    """
+    _worker['pmfs'] = pmfs
+    _worker['kernel'] = _kernel(metric)[0]
+
+
+def _block(args):
+    """
+    Compute one block of the matrix in a worker process.
+    """
+    rows, cols = args
+    pmfs = _worker['pmfs']
+    return _worker['kernel'](pmfs[rows], pmfs[cols])
+
+
+def pairwise_divergence(dists, metric='kullback_leibler_divergence',
+                        processes=None, out=None):
+    """
+    Compute a divergence between every pair of a collection of distributions.
+
+    Parameters
+    ----------
+    dists : list of Distribution, DistributionBatch, np.ndarray
+        The distributions, a batch of them, or a 2D array whose rows are
+        linear pmfs over the same outcomes.
+    metric : str, function
+        The divergence: one of 'kullback_leibler_divergence',
+        'relative_entropy', 'jensen_shannon_divergence', 'hellinger_distance',
+        'variational_distance', 'bhattacharyya_coefficient' or
+        'chernoff_information', or the function of that name in
+        `dit.divergences`. Any other function is called as `metric(p, q)` on
+        each pair of aligned pmfs, like the functions of `dit.divergences.pmf`.
+    processes : int, None
+        If given, the blocks of the matrix are split between this many worker
+        processes.
+    out : str, np.ndarray, None
+        Where to write the matrix: the path of a .npy file, which is written
+        as a memory-mapped array, or an array of shape (N, N). If None, then a
+        new array is allocated in memory. For large collections, whose N**2
+        matrix may not fit in memory, give a path. The file is then owned by
+        the caller, who must delete it once it is no longer needed.
+
+    Returns
+    -------
+    D : np.ndarray, shape (N, N)
+        The matrix whose entry (i, j) is the divergence of `dists[i]` from
+        `dists[j]`, in bits for the information theoretic divergences.
+
+    Raises
+    ------
+    ditException
+        Raised if `metric` is unknown, or if `out` has the wrong shape.
+
+    Examples
+    --------
+    >>> dists = [dit.Distribution(['0', '1'], [1/2, 1/2]),
+    ...          dit.Distribution(['0', '2'], [1/2, 1/2])]
+    >>> dit.divergences.pairwise_divergence(dists, 'variational_distance')
+    array([[0. , 0.5],
+           [0.5, 0. ]])
+
+    Notes
+    -----
+    Outcomes are aligned by equality, so distributions whose outcomes are
+    equal but whose sample spaces differ are compared as usual.
+    """
+    pmfs = _aligned_pmfs(dists)
+    kernel, symmetric = _kernel(metric)
+    n, k = pmfs.shape
+
+    if isinstance(out, str):
+        out = np.lib.format.open_memmap(out, mode='w+', dtype=float,
+                                        shape=(n, n))
+    elif out is None:
+        out = np.empty((n, n))
+    elif out.shape != (n, n):
+        msg = "`out` must have shape {0}.".format((n, n))
+        raise ditException(msg)
+
+    size = max(1, int(np.sqrt(_BLOCK_ENTRIES / max(k, 1))))
+    blocks = list(_blocks(n, size, symmetric))
+
+    if processes is None:
+        values = (kernel(pmfs[rows], pmfs[cols]) for rows, cols in blocks)
+        pool = None
+    else:
+        from multiprocessing import Pool
+
+        pool = Pool(processes, initializer=_init_worker,
+                    initargs=(pmfs, metric))
+        values = pool.imap(_block, blocks)
+
+    try:
+        for (rows, cols), value in zip(blocks, values):
+            out[rows, cols] = value
+            if symmetric:
+                out[cols, rows] = value.T
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
@@ -66,3 +66,16 @@ def test_cross_entropy_3(args):
     first, second, rvs, crvs = args
     with pytest.raises(ditException):
         cross_entropy(first, second, rvs, crvs)
+
+
+def test_cross_entropy_4():
+    """
+    Test that outcomes of q which p doesn't have are ignored, and that the
+    order of the outcomes doesn't matter.
+    """
+    p = Distribution(['10', '01'], [1/4, 3/4])
+    q = Distribution(['00', '01', '10', '11'], [1/8, 1/2, 1/4, 1/8])
+    xh = -(1/4 * np.log2(1/4) + 3/4 * np.log2(1/2))
+    assert cross_entropy(p, q) == pytest.approx(xh)
+    xh = -(1/4 * np.log2(3/8) + 3/4 * np.log2(5/8))
+    assert cross_entropy(p, q, [1]) == pytest.approx(xh)
@@ -9,7 +9,11 @@ import pytest
 import numpy as np
 
 from dit import Distribution, ScalarDistribution
-from dit.divergences.earth_movers_distance import earth_movers_distance, earth_movers_distance_pmf
+from dit.divergences.earth_movers_distance import (earth_movers_distance,
+                                                   earth_movers_distance_pmf,
+                                                   earth_movers_distance_pmfs,
+                                                   numerical_distances)
+from dit.exceptions import ditException
 
 
 @pytest.mark.parametrize(('p', 'q', 'emd'), [
@@ -53,4 +57,67 @@ def test_emd3():
     assert emd1 == pytest.approx(1.0)
     distances = np.asarray([[0, 1], [1, 0]])
     emd2 = earth_movers_distance(d1, d2, distances=distances)
-    assert emd2 == pytest.approx(2/3)
\ No newline at end of file
+    assert emd2 == pytest.approx(2/3)
+
+
+def test_emd4():
+    """
+    Test numerical outcomes which differ between the distributions.
+    """
+    sd1 = ScalarDistribution([0, 1], [1/2, 1/2])
+    sd2 = ScalarDistribution([3, 4, 5], [1/4, 1/2, 1/4])
+    emd = earth_movers_distance(sd1, sd2)
+    assert emd == pytest.approx(3.5)
+
+
+def test_emd_pmf2():
+    """
+    Test the network simplex against the closed form on the line.
+    """
+    prng = np.random.RandomState(0)
+    x_values, y_values = prng.rand(7), prng.rand(5)
+    p, q = prng.dirichlet(np.ones(7)), prng.dirichlet(np.ones(5))
+    distances = numerical_distances(x_values, y_values)
+    emd1 = earth_movers_distance_pmf(p, q, distances)
+    emd2 = earth_movers_distance(ScalarDistribution(x_values, p),
+                                 ScalarDistribution(y_values, q))
+    assert emd1 == pytest.approx(emd2)
+
+
+def test_emd_pmf3():
+    """
+    Test a transportation problem with a known optimum.
+    """
+    p = [1/2, 1/2, 0]
+    q = [1/4, 1/4, 1/2]
+    distances = np.array([[1, 4, 2], [2, 1, 3], [0, 0, 0]])
+    emd = earth_movers_distance_pmf(p, q, distances)
+    assert emd == pytest.approx(1/4 + 1/4 * 2 + 1/4 + 1/4 * 3)
+
+
+def test_emd_pmfs():
+    """
+    Test that batched pmfs agree with each pair, and that Sinkhorn's
+    approximation approaches them.
+    """
+    prng = np.random.RandomState(1)
+    ps, qs = prng.dirichlet(np.ones(6), 4), prng.dirichlet(np.ones(6), 4)
+    distances = prng.rand(6, 6)
+    emds = earth_movers_distance_pmfs(ps, qs, distances)
+    assert np.allclose(emds, [earth_movers_distance_pmf(p, q, distances)
+                              for p, q in zip(ps, qs)])
+    approx = earth_movers_distance_pmfs(ps, qs, distances, method='sinkhorn')
+    assert np.allclose(approx, emds, atol=1e-2)
+    assert (approx >= emds - 1e-9).all()
+    assert np.allclose(earth_movers_distance_pmfs(ps, qs), [
+        earth_movers_distance_pmf(p, q, 1 - np.eye(6)) for p, q in zip(ps, qs)])
+
+
+def test_emd_pmfs_bad():
+    """
+    Test that bad methods and distances raise exceptions.
+    """
+    with pytest.raises(ditException):
+        earth_movers_distance_pmf([1, 0], [0, 1], method='simplex')
+    with pytest.raises(ditException):
+        earth_movers_distance_pmf([1, 0], [0, 1], np.ones((3, 2)))
@@ -6,7 +6,14 @@ import pytest
 
 from hypothesis import given
 
+import numpy as np
+
 from dit.divergences import maximum_correlation
+from dit.divergences.maximum_correlation import (
+    _correlation_matrices,
+    _second_singular_values,
+    conditional_maximum_correlation_pmf,
+)
 from dit.exceptions import ditException
 from dit.example_dists import dyadic, triadic
 from dit.utils.testing import distributions
@@ -41,3 +48,45 @@ def test_maximum_correlation_tensorization(dist1, dist2):
     rho_a = maximum_correlation(dist1, [[0], [1]])
     rho_b = maximum_correlation(dist2, [[0], [1]])
     assert rho_mixed == pytest.approx(max(rho_a, rho_b), abs=1e-4)
+
+
+def slice_correlations(pmf):
+    """ The maximum correlation of each slice, one SVD at a time """
+    rhos = []
+    for k in range(pmf.shape[2]):
+        pXY = pmf[:, :, k]
+        scale = np.sqrt(np.outer(pXY.sum(axis=1), pXY.sum(axis=0)))
+        Q = np.where(pXY > 0, pXY / np.where(scale > 0, scale, 1), 0)
+        rhos.append(np.linalg.svd(Q, compute_uv=False)[1])
+    return np.array(rhos)
+
+
+def test_conditional_maximum_correlation_pmf():
+    """ Test the stacked SVD against each slice, with an empty slice """
+    pmf = np.random.RandomState(0).dirichlet(np.ones(48)).reshape(4, 4, 3)
+    pmf[:, :, 1] = 0
+    pmf[0, :, 2] = 0
+    rho = conditional_maximum_correlation_pmf(pmf)
+    assert rho == pytest.approx(slice_correlations(pmf).max())
+
+
+def test_second_singular_values_lanczos():
+    """ Test the bidiagonalization for large alphabets, cold and warm """
+    prng = np.random.RandomState(1)
+    pmf = np.exp(2 * prng.randn(150, 140, 2))
+    pmf /= pmf.sum()
+    rhos = slice_correlations(pmf)
+    sigmas, vectors = _second_singular_values(*_correlation_matrices(pmf))
+    assert np.allclose(sigmas, rhos, rtol=1e-9)
+    sigmas, _ = _second_singular_values(*_correlation_matrices(pmf),
+                                        guess=vectors)
+    assert np.allclose(sigmas, rhos, rtol=1e-9)
+
+
+def test_second_singular_values_clustered():
+    """ Test the bidiagonalization when the second singular value repeats """
+    n = 12
+    pXY = 0.9 * np.eye(n) / n + 0.1 / n**2
+    pmf = np.kron(pXY, pXY)[:, :, np.newaxis]
+    sigmas, _ = _second_singular_values(*_correlation_matrices(pmf))
+    assert sigmas[0] == pytest.approx(0.9, abs=1e-10)
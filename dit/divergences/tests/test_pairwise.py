@@ -0,0 +1,87 @@
+"""
+Tests for dit.divergences.pairwise.
+"""
+
+from __future__ import division
+
+import pytest
+
+import numpy as np
+
+from dit import Distribution as D, DistributionBatch, random_distribution
+from dit.divergences import (bhattacharyya_coefficient,
+                             chernoff_information,
+                             hellinger_distance,
+                             jensen_shannon_divergence,
+                             kullback_leibler_divergence,
+                             pairwise_divergence,
+                             variational_distance)
+from dit.divergences.pmf import chernoff_information as chernoff_pmf
+from dit.exceptions import ditException
+
+
+def _dists():
+    dists = [random_distribution(2, 2, prng=np.random.RandomState(i))
+             for i in range(4)]
+    dists.append(D([(0, 0), (1, 1)], [1/2, 1/2]))
+    return dists
+
+
+@pytest.mark.parametrize('metric', [
+    kullback_leibler_divergence,
+    hellinger_distance,
+    variational_distance,
+    bhattacharyya_coefficient,
+    chernoff_information,
+])
+def test_pairwise1(metric):
+    """ Test against the divergence of each pair """
+    dists = _dists()
+    M = pairwise_divergence(dists, metric)
+    for i, p in enumerate(dists):
+        for j, q in enumerate(dists):
+            # sqrt(1 - BC) turns rounding in BC = 1 into errors of 1e-8.
+            assert M[i, j] == pytest.approx(metric(p, q), abs=1e-7)
+
+
+def test_pairwise2():
+    """ Test the Jensen-Shannon divergence, by name """
+    dists = _dists()
+    M = pairwise_divergence(dists, 'jensen_shannon_divergence')
+    for i, p in enumerate(dists):
+        for j, q in enumerate(dists):
+            assert M[i, j] == pytest.approx(jensen_shannon_divergence([p, q]))
+
+
+def test_pairwise3():
+    """ Test batches, arrays, pmf functions and worker processes """
+    dists = _dists()[:4]
+    batch = DistributionBatch.from_distributions(dists)
+    M = pairwise_divergence(batch, 'hellinger_distance')
+    assert np.allclose(M, pairwise_divergence(batch.pmf, hellinger_distance))
+    M = pairwise_divergence(dists, chernoff_pmf)
+    assert M[0, 1] == pytest.approx(chernoff_pmf(batch.pmf[0], batch.pmf[1]))
+    M = pairwise_divergence(dists, 'variational_distance', processes=2)
+    assert np.allclose(M, pairwise_divergence(dists, variational_distance))
+
+
+def test_pairwise4(tmpdir):
+    """ Test memory-mapped output """
+    dists = _dists()
+    path = str(tmpdir.join('D.npy'))
+    M = pairwise_divergence(dists, 'variational_distance', out=path)
+    assert isinstance(M, np.memmap)
+    assert np.allclose(np.load(path), pairwise_divergence(dists, 'variational_distance'))
+    M = pairwise_divergence(dists, 'variational_distance')
+    assert not isinstance(M, np.memmap)
+
+
+def test_pairwise5():
+    """ Test invalid input """
+    dists = _dists()
+    with pytest.raises(ditException):
+        pairwise_divergence(dists, 'unknown')
+    with pytest.raises(ditException):
+        pairwise_divergence(dists, out=np.zeros((2, 2)))
+    with pytest.raises(ditException):
+        pairwise_divergence(np.ones(3))
@@ -6,10 +6,14 @@ from __future__ import division
 
 import pytest
 
+import numpy as np
+
 from dit import Distribution
 from dit.divergences import (bhattacharyya_coefficient,
+                             chernoff_information,
                              variational_distance,
                              )
+from dit.divergences.variational_distance import chernoff_information_pmfs
 
 
 d1 = Distribution(['0', '1'], [1/2, 1/2])
@@ -39,3 +43,35 @@ def test_bc():
     """
     bc = bhattacharyya_coefficient(d1, d2)
     assert bc == pytest.approx(0.9659258262890682)
+
+
+def test_ci1():
+    """
+    Test against known value.
+    """
+    ci = chernoff_information(d1, d2)
+    assert ci == pytest.approx(0.050044472811669)
+
+
+def test_ci2():
+    """
+    Test that a single shared outcome puts the optimum at an endpoint.
+    """
+    ci = chernoff_information(d1, d3)
+    assert ci == pytest.approx(2)
+
+
+def test_ci3():
+    """
+    Test a batch of pairs against each pair.
+    """
+    ps = np.random.RandomState(0).dirichlet(np.ones(4), 10)
+    ps[::3, 0] = 0
+    ps /= ps.sum(axis=1, keepdims=True)
+    qs = np.array([[0, 0, 1/2, 1/2], [1, 0, 0, 0]])
+    ci = chernoff_information_pmfs(ps[:, np.newaxis], qs)
+    assert ci.shape == (10, 2)
+    for i, p in enumerate(ps):
+        for j, q in enumerate(qs):
+            assert ci[i, j] == pytest.approx(chernoff_information_pmfs(p, q))
+    assert np.isinf(ci[::3, 1]).all()
@@ -5,9 +5,7 @@ The variational distance.
 from __future__ import division
 
 import numpy as np
-from scipy.optimize import minimize_scalar
 
-from ..exceptions import OptimizationException
 from ..helpers import normalize_pmfs
 
 
@@ -138,6 +136,96 @@ def hellinger_distance(dist1, dist2):
     return hd
 
 
+def _chernoff_moments(alpha, b, d, both):
+    """
+    The log of sum(p**alpha * q**(1-alpha)), in nats, and its first two
+    derivatives in `alpha`, for each row.
+    """
+    x = np.where(both, b + alpha[:, np.newaxis] * d, -np.inf)
+    shift = x.max(axis=1)
+    shift[~np.isfinite(shift)] = 0
+    w = np.exp(x - shift[:, np.newaxis])
+    total = w.sum(axis=1)
+    w /= np.where(total > 0, total, 1)[:, np.newaxis]
+    mean = (w * d).sum(axis=1)
+    var = (w * (d - mean[:, np.newaxis])**2).sum(axis=1)
+    with np.errstate(divide='ignore'):
+        value = np.log(total) + shift
+    return value, mean, var
+
+
+def chernoff_information_pmfs(ps, qs, tol=1e-12, max_iter=100):
+    """
+    Compute the Chernoff information of many pairs of pmfs at once.
+
+    Parameters
+    ----------
+    ps : np.ndarray, shape (..., k)
+        The first pmfs, along the last axis.
+    qs : np.ndarray, shape (..., k)
+        The second pmfs, broadcastable against `ps`.
+    tol : float
+        The precision to which each optimal `alpha` is found.
+    max_iter : int
+        The maximum number of Newton steps.
+
+    Returns
+    -------
+    ci : np.ndarray
+        The Chernoff information of each pair, with the broadcast shape of
+        `ps` and `qs` less their last axis.
+
+    Notes
+    -----
+    The log of sum(p**alpha * q**(1-alpha)) is convex in `alpha`, so its
+    minimum over [0, 1] is either an endpoint or the root of its derivative.
+    The roots of all pairs are found together by Newton's method, falling
+    back to bisection whenever a step leaves the bracket of the root.
+    """
+    ps, qs = np.broadcast_arrays(np.asarray(ps, dtype=float),
+                                 np.asarray(qs, dtype=float))
+    shape = ps.shape[:-1]
+    ps = ps.reshape(-1, ps.shape[-1])
+    qs = qs.reshape(-1, qs.shape[-1])
+
+    both = (ps > 0) & (qs > 0)
+    b = np.log(np.where(both, qs, 1))
+    d = np.log(np.where(both, ps, 1)) - b
+
+    n = len(ps)
+    lo, hi = np.zeros(n), np.ones(n)
+    slopes = _chernoff_moments(np.repeat([0.0, 1.0], n), np.tile(b, (2, 1)),
+                               np.tile(d, (2, 1)), np.tile(both, (2, 1)))[1]
+    slope_lo, slope_hi = slopes[:n], slopes[n:]
+    # Start from where the secant through the endpoint slopes crosses zero.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alpha = np.clip(-slope_lo / (slope_hi - slope_lo), 0, 1)
+    alpha = np.where(slope_lo >= 0, 0.0, np.where(slope_hi <= 0, 1.0, alpha))
+
+    active = np.flatnonzero((slope_lo < 0) & (slope_hi > 0))
+    for _ in range(max_iter):
+        if not len(active):
+            break
+        x, l, h = alpha[active], lo[active], hi[active]
+        _, slope, curve = _chernoff_moments(x, b[active], d[active],
+                                            both[active])
+        l = np.where(slope < 0, x, l)
+        h = np.where(slope > 0, x, h)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = x - slope / curve
+        bad = ~((l < step) & (step < h))
+        step[bad] = (l[bad] + h[bad]) / 2
+        alpha[active], lo[active], hi[active] = step, l, h
+        done = (abs(step - x) <= tol) | (slope == 0) | (h - l <= tol)
+        active = active[~done]
+
+    value = _chernoff_moments(alpha, b, d, both)[0]
+    # sometimes things are very slightly negative due to rounding.
+    # since this can throw off some inequalities, we set to zero in this case.
+    ci = np.clip(-value / np.log(2), 0, None)
+    return ci.reshape(shape)
+
+
 def chernoff_information_pmf(p, q):
     """
     Compute the Chernoff information.
@@ -154,22 +242,7 @@ def chernoff_information_pmf(p, q):
     ci : float
         The Chernoff information.
     """
-    def func(alpha):
-        return np.log2((p**alpha * q**(1-alpha)).sum())
-
-    res = minimize_scalar(fun=func, bounds=(0, 1), method='bounded')
-
-    if not -1e-8 <= res.x <= 1 + 1e-8:  # pragma: no cover
-        msg = "Appropriate optima could not be found."
-        raise OptimizationException(msg)
-
-    ci = -func(res.x)
-    # sometimes things are very slightly negative due to optimization fuzziness.
-    # since this can throw off some inequalities, we set to zero in this case.
-    if ci < 0:  # pragma: no cover
-        ci = 0
-
-    return ci
+    return float(chernoff_information_pmfs(p, q))
 
 
 def chernoff_information(dist1, dist2):
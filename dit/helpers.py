@@ -346,6 +346,20 @@ def reorder(outcomes, pmf, sample_space, index=None):
     Helper function to reorder outcomes and pmf to match sample_space.
 
     """
+    try:
+        # Cartesian products can index all the outcomes at once.
+        keys = sample_space.index_many(outcomes)
+    except (AttributeError, ValueError):
+        # Fall back to indexing one outcome at a time, which also identifies
+        # any outcomes that are not in the sample space.
+        pass
+    else:
+        order = np.argsort(keys, kind='mergesort')
+        outcomes = [outcomes[i] for i in order]
+        pmf = [pmf[i] for i in order]
+        new_index = dict(zip(outcomes, range(len(outcomes))))
+        return outcomes, pmf, new_index
+
     try:
         order = [(sample_space.index(outcome), i)
                  for i, outcome in enumerate(outcomes)]
@@ -375,6 +389,79 @@ def reorder(outcomes, pmf, sample_space, index=None):
     return outcomes, pmf, new_index
 
 
+def group_codes(columns, n):
+    """
+    Group the rows of a matrix of nonnegative integer codes.
+
+    Parameters
+    ----------
+    columns : list of NumPy arrays, each with shape (n,)
+        The columns of the code matrix.
+    n : int
+        The number of rows. Needed when there are no columns.
+
+    Returns
+    -------
+    uniques : NumPy array, shape (m, len(columns))
+        The unique rows, sorted lexicographically.
+    inverse : NumPy array, shape (n,)
+        The index into `uniques` of each row.
+
+    """
+    k = len(columns)
+    if n == 0:
+        return np.empty((0, k), dtype=int), np.empty(0, dtype=int)
+    if k == 0:
+        return np.empty((1, 0), dtype=int), np.zeros(n, dtype=int)
+
+    codes = np.column_stack(columns)
+    sizes = tuple(int(size) for size in codes.max(axis=0) + 1)
+    if np.prod(sizes, dtype=float) < 2**62:
+        # Rows fit into a single mixed-radix integer, which sorts the same.
+        keys = np.ravel_multi_index(tuple(codes.T), sizes)
+        keys, inverse = np.unique(keys, return_inverse=True)
+        uniques = np.column_stack(np.unravel_index(keys, sizes))
+    else:
+        uniques, inverse = np.unique(codes, axis=0, return_inverse=True)
+
+    return uniques, inverse.ravel()
+
+
+def add_reduce_groups(ops, pmf, inverse, m):
+    """
+    Performs an `addition' reduction of `pmf` within each group.
+
+    Parameters
+    ----------
+    ops : Operations
+        The operations describing how probabilities are added.
+    pmf : NumPy array, shape (n,)
+        The probabilities to add.
+    inverse : NumPy array, shape (n,)
+        The group of each element in `pmf`, as returned by `group_codes`.
+    m : int
+        The number of groups.
+
+    Returns
+    -------
+    z : NumPy array, shape (m,)
+        The sum of the probabilities in each group.
+
+    """
+    pmf = np.asarray(pmf, dtype=float)
+    if ops.get_base() == 'linear':
+        return np.bincount(inverse, weights=pmf, minlength=m)
+    elif m == 0:
+        return np.empty(0, dtype=float)
+
+    # Change to base-2, add with reduceat over the sorted groups, convert back.
+    scale = np.log2(ops.get_base(numerical=True))
+    order = np.argsort(inverse, kind='mergesort')
+    starts = np.searchsorted(inverse[order], np.arange(m))
+    z = np.logaddexp2.reduceat(pmf[order] * scale, starts) / scale
+    return z
+
+
 def copypmf(d, base=None, mode='asis'):
     """
     Returns a NumPy array of the distribution's pmf.
@@ -398,19 +485,14 @@ def copypmf(d, base=None, mode='asis'):
         The pmf of the distribution.
 
     """
-    from dit.math import get_ops
-    from dit.params import validate_base
-
     # Sanitize inputs, need numerical base for old base.
     base_old = d.get_base(numerical=True)
     if base is None:
         base_new = base_old
     else:
-        base_new = validate_base(base)
+        base_new = base
 
-    # Create ops instances.
     ops_old = d.ops
-    ops_new = get_ops(base_new)
 
     # Build the pmf
     if mode == 'asis':
@@ -420,8 +502,37 @@ def copypmf(d, base=None, mode='asis'):
     elif mode == 'sparse':
         pmf = np.array([p for p in d.pmf if not ops_old.is_null(p)], dtype=float)
 
+    return rebase_pmf(pmf, ops_old, base_new)
+
+
+def rebase_pmf(pmf, ops, base):
+    """
+    Returns `pmf` converted from the base of `ops` to `base`.
+
+    Parameters
+    ----------
+    pmf : NumPy array
+        The probabilities, in the base of `ops`. It may be modified in-place.
+    ops : Operations
+        The operations of the current base of `pmf`.
+    base : float, 'linear', 'e'
+        The desired base of the probabilities.
+
+    Returns
+    -------
+    pmf : NumPy array
+        The converted probabilities.
+
+    """
+    from dit.math import get_ops
+    from dit.params import validate_base
+
+    base_old = ops.get_base(numerical=True)
+    base_new = validate_base(base)
+    ops_new = get_ops(base_new)
+
     # Determine the conversion targets.
-    islog_old = d.is_log()
+    islog_old = ops.get_base() != 'linear'
     if base_new == 'linear':
         islog_new = False
     else:
@@ -447,6 +558,92 @@ def copypmf(d, base=None, mode='asis'):
     return pmf
 
 
+def outcome_columns(dists):
+    """
+    Index the union of the outcomes of several distributions.
+
+    For joint distributions of the same outcome length, the outcomes are
+    compared through the integer codes of their symbols, which are merged
+    into shared alphabets, so that the union is found with a single sort of
+    integer keys. Other outcomes are indexed with a dictionary.
+
+    Parameters
+    ----------
+    dists : list of Distribution
+        The distributions.
+
+    Returns
+    -------
+    outcomes : list
+        The union of the outcomes of `dists`.
+    columns : list of np.ndarray
+        For each distribution, the index into `outcomes` of each of its
+        outcomes.
+
+    """
+    dists = list(dists)
+    lengths = set(d.outcome_length() if d.is_joint() else None for d in dists)
+    if None in lengths or len(lengths) != 1:
+        index = {}
+        columns = [np.array([index.setdefault(o, len(index))
+                             for o in d.outcomes], dtype=int)
+                   for d in dists]
+        return list(index), columns
+
+    length = lengths.pop()
+    codes = [d._outcome_codes() for d in dists]
+    merged = [[] for _ in range(length)]
+    for i in range(length):
+        # Merge the alphabets of variable i, renumbering each one's codes.
+        index = {}
+        for columns, symbols in codes:
+            lookup = np.array([index.setdefault(symbol, len(index))
+                               for symbol in symbols[i]], dtype=int)
+            merged[i].append(lookup[columns[i]])
+
+    counts = [len(d.outcomes) for d in dists]
+    rows = [np.concatenate(column) for column in merged]
+    _, keys = group_codes(rows, sum(counts))
+    uniques, first, inverse = np.unique(keys, return_index=True,
+                                        return_inverse=True)
+    columns = np.split(inverse.ravel(), np.cumsum(counts)[:-1])
+
+    offsets = np.cumsum([0] + counts)
+    owners = np.searchsorted(offsets, first, side='right') - 1
+    outcomes = [dists[k].outcomes[j - offsets[k]]
+                for k, j in zip(owners, first)]
+    return outcomes, columns
+
+
+def align_pmfs(dists):
+    """
+    Returns the linear pmfs of several distributions, over shared outcomes.
+
+    The result may be reused for any number of divergences between the
+    distributions.
+
+    Parameters
+    ----------
+    dists : list of Distribution
+        The distributions.
+
+    Returns
+    -------
+    outcomes : list
+        The union of the outcomes of `dists`.
+    pmfs : np.ndarray, shape (len(dists), len(outcomes))
+        Row i is the pmf of `dists[i]` over `outcomes`, zero where it has no
+        such outcome.
+
+    """
+    dists = list(dists)
+    outcomes, columns = outcome_columns(dists)
+    pmfs = np.zeros((len(dists), len(outcomes)))
+    for row, dist, cols in zip(pmfs, dists, columns):
+        row[cols] = copypmf(dist, base='linear')
+    return outcomes, pmfs
+
+
 def normalize_pmfs(dist1, dist2):
     """
     Construct probability vectors with common support.
@@ -465,9 +662,11 @@ def normalize_pmfs(dist1, dist2):
     q : np.ndarray
         The pmf of `dist2`.
     """
-    event_space = list(set().union(dist1.outcomes, dist2.outcomes))
-    p = np.array([dist1[e] if e in dist1.outcomes else 0 for e in event_space])
-    q = np.array([dist2[e] if e in dist2.outcomes else 0 for e in event_space])
+    outcomes, (cols1, cols2) = outcome_columns([dist1, dist2])
+    p = np.zeros(len(outcomes))
+    q = np.zeros(len(outcomes))
+    p[cols1] = dist1.pmf
+    q[cols2] = dist2.pmf
     return p, q
 
 
@@ -0,0 +1,7 @@
+"""
+Local, or pointwise, information measures: the value of a measure for each
+outcome of a distribution, whose average over the distribution is the usual
+information measure.
+"""
+
+from .pointwise import *
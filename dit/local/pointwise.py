@@ -0,0 +1,267 @@
+"""
+Local entropy, mutual information and co-information.
+
+Each function returns an array aligned with `dist.outcomes`: entry i is the
+local value of the measure for the outcome `dist.outcomes[i]`. The marginal
+probabilities of each outcome are gathered from marginals computed once per
+set of random variables, by grouping the integer codes of the outcomes.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from ..helpers import group_codes, normalize_rvs, parse_rvs
+from ..utils import powerset
+
+__all__ = ('local_entropy',
+           'local_mutual_information',
+           'local_coinformation',
+          )
+
+
+class _LocalProbabilities(object):
+    """
+    The marginal probabilities of every outcome of a distribution.
+    """
+
+    def __init__(self, dist, dense=False):
+        """
+        Parameters
+        ----------
+        dist : Distribution
+            The joint distribution.
+        dense : bool
+            If True, then outcomes of the whole sample space are used, rather
+            than those of `dist.outcomes`.
+        """
+        if dense and not dist.is_dense():
+            dist = dist.copy()
+            dist.make_dense()
+        self.dist = dist
+
+        pmf = np.asarray(dist.pmf, dtype=float)
+        if dist.is_log():
+            base = dist.get_base(numerical=True)
+            pmf = base**pmf
+            self._scale = np.log2(base)
+        else:
+            self._scale = 1
+        self._pmf = pmf
+        self._codes = dist._outcome_codes()[0]
+        self._cache = {}
+
+    def indexes(self, rvs, rv_mode=None):
+        """
+        Returns the random variable indexes of `rvs`.
+        """
+        indexes = parse_rvs(self.dist, list(rvs), rv_mode, unique=False)[1]
+        return frozenset(indexes)
+
+    def log(self, indexes):
+        """
+        Returns log p(x_S) for each outcome x, where S are `indexes`.
+
+        Parameters
+        ----------
+        indexes : frozenset
+            The random variable indexes of the marginal.
+
+        Returns
+        -------
+        logp : np.ndarray, shape (len(outcomes),)
+            The base-2 log of the marginal probability of each outcome.
+        """
+        try:
+            return self._cache[indexes]
+        except KeyError:
+            pass
+
+        n = len(self._pmf)
+        if indexes:
+            columns = [self._codes[i] for i in sorted(indexes)]
+            uniques, inverse = group_codes(columns, n)
+            marginal = np.bincount(inverse, weights=self._pmf,
+                                   minlength=len(uniques))
+            with np.errstate(divide='ignore'):
+                logp = np.log2(marginal)[inverse]
+        else:
+            logp = np.zeros(n)
+
+        self._cache[indexes] = logp
+        return logp
+
+    def finish(self, values):
+        """
+        Convert bits to the base of the distribution, and mark outcomes of
+        zero probability as undefined.
+        """
+        values = values / self._scale
+        values[self._pmf == 0] = np.nan
+        return values
+
+
+def local_entropy(dist, rvs=None, crvs=None, rv_mode=None, dense=False):
+    """
+    Returns the local (conditional) entropy -log p(x|z) of each outcome.
+
+    Parameters
+    ----------
+    dist : Distribution
+        The distribution from which the local entropy is calculated.
+    rvs : list, None
+        The indexes of the random variables X. If None, then all random
+        variables are used.
+    crvs : list, None
+        The indexes of the random variables Z to condition on. If None, then
+        no variables are conditioned on.
+    rv_mode : str, None
+        Specifies how to interpret `rvs` and `crvs`. Valid options are:
+        {'indices', 'names'}. If equal to 'indices', then the elements of
+        `crvs` and `rvs` are interpreted as random variable indices. If equal
+        to 'names', the the elements are interpreted as random variable names.
+        If `None`, then the value of `dist._rv_mode` is consulted, which
+        defaults to 'indices'.
+    dense : bool
+        If True, then values are returned for every outcome of the sample
+        space, in order, instead of for `dist.outcomes`.
+
+    Returns
+    -------
+    h : np.ndarray, shape (len(outcomes),)
+        The local entropy of each outcome, in bits for linear distributions
+        and in the base of the distribution otherwise. Outcomes of zero
+        probability have the value nan.
+
+    Raises
+    ------
+    ditException
+        Raised if `dist` is not a joint distribution or if `rvs` or `crvs`
+        contain non-existant random variables.
+
+    Examples
+    --------
+    >>> d = dit.Distribution(['00', '01', '11'], [1/2, 1/4, 1/4])
+    >>> dit.local.local_entropy(d, [0])
+    array([0.4150375, 0.4150375, 2.       ])
+
+    """
+    rvs = None if rvs is None else [rvs]
+    rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
+    probs = _LocalProbabilities(dist, dense)
+    X = frozenset().union(*(probs.indexes(rv, rv_mode) for rv in rvs))
+    Z = probs.indexes(crvs, rv_mode)
+    h = probs.log(Z) - probs.log(X | Z)
+    return probs.finish(h)
+
+
+def local_mutual_information(dist, rvs_X, rvs_Y, crvs=None, rv_mode=None,
+                             dense=False):
+    """
+    Returns the local (conditional) mutual information of each outcome.
+
+    The local mutual information of an outcome is
+    log p(x, y | z) / (p(x | z) p(y | z)).
+
+    Parameters
+    ----------
+    dist : Distribution
+        The distribution from which the local mutual information is
+        calculated.
+    rvs_X : list
+        The indexes of the random variables X.
+    rvs_Y : list
+        The indexes of the random variables Y.
+    crvs : list, None
+        The indexes of the random variables Z to condition on. If None, then
+        no variables are conditioned on.
+    rv_mode : str, None
+        Specifies how to interpret `rvs_X`, `rvs_Y` and `crvs`. Valid options
+        are: {'indices', 'names'}. If equal to 'indices', then the elements
+        are interpreted as random variable indices. If equal to 'names', the
+        the elements are interpreted as random variable names. If `None`,
+        then the value of `dist._rv_mode` is consulted, which defaults to
+        'indices'.
+    dense : bool
+        If True, then values are returned for every outcome of the sample
+        space, in order, instead of for `dist.outcomes`.
+
+    Returns
+    -------
+    i : np.ndarray, shape (len(outcomes),)
+        The local mutual information of each outcome, in bits for linear
+        distributions and in the base of the distribution otherwise. Outcomes
+        of zero probability have the value nan.
+
+    Raises
+    ------
+    ditException
+        Raised if `dist` is not a joint distribution or if `rvs_X`, `rvs_Y`
+        or `crvs` contain non-existant random variables.
+
+    """
+    _, crvs, rv_mode = normalize_rvs(dist, [rvs_X, rvs_Y], crvs, rv_mode)
+    probs = _LocalProbabilities(dist, dense)
+    X = probs.indexes(rvs_X, rv_mode)
+    Y = probs.indexes(rvs_Y, rv_mode)
+    Z = probs.indexes(crvs, rv_mode)
+    i = (probs.log(X | Y | Z) + probs.log(Z)
+         - probs.log(X | Z) - probs.log(Y | Z))
+    return probs.finish(i)
+
+
+def local_coinformation(dist, rvs=None, crvs=None, rv_mode=None, dense=False):
+    """
+    Returns the local (conditional) co-information of each outcome.
+
+    The local co-information of an outcome is the alternating sum of the
+    local entropies of every nonempty subset of `rvs`, so that its average is
+    the co-information.
+
+    Parameters
+    ----------
+    dist : Distribution
+        The distribution from which the local co-information is calculated.
+    rvs : list, None
+        A list of lists. Each inner list specifies the indexes of the random
+        variables used to calculate the co-information. If None, then each
+        random variable is used.
+    crvs : list, None
+        The indexes of the random variables to condition on. If None, then no
+        variables are conditioned on.
+    rv_mode : str, None
+        Specifies how to interpret `rvs` and `crvs`. Valid options are:
+        {'indices', 'names'}. If equal to 'indices', then the elements of
+        `crvs` and `rvs` are interpreted as random variable indices. If equal
+        to 'names', the the elements are interpreted as random variable names.
+        If `None`, then the value of `dist._rv_mode` is consulted, which
+        defaults to 'indices'.
+    dense : bool
+        If True, then values are returned for every outcome of the sample
+        space, in order, instead of for `dist.outcomes`.
+
+    Returns
+    -------
+    i : np.ndarray, shape (len(outcomes),)
+        The local co-information of each outcome, in bits for linear
+        distributions and in the base of the distribution otherwise. Outcomes
+        of zero probability have the value nan.
+
+    Raises
+    ------
+    ditException
+        Raised if `dist` is not a joint distribution or if `rvs` or `crvs`
+        contain non-existant random variables.
+
+    """
+    rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
+    probs = _LocalProbabilities(dist, dense)
+    groups = [probs.indexes(rv, rv_mode) for rv in rvs]
+    Z = probs.indexes(crvs, rv_mode)
+    log_Z = probs.log(Z)
+    i = np.zeros(len(log_Z))
+    for subset in powerset(groups):
+        if subset:
+            h = log_Z - probs.log(Z.union(*subset))
+            i += (-1)**(len(subset) + 1) * h
+    return probs.finish(i)
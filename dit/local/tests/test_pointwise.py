@@ -0,0 +1,68 @@
+"""
+Tests for dit.local.pointwise.
+"""
+
+from __future__ import division
+
+import pytest
+
+import numpy as np
+
+from dit import Distribution as D, random_distribution
+from dit.example_dists import Xor
+from dit.local import (local_coinformation,
+                       local_entropy,
+                       local_mutual_information)
+from dit.multivariate import coinformation
+from dit.shannon import conditional_entropy, entropy
+
+
+def test_local_entropy1():
+    """ Test the local entropy of each outcome """
+    d = D(['00', '01', '11'], [1/2, 1/4, 1/4])
+    h = local_entropy(d, [0])
+    assert np.allclose(h, [np.log2(4/3), np.log2(4/3), 2])
+    assert np.allclose(local_entropy(d), [1, 2, 2])
+
+
+def test_local_entropy2():
+    """ Test that the local entropy averages to the entropy """
+    d = random_distribution(3, 3, prng=np.random.RandomState(0))
+    assert np.dot(d.pmf, local_entropy(d)) == pytest.approx(entropy(d))
+    h = local_entropy(d, [0, 1], [2])
+    H = conditional_entropy(d, [0, 1], [2])
+    assert np.dot(d.pmf, h) == pytest.approx(H)
+
+
+def test_local_mutual_information():
+    """ Test the local (conditional) mutual information """
+    d = Xor()
+    d.set_rv_names('XYZ')
+    assert np.allclose(local_mutual_information(d, 'X', 'Y'), 0)
+    assert np.allclose(local_mutual_information(d, 'X', 'Y', 'Z'), 1)
+
+
+def test_local_coinformation():
+    """ Test that the local co-information averages to the co-information """
+    d = random_distribution(4, 2, prng=np.random.RandomState(1))
+    i = local_coinformation(d)
+    assert np.dot(d.pmf, i) == pytest.approx(coinformation(d))
+    i = local_coinformation(d, [[0], [1]], [2, 3])
+    I = coinformation(d, [[0], [1]], [2, 3])
+    assert np.dot(d.pmf, i) == pytest.approx(I)
+
+
+def test_dense():
+    """ Test alignment with the dense sample space """
+    d = D(['00', '11'], [1/2, 1/2])
+    i = local_mutual_information(d, [0], [1], dense=True)
+    assert len(i) == 4
+    assert np.allclose(i[[0, 3]], 1)
+    assert np.isnan(i[[1, 2]]).all()
+
+
+def test_log():
+    """ Test log distributions """
+    d = Xor()
+    d.set_base(3)
+    assert np.allclose(local_coinformation(d), -np.log(2)/np.log(3))
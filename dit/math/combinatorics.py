@@ -4,6 +4,8 @@ Combinatorial functions.
 
 """
 
+import numpy as np
+
 
 def unitsum_tuples(n, k, mn, mx):
     """Generates unitsum k-tuples with elements from mn to mx.
@@ -120,3 +122,115 @@ def slots(n, k, normalized=False):
             seq[i:k] = [seq[i] - 1] * (k - i)
 
 
+def _subset_axes(values):
+    """
+    View `values`, of shape (2**n, ...), with one length-2 axis per bit.
+
+    The axis of bit i is axis n-1-i, so that index 1 along it means that the
+    i-th element is in the subset.
+    """
+    values = np.array(values, dtype=float)
+    n = int(values.shape[0]).bit_length() - 1
+    if values.shape[0] != 2**n:
+        msg = "The first axis must have length 2**n, not {0}."
+        raise ValueError(msg.format(values.shape[0]))
+    return values.reshape((2,)*n + values.shape[1:]), n
+
+
+def subset_transform(values, inverse=False):
+    """
+    Sums values over all subsets of each subset.
+
+    Subsets of n elements are indexed by bitmasks: the i-th element is in
+    subset `S` if bit i of `S` is set. The transform is computed one element at
+    a time, in O(n 2**n) operations.
+
+    Parameters
+    ----------
+    values : array-like, shape (2**n, ...)
+        The value f[S] of each subset `S`.
+    inverse : bool
+        If True, compute the Mobius inverse instead, which recovers `f` from
+        the sums.
+
+    Returns
+    -------
+    sums : np.ndarray, shape (2**n, ...)
+        g[S] = sum(f[T] for T subset of S), or, if `inverse` is True,
+        g[S] = sum((-1)**|S - T| f[T] for T subset of S).
+
+    Examples
+    --------
+    >>> subset_transform([1, 2, 3, 4])
+    array([ 1.,  3.,  4., 10.])
+
+    """
+    values, n = _subset_axes(values)
+    sign = -1 if inverse else 1
+    for axis in range(n):
+        index = [slice(None)] * values.ndim
+        index[axis] = 0
+        lower = values[tuple(index)]
+        index[axis] = 1
+        values[tuple(index)] += sign * lower
+    return values.reshape((2**n,) + values.shape[n:])
+
+
+def superset_transform(values, inverse=False):
+    """
+    Sums values over all supersets of each subset.
+
+    Subsets of n elements are indexed by bitmasks: the i-th element is in
+    subset `S` if bit i of `S` is set. The transform is computed one element at
+    a time, in O(n 2**n) operations.
+
+    Parameters
+    ----------
+    values : array-like, shape (2**n, ...)
+        The value f[S] of each subset `S`.
+    inverse : bool
+        If True, compute the Mobius inverse instead, which recovers `f` from
+        the sums.
+
+    Returns
+    -------
+    sums : np.ndarray, shape (2**n, ...)
+        g[S] = sum(f[T] for T superset of S), or, if `inverse` is True,
+        g[S] = sum((-1)**|T - S| f[T] for T superset of S).
+
+    Examples
+    --------
+    >>> superset_transform([1, 2, 3, 4])
+    array([10.,  6.,  7.,  4.])
+
+    """
+    values, n = _subset_axes(values)
+    sign = -1 if inverse else 1
+    for axis in range(n):
+        index = [slice(None)] * values.ndim
+        index[axis] = 1
+        upper = values[tuple(index)]
+        index[axis] = 0
+        values[tuple(index)] += sign * upper
+    return values.reshape((2**n,) + values.shape[n:])
+
+
+def subset_sizes(n):
+    """
+    Returns the number of elements in each subset of n elements.
+
+    Parameters
+    ----------
+    n : int
+        The number of elements.
+
+    Returns
+    -------
+    sizes : np.ndarray, shape (2**n,)
+        The number of bits set in each bitmask from 0 to 2**n - 1.
+
+    """
+    sizes = np.zeros(1, dtype=int)
+    for _ in range(n):
+        sizes = np.concatenate([sizes, sizes + 1])
+    return sizes
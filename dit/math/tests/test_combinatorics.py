@@ -5,7 +5,8 @@ import pytest
 
 import numpy as np
 
-from dit.math.combinatorics import unitsum_tuples, slots
+from dit.math.combinatorics import (unitsum_tuples, slots, subset_sizes,
+                                    subset_transform, superset_transform)
 
 
 def test_unitsum_tuples1():
@@ -53,3 +54,28 @@ def test_slots2():
     x = np.asarray(list(slots(3, 2, normalized=True)))
     x_ = np.asarray([(0, 1), (1/3, 2/3), (2/3, 1/3), (1, 0)])
     assert np.allclose(x, x_)
+
+
+def test_subset_transform():
+    f = np.arange(8) + 1.0
+    g = subset_transform(f)
+    g_ = [sum(f[t] for t in range(8) if t & s == t) for s in range(8)]
+    assert np.allclose(g, g_)
+    assert np.allclose(subset_transform(g, inverse=True), f)
+
+
+def test_superset_transform():
+    f = np.random.rand(16, 3)
+    g = superset_transform(f)
+    g_ = [sum(f[t] for t in range(16) if t & s == s) for s in range(16)]
+    assert np.allclose(g, g_)
+    assert np.allclose(superset_transform(g, inverse=True), f)
+
+
+def test_subset_transform_length():
+    with pytest.raises(ValueError):
+        subset_transform([1, 2, 3])
+
+
+def test_subset_sizes():
+    assert list(subset_sizes(3)) == [0, 1, 1, 2, 1, 2, 2, 3]
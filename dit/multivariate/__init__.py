@@ -4,7 +4,7 @@ measures and others are more distantly related.
 """
 
 from .caekl_mutual_information import caekl_mutual_information
-from .coinformation import coinformation
+from .coinformation import coinformation, coinformations
 from .common_informations import *
 from .deweese import *
 from .dual_total_correlation import (binding_information,
@@ -16,4 +16,4 @@ from .entropy import entropy
 from .interaction_information import interaction_information
 from .secret_key_agreement import *
 from .total_correlation import total_correlation
-from .tse_complexity import tse_complexity
+from .tse_complexity import tse_complexity, tse_complexity_estimate
@@ -4,9 +4,98 @@ The CAEKL mutual information, as define [Chan, Chung, et al. "Multivariate Mutua
 
 from __future__ import division
 
+import numpy as np
+
+from ..exceptions import ditException
 from ..helpers import normalize_rvs
-from ..utils import partitions, unitful
-from .entropy import entropy
+from ..shannon import EntropyTable, shared_entropy_table
+from ..utils import unitful
+
+__all__ = ('caekl_mutual_information',
+          )
+
+
+def _partition_value(h, blocks):
+    """
+    The normalized excess entropy of a partition.
+
+    Parameters
+    ----------
+    h : np.ndarray, shape (2**n,)
+        The entropy of each union of random variables, indexed by bitmask.
+    blocks : list of int
+        The bitmask of each block of the partition.
+
+    Returns
+    -------
+    value : float
+        (sum(H[B] for B in blocks) - H[all]) / (len(blocks) - 1)
+    """
+    return (sum(h[b] for b in blocks) - h[-1]) / (len(blocks) - 1)
+
+
+def _dilworth_truncation(f, n):
+    """
+    Find the greedy vector of the Dilworth truncation of `f`.
+
+    The vector x is grown one random variable at a time, each entry as large
+    as possible subject to x(T) <= f(T) for every nonempty T. For submodular
+    `f`, x(all) is then the minimum of sum(f(B) for B in P) over all
+    partitions P [Lovasz, "Submodular functions and convexity", 1983].
+
+    Parameters
+    ----------
+    f : np.ndarray, shape (2**n,)
+        A submodular function of the nonempty subsets, indexed by bitmask.
+    n : int
+        The number of random variables.
+
+    Returns
+    -------
+    xs : np.ndarray, shape (2**n,)
+        x(S) for each subset S, indexed by bitmask.
+    """
+    xs = np.zeros(1)
+    for i in range(n):
+        size = 1 << i
+        # The sets T containing variable i are the S | bit for S before it.
+        x = (f[size:2*size] - xs).min()
+        xs = np.concatenate([xs, xs + x])
+    return xs
+
+
+def _tight_partition(f, xs, n):
+    """
+    Find the partition into the maximal sets T for which x(T) = f(T).
+
+    Parameters
+    ----------
+    f : np.ndarray, shape (2**n,)
+        A submodular function of the nonempty subsets, indexed by bitmask.
+    xs : np.ndarray, shape (2**n,)
+        The subset sums of the greedy vector of `f`.
+    n : int
+        The number of random variables.
+
+    Returns
+    -------
+    blocks : list of int
+        The bitmask of each block.
+    """
+    masks = np.arange(1, 2**n)
+    tol = 1e-10 * max(1.0, np.abs(f).max())
+    tight = masks[np.abs(xs[1:] - f[1:]) <= tol]
+    # Intersecting tight sets have a tight union, so each block is the union
+    # of the tight sets meeting it.
+    blocks = []
+    for i in range(n):
+        block = int(np.bitwise_or.reduce(tight[(tight >> i) & 1 == 1]))
+        block |= 1 << i
+        for other in [b for b in blocks if b & block]:
+            blocks.remove(other)
+            block |= other
+        blocks.append(block)
+    return blocks
 
 
 @unitful
@@ -16,8 +105,10 @@ def caekl_mutual_information(dist, rvs=None, crvs=None, rv_mode=None):
 
     Parameters
     ----------
-    dist : Distribution
-        The distribution from which the CAEKL mutual information is calculated.
+    dist : Distribution, EntropyTable
+        The distribution from which the CAEKL mutual information is
+        calculated, or an `EntropyTable` of it from which the entropies are
+        looked up.
     rvs : list, None
         A list of lists. Each inner list specifies the indexes of the random
         variables used to calculate the total correlation. If None, then the
@@ -50,17 +141,44 @@ def caekl_mutual_information(dist, rvs=None, crvs=None, rv_mode=None):
     Raises
     ------
     ditException
-        Raised if `dist` is not a joint distribution or if `rvs` or `crvs`
-        contain non-existant random variables.
+        Raised if `dist` is not a joint distribution, if `rvs` or `crvs`
+        contain non-existant random variables, or if `rvs` has fewer than two
+        elements.
+
+    Notes
+    -----
+    J >= g exactly when sum(H[B] - g for B in P) >= H[all] - g for every
+    partition P, and the minimum of the left hand side over partitions is the
+    Dilworth truncation of H - g, found greedily from the entropies of all
+    unions of `rvs`. Starting from the finest partition, g is repeatedly
+    lowered to the value of the partition attaining that minimum until no
+    partition does better, so only a few of the Bell-number many partitions
+    are ever evaluated. The entropies are looked up in an entropy table, which
+    is shared with other measures of `dist` after `dist.enable_entropy_table()`.
     """
+    if isinstance(dist, EntropyTable):
+        table, dist = dist, dist.dist
+    else:
+        table = shared_entropy_table(dist)
     rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
 
-    H = entropy(dist, rvs, crvs, rv_mode)
+    n = len(rvs)
+    if n < 2:
+        msg = "The CAEKL mutual information requires at least two groups."
+        raise ditException(msg)
 
-    def I_P(part):
-        a = sum(entropy(dist, rvs=p, crvs=crvs, rv_mode=rv_mode) for p in part)
-        return (a - H)/(len(part) - 1)
+    table.compute([set().union(crvs, *rvs)], rv_mode=rv_mode)
+    h = table.group_vector(rvs, crvs, rv_mode=rv_mode)
 
-    J = min(I_P(p) for p in partitions(map(tuple, rvs)) if len(p) > 1)
+    J = _partition_value(h, [1 << i for i in range(n)])
+    while True:
+        f = h - J
+        blocks = _tight_partition(f, _dilworth_truncation(f, n), n)
+        if len(blocks) < 2:
+            break
+        value = _partition_value(h, blocks)
+        if value >= J - 1e-12:
+            break
+        J = value
 
     return J
@@ -2,7 +2,7 @@
 The dual total correlation and variation of information.
 """
 
-from ..shannon import conditional_entropy as H
+from ..shannon import entropy_backend
 from ..helpers import normalize_rvs
 from ..utils import unitful
 
@@ -22,8 +22,9 @@ def dual_total_correlation(dist, rvs=None, crvs=None, rv_mode=None):
 
     Parameters
     ----------
-    dist : Distribution
-        The distribution from which the dual total correlation is calculated.
+    dist : Distribution, EntropyTable
+        The distribution from which the dual total correlation is calculated,
+        or an `EntropyTable` of it from which the entropies are looked up.
     rvs : list, None
         The indexes of the random variable used to calculate the binding
         information. If None, then the dual total correlation is calculated
@@ -50,6 +51,7 @@ def dual_total_correlation(dist, rvs=None, crvs=None, rv_mode=None):
         Raised if `dist` is not a joint distribution or if `rvs` or `crvs`
         contain non-existant random variables.
     """
+    dist, H = entropy_backend(dist, rvs, crvs, rv_mode)
     rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
 
     others = lambda rv, rvs: set(set().union(*rvs)) - set(rv)
@@ -69,8 +71,9 @@ def residual_entropy(dist, rvs=None, crvs=None, rv_mode=None):
 
     Parameters
     ----------
-    dist : Distribution
-        The distribution from which the residual entropy is calculated.
+    dist : Distribution, EntropyTable
+        The distribution from which the residual entropy is calculated, or an
+        `EntropyTable` of it from which the entropies are looked up.
     rvs : list, None
         The indexes of the random variable used to calculate the residual
         entropy. If None, then the total correlation is calculated
@@ -97,6 +100,7 @@ def residual_entropy(dist, rvs=None, crvs=None, rv_mode=None):
         Raised if `dist` is not a joint distribution or if `rvs` or `crvs`
         contain non-existant random variables.
     """
+    dist, H = entropy_backend(dist, rvs, crvs, rv_mode)
     rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
 
     others = lambda rv, rvs: set(set().union(*rvs)) - set(rv)
@@ -4,7 +4,7 @@ measures.
 """
 
 from ..helpers import normalize_rvs
-from ..shannon import conditional_entropy, entropy as shannon_entropy
+from ..shannon import entropy as shannon_entropy, entropy_backend
 from ..utils import flatten, unitful
 
 
@@ -15,8 +15,9 @@ def entropy(dist, rvs=None, crvs=None, rv_mode=None):
 
     Parameters
     ----------
-    dist : Distribution
-        The distribution from which the entropy is calculated.
+    dist : Distribution, EntropyTable
+        The distribution from which the entropy is calculated, or an
+        `EntropyTable` of it from which the entropies are looked up.
     rvs : list, None
         The indexes of the random variable used to calculate the entropy. If
         None, then the entropy is calculated over all random variables.
@@ -71,10 +72,11 @@ def entropy(dist, rvs=None, crvs=None, rv_mode=None):
     1.0
 
     """
+    dist, H = entropy_backend(dist)
     if dist.is_joint():
         rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
         rvs = list(flatten(rvs))
-        H = conditional_entropy(dist, rvs, crvs, rv_mode=rv_mode)
+        H = H(dist, rvs, crvs, rv_mode=rv_mode)
     else:
         H = shannon_entropy(dist)
 
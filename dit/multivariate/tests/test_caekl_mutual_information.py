@@ -6,13 +6,18 @@ from __future__ import division
 
 import pytest
 
+import numpy as np
+
 from dit import Distribution as D, ScalarDistribution as SD
 from dit.distconst import all_dist_structures, random_distribution
+from dit.example_dists import n_mod_m
 from dit.multivariate import (caekl_mutual_information as J,
                               coinformation as I,
                               total_correlation as T,
                              )
 from dit.exceptions import ditException
+from dit.shannon import EntropyTable
+from dit.utils import partitions
 
 
 @pytest.mark.parametrize('d', list(all_dist_structures(2, 3)) +
@@ -51,3 +56,34 @@ def test_caekl_4(d):
     correlation.
     """
     assert J(d) <= (T(d)/3) + 1e-6
+
+
+@pytest.mark.parametrize('n', [3, 4, 5])
+def test_caekl_5(n):
+    """
+    Test against the minimum over every partition.
+    """
+    d = random_distribution(n, 2, alpha=(0.1,)*2**n, prng=np.random.RandomState(n))
+    table = EntropyTable(d)
+    H = table.entropy()
+    values = [(sum(table[block] for block in part) - H)/(len(part) - 1)
+              for part in partitions(range(n)) if len(part) > 1]
+    assert J(d) == pytest.approx(min(values))
+    assert J(table) == pytest.approx(min(values))
+
+
+def test_caekl_6():
+    """
+    Test many variables, where the finest partition is optimal.
+    """
+    d = n_mod_m(12, 2)
+    assert J(d) == pytest.approx(1/11)
+
+
+def test_caekl_7():
+    """
+    Test that a single group is rejected.
+    """
+    d = D(['00', '11'], [1/2]*2)
+    with pytest.raises(ditException):
+        J(d, [[0, 1]])
@@ -6,9 +6,15 @@ from __future__ import division
 
 import pytest
 
-from dit import Distribution as D, ScalarDistribution as SD
-from dit.multivariate import coinformation as I, entropy as H
+import numpy as np
+
+from dit import (Distribution as D, ScalarDistribution as SD,
+                 random_distribution)
+from dit.multivariate import (coinformation as I, coinformations as Is,
+                              entropy as H)
 from dit.exceptions import ditException
+from dit.shannon import conditional_entropy
+from dit.utils import powerset
 from dit.example_dists import n_mod_m
 
 def test_coi1():
@@ -64,3 +70,16 @@ def test_coi8():
     d = SD([1/3]*3)
     with pytest.raises(ditException):
         I(d)
+
+def test_coi9():
+    """ Test the coinformation of every subset against the alternating sum """
+    d = random_distribution(4, 2, prng=np.random.RandomState(0))
+    rvs = [[0, 1], [2], [3]]
+    for crvs in [[], [1]]:
+        values = Is(d, rvs, crvs)
+        for mask in range(8):
+            groups = [rv for i, rv in enumerate(rvs) if mask >> i & 1]
+            value = sum((-1)**(len(sub) + 1) *
+                        conditional_entropy(d, set().union(*sub), crvs)
+                        for sub in powerset(groups) if sub)
+            assert values[mask] == pytest.approx(value)
@@ -6,9 +6,14 @@ from __future__ import division
 
 import pytest
 
-from dit import Distribution as D
-from dit.multivariate import binding_information as B, tse_complexity as TSE
+import numpy as np
+
+from dit import Distribution as D, random_distribution
+from dit.multivariate import (binding_information as B,
+                              tse_complexity as TSE,
+                              tse_complexity_estimate as TSE_est)
 from dit.example_dists import n_mod_m
+from dit.exceptions import ditException
 from dit.math.misc import combinations as nCk
 from dit.utils import powerset
 
@@ -29,3 +34,40 @@ def test_tse2(n):
     d = D(['0'*n, '1'*n], [1/2, 1/2])
     tse = TSE(d)
     assert tse == pytest.approx((n-1)/2)
+
+
+def test_tse_estimate1():
+    """ Test that the estimate is exact when every subset fits the budget """
+    d = n_mod_m(5, 2)
+    tse, error = TSE_est(d, samples=10)
+    assert tse == pytest.approx(TSE(d))
+    assert error == 0
+
+
+def test_tse_estimate2():
+    """ Test the sampled estimate against the exact value """
+    d = D(['0'*12, '1'*12], [1/2, 1/2])
+    tse, error = TSE_est(d, samples=20)
+    assert tse == pytest.approx(11/2)
+    assert error == pytest.approx(0)
+
+    d = random_distribution(10, 2, prng=np.random.RandomState(0))
+    tse, error = TSE_est(d, samples=50)
+    assert error > 0
+    assert abs(tse - TSE(d)) < 6*error
+
+
+def test_tse_estimate3():
+    """ Test that rvs is the second positional argument """
+    d = n_mod_m(4, 2)
+    tse, error = TSE_est(d, [[0], [1], [2]])
+    assert tse == pytest.approx(TSE(d, [[0], [1], [2]]))
+    assert error == 0
+
+
+@pytest.mark.parametrize('samples', [-1, 0, 1])
+def test_tse_estimate4(samples):
+    """ Test that too few samples are rejected """
+    d = n_mod_m(5, 2)
+    with pytest.raises(ditException):
+        TSE_est(d, samples=samples)
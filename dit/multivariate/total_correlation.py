@@ -3,7 +3,7 @@ The total correlation, aka the multi-information or the integration.
 """
 
 from ..helpers import normalize_rvs
-from ..shannon import conditional_entropy as H
+from ..shannon import entropy_backend
 from ..utils import unitful
 
 
@@ -15,8 +15,9 @@ def total_correlation(dist, rvs=None, crvs=None, rv_mode=None):
 
     Parameters
     ----------
-    dist : Distribution
-        The distribution from which the total correlation is calculated.
+    dist : Distribution, EntropyTable
+        The distribution from which the total correlation is calculated, or an
+        `EntropyTable` of it from which the entropies are looked up.
     rvs : list, None
         A list of lists. Each inner list specifies the indexes of the random
         variables used to calculate the total correlation. If None, then the
@@ -52,6 +53,7 @@ def total_correlation(dist, rvs=None, crvs=None, rv_mode=None):
         Raised if `dist` is not a joint distribution or if `rvs` or `crvs`
         contain non-existant random variables.
     """
+    dist, H = entropy_backend(dist, rvs, crvs, rv_mode)
     rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
 
     one = sum([H(dist, rv, crvs, rv_mode=rv_mode) for rv in rvs])
@@ -5,11 +5,63 @@ from __future__ import division
 
 from itertools import combinations
 
-from ..shannon import conditional_entropy as H
+import numpy as np
+
+from ..exceptions import ditException
+from ..shannon import EntropyTable, shared_entropy_table
 from ..helpers import normalize_rvs
 from ..math.misc import combinations as nCk
 from ..utils import unitful
 
+__all__ = ('tse_complexity',
+           'tse_complexity_estimate',
+          )
+
+
+def _prepare(dist, rvs, crvs, rv_mode):
+    """
+    Find the entropy table and random variables to use.
+
+    Parameters
+    ----------
+    dist : Distribution, EntropyTable
+        The distribution, or an entropy table of it.
+    rvs : list, None
+        The random variables.
+    crvs : list, None
+        The random variables to condition on.
+    rv_mode : str, None
+        Specifies how to interpret `rvs` and `crvs`.
+
+    Returns
+    -------
+    H : function
+        Returns the entropy of the union of a collection of `rvs`, conditioned
+        on `crvs`.
+    table : EntropyTable
+        The table the entropies are looked up in.
+    rvs : list
+        The explicit random variables to use.
+    crvs : list
+        The explicit random variables to condition on.
+    rv_mode : str
+        The value of rv_mode that should be used.
+    """
+    if isinstance(dist, EntropyTable):
+        table = dist
+    else:
+        table = shared_entropy_table(dist)
+    rvs, crvs, rv_mode = normalize_rvs(table.dist, rvs, crvs, rv_mode)
+
+    def H(subset):
+        """
+        The entropy of the union of `subset`, conditioned on `crvs`.
+        """
+        rv = set().union(*subset)
+        return table.conditional_entropy(rv, crvs, rv_mode=rv_mode)
+
+    return H, table, rvs, crvs, rv_mode
+
 
 @unitful
 def tse_complexity(dist, rvs=None, crvs=None, rv_mode=None):
@@ -18,8 +70,9 @@ def tse_complexity(dist, rvs=None, crvs=None, rv_mode=None):
 
     Parameters
     ----------
-    dist : Distribution
-        The distribution from which the TSE complexity is calculated.
+    dist : Distribution, EntropyTable
+        The distribution from which the TSE complexity is calculated, or an
+        `EntropyTable` of it from which the entropies are looked up.
     rvs : list, None
         The indexes of the random variable used to calculate the TSE complexity
         between. If None, then the TSE complexity is calculated over all random
@@ -45,21 +98,117 @@ def tse_complexity(dist, rvs=None, crvs=None, rv_mode=None):
     ditException
         Raised if `dist` is not a joint distribution or if `rvs` or `crvs`
         contain non-existant random variables.
+
+    Notes
+    -----
+    Every subset of `rvs` is visited, so the entropies of all subsets of the
+    random variables involved are computed at once, in an entropy table. It is
+    shared with other measures of `dist` after `dist.enable_entropy_table()`.
+    For many random variables, see `tse_complexity_estimate`.
     """
-    rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
+    H, table, rvs, crvs, rv_mode = _prepare(dist, rvs, crvs, rv_mode)
+    table.compute([set().union(crvs, *rvs)], rv_mode=rv_mode)
 
-    joint = H(dist, set().union(*rvs), crvs, rv_mode=rv_mode)
+    joint = H(rvs)
     N = len(rvs)
 
     def sub_entropies(k):
         """
         Compute the average entropy of all subsets of `rvs` of size `k`.
         """
-        sub_rvs = (set().union(*rv) for rv in combinations(rvs, k))
-        subH = sum(H(dist, rv, crvs, rv_mode=rv_mode) for rv in sub_rvs)
+        subH = sum(H(sub_rvs) for sub_rvs in combinations(rvs, k))
         subH /= nCk(N, k)
         return subH
 
     TSE = sum(sub_entropies(k) - k/N * joint for k in range(1, N))
 
     return TSE
+
+
+@unitful
+def _with_units(value):
+    """
+    Returns `value`, with units if they are enabled.
+    """
+    return value
+
+
+def tse_complexity_estimate(dist, rvs=None, crvs=None, rv_mode=None,
+                            samples=100, prng=None):
+    """
+    Estimates the TSE complexity from random subsets of each size.
+
+    For each size k, the average entropy of the subsets of size k is estimated
+    from `samples` distinct subsets drawn uniformly at random. Sizes with no
+    more than `samples` subsets are averaged exactly.
+
+    Parameters
+    ----------
+    dist : Distribution, EntropyTable
+        The distribution from which the TSE complexity is calculated, or an
+        `EntropyTable` of it from which the entropies are looked up.
+    rvs : list, None
+        The indexes of the random variable used to calculate the TSE complexity
+        between. If None, then the TSE complexity is calculated over all random
+        variables.
+    crvs : list, None
+        The indexes of the random variables to condition on. If None, then no
+        variables are condition on.
+    rv_mode : str, None
+        Specifies how to interpret `rvs` and `crvs`. Valid options are:
+        {'indices', 'names'}. If equal to 'indices', then the elements of
+        `crvs` and `rvs` are interpreted as random variable indices. If equal
+        to 'names', the the elements are interpreted as random variable names.
+        If `None`, then the value of `dist._rv_mode` is consulted, which
+        defaults to 'indices'.
+    samples : int
+        The number of random subsets drawn for each size. At least two are
+        needed to estimate the standard error.
+    prng : RandomState, None
+        The random number generator used to draw the subsets. If None, then
+        `dist.prng` is used.
+
+    Returns
+    -------
+    TSE : float
+        The estimated TSE complexity.
+    error : float
+        The standard error of the estimate, in the same units as `TSE`.
+
+    Raises
+    ------
+    ditException
+        Raised if `dist` is not a joint distribution, if `rvs` or `crvs`
+        contain non-existant random variables, or if `samples` is less than 2.
+    """
+    if samples < 2:
+        msg = "At least two samples are required, not {0}.".format(samples)
+        raise ditException(msg)
+
+    H, table, rvs, crvs, rv_mode = _prepare(dist, rvs, crvs, rv_mode)
+    if prng is None:
+        prng = table.dist.prng
+
+    joint = H(rvs)
+    N = len(rvs)
+
+    TSE = 0.0
+    variance = 0.0
+    for k in range(1, N):
+        total = nCk(N, k)
+        if total <= samples:
+            subH = np.mean([H(sub_rvs) for sub_rvs in combinations(rvs, k)])
+        else:
+            # Distinct subsets, so that the population is sampled without
+            # replacement.
+            draws = set()
+            while len(draws) < samples:
+                draws.add(tuple(sorted(prng.choice(N, k, replace=False))))
+            values = np.array([H([rvs[i] for i in draw]) for draw in draws])
+            subH = values.mean()
+            # The variance of the mean, with the finite population correction.
+            fpc = (total - samples) / (total - 1)
+            variance += values.var(ddof=1) / samples * fpc
+        TSE += subH - k/N * joint
+
+    return _with_units(TSE), _with_units(np.sqrt(variance))
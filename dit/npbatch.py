@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module defining a NumPy array-based batch of distributions.
+
+Bootstrap replicates, sliding windows and per-subject fits all produce many
+distributions over the same sample space. Rather than a list of separate
+distributions, a `DistributionBatch` stores their linear pmfs as the rows of
+a single 2D array whose columns are the outcomes of a Cartesian product sample
+space. Each row then reshapes into a tensor with one axis per random variable,
+so that a marginal of every distribution is a single sum over the other axes,
+and information measures are computed for the whole batch at once.
+
+"""
+
+from __future__ import division
+
+from itertools import chain
+
+import numpy as np
+from six.moves import range, zip # pylint: disable=redefined-builtin
+
+from .exceptions import ditException
+from .helpers import copypmf, normalize_rvs, parse_rvs
+from .npdist import Distribution
+from .samplespace import CartesianProduct, SampleSpace
+from .utils import flatten, powerset, unitful
+
+__all__ = [
+    'DistributionBatch',
+]
+
+
+class DistributionBatch(object):
+    """
+    A batch of distributions over one Cartesian product sample space.
+
+    Attributes
+    ----------
+    pmf : NumPy array, shape (N, len(sample_space))
+        The linear probabilities. Row i is the pmf of the ith distribution,
+        ordered like the sample space.
+
+    sample_space : CartesianProduct
+        The sample space shared by every distribution.
+
+    Notes
+    -----
+    The entropies of marginals are cached, so `pmf` must not be modified
+    in-place once measures have been computed.
+
+    """
+    def __init__(self, pmf, sample_space, rv_names=None):
+        """
+        Initialize the batch.
+
+        Parameters
+        ----------
+        pmf : NumPy array, shape (N, len(sample_space))
+            The linear pmf of each distribution, ordered like the sample space.
+        sample_space : CartesianProduct
+            The sample space of the distributions.
+        rv_names : sequence, None
+            The names of the random variables.
+
+        Raises
+        ------
+        ditException
+            If `sample_space` is not a Cartesian product of plain alphabets,
+            or if `pmf` does not have one column per outcome.
+
+        """
+        if not isinstance(sample_space, CartesianProduct) or \
+           any(isinstance(alphabet, SampleSpace)
+               for alphabet in sample_space.alphabets):
+            msg = 'Batches require a Cartesian product sample space of plain '
+            msg += 'alphabets.'
+            raise ditException(msg)
+
+        pmf = np.asarray(pmf, dtype=float)
+        if pmf.ndim != 2 or pmf.shape[1] != len(sample_space):
+            msg = 'pmf must have shape (N, {0}).'.format(len(sample_space))
+            raise ditException(msg)
+
+        self.pmf = pmf
+        self.sample_space = sample_space
+
+        # A distribution over the sample space, used to interpret rvs.
+        zeros = np.zeros(len(sample_space))
+        self._template = Distribution.from_dense_pmf(zeros, sample_space)
+        if rv_names is not None:
+            self._template.set_rv_names(rv_names)
+
+        self._entropies = {}
+
+    @classmethod
+    def from_distributions(cls, dists, sample_space=None):
+        """
+        Construct a batch from a sequence of distributions.
+
+        Parameters
+        ----------
+        dists : sequence of Distribution
+            The distributions, which must have the same outcome length.
+        sample_space : CartesianProduct, None
+            The sample space of the batch. If `None`, then each alphabet is
+            the union of the corresponding alphabets of `dists`.
+
+        Returns
+        -------
+        batch : DistributionBatch
+            The batch, whose ith row is the pmf of `dists[i]`.
+
+        Raises
+        ------
+        ditException
+            If `dists` is empty, or if some distribution has outcomes which
+            are not in `sample_space`.
+
+        """
+        dists = list(dists)
+        if not dists:
+            raise ditException('At least one distribution is required.')
+        first = dists[0]
+
+        if sample_space is None:
+            spaces = set(id(d._sample_space) for d in dists)
+            if len(spaces) == 1 and \
+               isinstance(first._sample_space, CartesianProduct):
+                sample_space = first._sample_space
+            else:
+                sample_space = _union_sample_space(dists)
+
+        pmf = np.zeros((len(dists), len(sample_space)))
+        for row, d in zip(pmf, dists):
+            try:
+                idx = sample_space.index_many(d.outcomes)
+            except ValueError:
+                msg = 'Outcomes are not in the sample space of the batch.'
+                raise ditException(msg)
+            row[idx] = copypmf(d, base='linear')
+
+        return cls(pmf, sample_space, rv_names=first.get_rv_names())
+
+    def __len__(self):
+        return len(self.pmf)
+
+    def __getitem__(self, i):
+        """
+        Returns the ith distribution, which shares memory with the batch.
+
+        """
+        d = Distribution.from_dense_pmf(self.pmf[i], self.sample_space)
+        d.set_rv_names(self.get_rv_names())
+        return d
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return '<{0}: {1} distributions over {2} outcomes>'.format(
+            self.__class__.__name__, len(self), len(self.sample_space))
+
+    def get_rv_names(self):
+        """
+        Returns the names of the random variables, or `None`.
+
+        """
+        return self._template.get_rv_names()
+
+    def outcome_length(self):
+        """
+        Returns the number of random variables.
+
+        """
+        return len(self.sample_space.alphabets)
+
+    def _tensor(self):
+        """
+        Returns the pmf with one axis for the batch and one per variable.
+
+        """
+        return self.pmf.reshape((len(self),) + self.sample_space.alphabet_sizes)
+
+    def _marginal_pmf(self, indexes):
+        """
+        Returns the pmfs of the marginal on `indexes`, as a 2D array.
+
+        """
+        indexes = set(indexes)
+        sizes = self.sample_space.alphabet_sizes
+        axes = tuple(i + 1 for i in range(self.outcome_length())
+                     if i not in indexes)
+        size = int(np.prod([sizes[i] for i in sorted(indexes)], dtype=int))
+        return self._tensor().sum(axis=axes).reshape(len(self), size)
+
+    def _entropy(self, indexes):
+        """
+        Returns the joint entropy, in bits, of the random variables `indexes`.
+
+        Entropies are cached, so that measures sharing subsets of random
+        variables reduce each subset only once.
+
+        """
+        key = frozenset(indexes)
+        if key not in self._entropies:
+            pmf = self._marginal_pmf(key)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                H = -np.nansum(pmf * np.log2(pmf), axis=1)
+            self._entropies[key] = H
+        return self._entropies[key]
+
+    def _indexes(self, rvs, rv_mode=None):
+        """
+        Returns the indexes of the random variables `rvs`.
+
+        """
+        return parse_rvs(self._template, rvs, rv_mode, unique=False)[1]
+
+    def _normalize(self, rvs, crvs, rv_mode, groups=True):
+        """
+        Returns the indexes of `rvs`, and the indexes of `crvs`.
+
+        If `groups` is `True`, then `rvs` is a list of groups of random
+        variables, and a list of groups of indexes is returned. Otherwise, the
+        random variables are flattened into a single list of indexes.
+
+        """
+        rvs, crvs, rv_mode = normalize_rvs(self._template, rvs, crvs, rv_mode)
+        if groups:
+            rvs = [list(self._indexes(rv, rv_mode)) for rv in rvs]
+        else:
+            rvs = list(self._indexes(list(flatten(rvs)), rv_mode))
+        crvs = list(self._indexes(crvs, rv_mode))
+        return rvs, crvs
+
+    def marginal(self, rvs, rv_mode=None):
+        """
+        Returns the batch of marginals on the random variables `rvs`.
+
+        Parameters
+        ----------
+        rvs : list
+            The random variables to keep.
+        rv_mode : str, None
+            Specifies how to interpret `rvs`. Valid options are: {'indices',
+            'names'}. If `None`, then 'indices' is used unless the random
+            variables have been named.
+
+        Returns
+        -------
+        batch : DistributionBatch
+            The marginal distributions.
+
+        """
+        indexes = sorted(set(self._indexes(rvs, rv_mode)))
+        alphabets = [self.sample_space.alphabets[i] for i in indexes]
+        sample_space = CartesianProduct(alphabets,
+                                        product=self.sample_space._product)
+
+        rv_names = self.get_rv_names()
+        if rv_names is not None:
+            rv_names = [rv_names[i] for i in indexes]
+
+        pmf = self._marginal_pmf(indexes)
+        return DistributionBatch(pmf, sample_space, rv_names=rv_names)
+
+    @unitful
+    def entropy(self, rvs=None, crvs=None, rv_mode=None):
+        """
+        Returns the conditional joint entropy H[rvs|crvs] of each distribution.
+
+        Parameters
+        ----------
+        rvs : list, None
+            The random variables. If `None`, then all random variables are
+            used.
+        crvs : list, None
+            The random variables to condition on. If `None`, then no variables
+            are conditioned on.
+        rv_mode : str, None
+            Specifies how to interpret `rvs` and `crvs`.
+
+        Returns
+        -------
+        H : NumPy array, shape (N,)
+            The entropies, in bits.
+
+        """
+        rvs, crvs = self._normalize(rvs, crvs, rv_mode, groups=False)
+        return self._entropy(rvs + crvs) - self._entropy(crvs)
+
+    @unitful
+    def mutual_information(self, rvs_X, rvs_Y, crvs=None, rv_mode=None):
+        """
+        Returns the mutual information I[X:Y|Z] of each distribution.
+
+        Parameters
+        ----------
+        rvs_X : list
+            The random variables of X.
+        rvs_Y : list
+            The random variables of Y.
+        crvs : list, None
+            The random variables of Z. If `None`, then no variables are
+            conditioned on.
+        rv_mode : str, None
+            Specifies how to interpret `rvs_X`, `rvs_Y` and `crvs`.
+
+        Returns
+        -------
+        I : NumPy array, shape (N,)
+            The mutual informations, in bits.
+
+        """
+        X, Z = self._normalize(rvs_X, crvs, rv_mode, groups=False)
+        Y, _ = self._normalize(rvs_Y, crvs, rv_mode, groups=False)
+        return (self._entropy(X + Z) + self._entropy(Y + Z) -
+                self._entropy(X + Y + Z) - self._entropy(Z))
+
+    @unitful
+    def coinformation(self, rvs=None, crvs=None, rv_mode=None):
+        """
+        Returns the co-information I[rvs|crvs] of each distribution.
+
+        Parameters
+        ----------
+        rvs : list, None
+            A list of lists. Each inner list specifies the indexes of the
+            random variables in one group. If `None`, then each random
+            variable is its own group.
+        crvs : list, None
+            The random variables to condition on. If `None`, then no variables
+            are conditioned on.
+        rv_mode : str, None
+            Specifies how to interpret `rvs` and `crvs`.
+
+        Returns
+        -------
+        I : NumPy array, shape (N,)
+            The co-informations, in bits.
+
+        """
+        rvs, crvs = self._normalize(rvs, crvs, rv_mode)
+        H_crvs = self._entropy(crvs)
+        I = np.zeros(len(self))
+        for Xs in powerset(rvs):
+            if Xs:
+                H = self._entropy(list(chain.from_iterable(Xs)) + crvs) - H_crvs
+                I += (-1)**(len(Xs) + 1) * H
+        return I
+
+    @unitful
+    def total_correlation(self, rvs=None, crvs=None, rv_mode=None):
+        """
+        Returns the total correlation T[rvs|crvs] of each distribution.
+
+        Parameters
+        ----------
+        rvs : list, None
+            A list of lists. Each inner list specifies the indexes of the
+            random variables in one group. If `None`, then each random
+            variable is its own group.
+        crvs : list, None
+            The random variables to condition on. If `None`, then no variables
+            are conditioned on.
+        rv_mode : str, None
+            Specifies how to interpret `rvs` and `crvs`.
+
+        Returns
+        -------
+        T : NumPy array, shape (N,)
+            The total correlations, in bits.
+
+        """
+        rvs, crvs = self._normalize(rvs, crvs, rv_mode)
+        H_crvs = self._entropy(crvs)
+        one = sum(self._entropy(rv + crvs) - H_crvs for rv in rvs)
+        two = self._entropy(list(chain.from_iterable(rvs)) + crvs) - H_crvs
+        return one - two
+
+    @unitful
+    def kullback_leibler_divergence(self, other, rvs=None, crvs=None,
+                                    rv_mode=None):
+        """
+        Returns the Kullback-Leibler divergence of each distribution from
+        `other`.
+
+        Parameters
+        ----------
+        other : DistributionBatch, Distribution
+            The second distributions. A batch must either have the same length
+            as this one, or be a single distribution which is compared with
+            every distribution of this batch.
+        rvs : list, None
+            The random variables. If `None`, then all random variables are
+            used.
+        crvs : list, None
+            The random variables to condition on. If `None`, then no variables
+            are conditioned on.
+        rv_mode : str, None
+            Specifies how to interpret `rvs` and `crvs`.
+
+        Returns
+        -------
+        dkl : NumPy array, shape (N,)
+            The Kullback-Leibler divergences, in bits.
+
+        Raises
+        ------
+        ditException
+            If `other` is not over the sample space of this batch.
+
+        """
+        if not isinstance(other, DistributionBatch):
+            other = DistributionBatch.from_distributions([other],
+                                                         self.sample_space)
+        elif other.sample_space.alphabets != self.sample_space.alphabets:
+            msg = 'The batches must have the same sample space.'
+            raise ditException(msg)
+
+        rvs, crvs = self._normalize(rvs, crvs, rv_mode, groups=False)
+
+        def divergence(indexes):
+            """
+            Returns the divergences of the marginals on `indexes`.
+            """
+            p = self._marginal_pmf(indexes)
+            q = other._marginal_pmf(indexes)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                terms = p * np.log2(p / q)
+            terms[p == 0] = 0
+            return terms.sum(axis=1)
+
+        dkl = divergence(rvs + crvs)
+        if crvs:
+            dkl = dkl - divergence(crvs)
+        return dkl
+
+
+def _union_sample_space(dists):
+    """
+    Returns the Cartesian product of the union of the alphabets of `dists`.
+
+    """
+    first = dists[0]
+    n = first.outcome_length()
+    if any(d.outcome_length() != n for d in dists):
+        raise ditException('The distributions must have the same outcome length.')
+
+    alphabets = []
+    for i in range(n):
+        symbols = set(chain.from_iterable(d.alphabet[i] for d in dists))
+        try:
+            symbols = sorted(symbols)
+        except TypeError:
+            symbols = list(symbols)
+        alphabets.append(symbols)
+
+    return CartesianProduct(alphabets, product=first._product)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module defining a NumPy array-based conditional distribution class.
+
+A conditional distribution P(Y|X) is stored as a 2D array whose rows are the
+outcomes x of the marginal P(X) and whose columns are the outcomes y of P(Y).
+For compatibility with code expecting a list of distributions P(Y|X=x), the
+class is also a sequence of distributions. These are only constructed when
+accessed, so that computations can work on the array alone.
+
+"""
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    # Py 2.x and < 3.3
+    from collections import Sequence
+
+import numpy as np
+from six.moves import range # pylint: disable=redefined-builtin
+
+from .exceptions import InvalidOutcome
+from .helpers import copypmf, rebase_pmf
+
+__all__ = [
+    'ConditionalDistribution',
+]
+
+
+class ConditionalDistribution(Sequence):
+    """
+    A conditional distribution P(Y|X), stored as an array.
+
+    The distributions P(Y|X=x) obtained by indexing are built from `pmf`, and
+    changes made to them are not reflected in `pmf`.
+
+    Attributes
+    ----------
+    marginal : Distribution, ScalarDistribution
+        The distribution P(X) of the conditioned random variables.
+
+    dist : Distribution
+        The distribution P(Y). Its outcomes label the columns of `pmf`, and
+        its sample space, mask and random variable names are given to each
+        conditional distribution.
+
+    ops : Operations instance
+        The operations for the base of `pmf`.
+
+    pmf : NumPy array, shape (len(marginal), len(dist))
+        The conditional probabilities. Row i is the pmf of P(Y|X=x), where x
+        is the ith outcome of `marginal`.
+
+    """
+    def __init__(self, marginal, pmf, dist, sparse=True, extract=False):
+        """
+        Initialize the conditional distribution.
+
+        Parameters
+        ----------
+        marginal : Distribution, ScalarDistribution
+            The distribution P(X).
+        pmf : NumPy array
+            The conditional probabilities, in the base of `dist`.
+        dist : Distribution
+            The distribution P(Y).
+        sparse : bool
+            If `True`, the conditional distributions omit null outcomes.
+        extract : bool
+            If `True`, the conditional distributions are scalar distributions.
+
+        """
+        self.marginal = marginal
+        self.pmf = pmf
+        self.dist = dist
+        self.ops = dist.ops
+        self._sparse = sparse
+        self._extract = extract
+        self._dists = [None] * len(pmf)
+
+    def __len__(self):
+        return len(self.pmf)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        # Normalize negative indexes, and raise IndexError when out of range.
+        i = range(len(self))[i]
+        if self._dists[i] is None:
+            self._dists[i] = self._build(i)
+        return self._dists[i]
+
+    def _build(self, i):
+        """
+        Returns the conditional distribution of the ith row of `pmf`.
+
+        """
+        from .npdist import Distribution, _make_distribution
+        from .npscalardist import ScalarDistribution
+
+        dist = self.dist
+        pmf = np.array(self.pmf[i], copy=True)
+        base = self.ops.get_base()
+        if dist.is_compact():
+            d = _make_distribution(dist.outcomes, pmf, base=base,
+                                   sample_space=dist._sample_space)
+            if self._sparse:
+                d.make_sparse()
+            else:
+                d.make_dense()
+        else:
+            d = Distribution(dist.outcomes, pmf, sparse=self._sparse,
+                             base=base, sample_space=dist._sample_space,
+                             validate=False)
+
+        d._new_mask(from_mask=dist._mask)
+        d.set_rv_names(dist.get_rv_names())
+
+        if self._extract:
+            d = ScalarDistribution.from_distribution(d)
+
+        return d
+
+    def _linear(self):
+        """
+        Returns the conditional probabilities as linear probabilities.
+
+        """
+        return rebase_pmf(np.array(self.pmf, copy=True), self.ops, 'linear')
+
+    def _units(self, H):
+        """
+        Converts entropies in bits to the units of the distribution.
+
+        """
+        if self.is_log():
+            H = H / np.log2(self.ops.get_base(numerical=True))
+        return H
+
+    def given(self, outcome):
+        """
+        Returns the conditional distribution P(Y|X=outcome).
+
+        Parameters
+        ----------
+        outcome : outcome
+            An outcome of `marginal`.
+
+        Returns
+        -------
+        d : Distribution
+            The conditional distribution.
+
+        Raises
+        ------
+        InvalidOutcome
+            If `outcome` is not an outcome of `marginal`.
+
+        """
+        try:
+            i = self.marginal._outcomes_index[outcome]
+        except KeyError:
+            raise InvalidOutcome(outcome)
+        return self[i]
+
+    def is_log(self):
+        """
+        Returns `True` if the probabilities are log probabilities.
+
+        """
+        return self.ops.get_base() != 'linear'
+
+    def is_sparse(self):
+        """
+        Returns `True` if the conditional distributions omit null outcomes.
+
+        """
+        return self._sparse
+
+    def to_array(self, base=None, dense=False):
+        """
+        Returns a copy of the conditional pmf array.
+
+        Parameters
+        ----------
+        base : float, 'linear', 'e', None
+            The desired base of the probabilities. If `None`, then the
+            probabilities maintain their current base.
+        dense : bool
+            If `True`, the columns are the entire sample space of `dist`,
+            rather than its outcomes.
+
+        Returns
+        -------
+        pmf : NumPy array
+            The conditional probabilities. Rows are X, columns are Y.
+
+        """
+        pmf = np.array(self.pmf, copy=True)
+        if dense and not self.dist.is_dense():
+            full = self.dist.copy()
+            full.make_dense()
+            columns = [full._outcomes_index[o] for o in self.dist.outcomes]
+            dense_pmf = np.empty((len(pmf), len(full)), dtype=float)
+            dense_pmf.fill(self.ops.zero)
+            dense_pmf[:, columns] = pmf
+            pmf = dense_pmf
+
+        if base is None:
+            return pmf
+        return rebase_pmf(pmf, self.ops, base)
+
+    def entropies(self):
+        """
+        Returns the entropy of each conditional distribution, H[Y|X=x].
+
+        If the distribution represents linear probabilities, then the entropies
+        are calculated in bits. Otherwise, they are calculated in the base of
+        the distribution.
+
+        Returns
+        -------
+        H : NumPy array, shape (len(marginal),)
+            The entropy of each conditional distribution.
+
+        """
+        pmf = self._linear()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            H = np.nansum(-pmf * np.log2(pmf), axis=1)
+        return self._units(H)
+
+    def entropy(self):
+        """
+        Returns the conditional entropy H[Y|X].
+
+        Returns
+        -------
+        H : float
+            The conditional entropy.
+
+        """
+        p_x = copypmf(self.marginal, base='linear')
+        return float(np.dot(p_x, self.entropies()))
+
+    def mutual_information(self):
+        """
+        Returns the mutual information I[X:Y] between X and Y.
+
+        Returns
+        -------
+        I : float
+            The mutual information.
+
+        """
+        p_x = copypmf(self.marginal, base='linear')
+        p_y = np.dot(p_x, self._linear())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            H_y = np.nansum(-p_y * np.log2(p_y))
+        return float(self._units(H_y)) - self.entropy()
@@ -63,19 +63,22 @@ This has to do with sorting the alphabets. Probably this can be relaxed.
 
 """
 
-from collections import defaultdict
-from operator import itemgetter
+from collections import namedtuple
+from operator import itemgetter, mul
 import itertools
 
 import numpy as np
-from six.moves import map, range, zip # pylint: disable=redefined-builtin
+from six.moves import map, range, reduce, zip # pylint: disable=redefined-builtin
 
 from .npscalardist import ScalarDistribution
+from .compact import CompactIndex, CompactOutcomes
 
 from .helpers import (
+    add_reduce_groups,
     construct_alphabets,
     get_outcome_ctor,
     get_product_func,
+    group_codes,
     parse_rvs,
     reorder,
     RV_MODES,
@@ -88,6 +91,7 @@ from .exceptions import (
 )
 from .math import get_ops, LinearOperations
 from .params import ditParams
+from .utils import OrderedDict
 
 
 def _make_distribution(outcomes, pmf, base,
@@ -133,7 +137,11 @@ def _make_distribution(outcomes, pmf, base,
 
     ## Set the outcome class, ctor, and product function.
     ## Assumption: the class of each outcome is the same.
-    klass = outcomes[0].__class__
+    compact = isinstance(outcomes, CompactOutcomes)
+    if compact:
+        klass = outcomes.outcome_class
+    else:
+        klass = outcomes[0].__class__
     d._outcome_class = klass
     d._outcome_ctor = get_outcome_ctor(klass)
     d._product = get_product_func(klass)
@@ -141,12 +149,15 @@ def _make_distribution(outcomes, pmf, base,
     # Force the distribution to be numerical and a NumPy array.
     d.pmf = np.asarray(pmf, dtype=float)
 
-    # Tuple outcomes, and an index.
-    d.outcomes = tuple(outcomes)
-    d._outcomes_index = dict(zip(outcomes, range(len(outcomes))))
-
-    # Alphabet
-    d.alphabet = tuple(construct_alphabets(outcomes))
+    # Tuple outcomes, and an index. Compact outcomes are kept as they are.
+    if compact:
+        d.outcomes = outcomes
+        d._outcomes_index = CompactIndex(outcomes)
+        d.alphabet = outcomes.alphabets
+    else:
+        d.outcomes = tuple(outcomes)
+        d._outcomes_index = dict(zip(outcomes, range(len(outcomes))))
+        d.alphabet = tuple(construct_alphabets(outcomes))
 
     # Sample space.
     if sample_space is None:
@@ -165,6 +176,90 @@ def _make_distribution(outcomes, pmf, base,
     return d
 
 
+def _independent_product(factors, ops, product=None):
+    """
+    Returns the joint distribution of independent factors.
+
+    Parameters
+    ----------
+    factors : list of (alphabets, pmf) pairs
+        Each factor is a dense pmf over the Cartesian product of its
+        alphabets. The random variables of the joint distribution are those
+        of the factors, in order.
+    ops : Operations instance
+        The operations for the base of the pmfs.
+    product : function, None
+        The product function of the joint sample space. If `None`, outcomes
+        are tuples.
+
+    Returns
+    -------
+    d : Distribution
+        The dense joint distribution, whose pmf is the outer product of the
+        factors.
+
+    """
+    if product is None:
+        product = itertools.product
+
+    alphabets = []
+    pmf = np.array([ops.one], dtype=float)
+    for alphabets_i, pmf_i in factors:
+        alphabets.extend(alphabets_i)
+        pmf = ops.mult(pmf[:, np.newaxis], pmf_i[np.newaxis, :]).ravel()
+
+    sample_space = CartesianProduct(alphabets, product=product)
+    return Distribution.from_dense_pmf(pmf, sample_space, base=ops.get_base())
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _MarginalCache(object):
+    """
+    A size-bounded, least-recently-used cache of marginal distributions.
+
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._pmf = None
+        self._data = OrderedDict()
+
+    def get(self, key, pmf):
+        """
+        Returns the cached value for `key`, or `None`.
+
+        The cache is cleared if `pmf` is not the array it was filled from,
+        which catches replacements of the pmf that bypass the invalidation.
+
+        """
+        if pmf is not self._pmf:
+            self.clear()
+            self._pmf = pmf
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        # Reinsert, so that it is the most recently used.
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._data[key] = value
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
 class Distribution(ScalarDistribution):
     """
     A numerical distribution for joint random variables.
@@ -183,6 +278,18 @@ class Distribution(ScalarDistribution):
 
     Private Attributes
     ------------------
+    _codes : tuple
+        A cache of the integer codes of the outcomes, see `_outcome_codes`.
+
+    _entropy_table : tuple
+        The entropy table shared by information measures, together with the
+        outcomes and pmf it was computed from, if sharing is enabled and the
+        table has been used. See `enable_entropy_table`.
+
+    _marginal_cache : _MarginalCache
+        If enabled, the cache of marginal distributions. See
+        `enable_marginal_cache`.
+
     _mask : tuple
         A tuple of booleans specifying if the corresponding random variable
         has been masked or not.
@@ -240,6 +347,9 @@ class Distribution(ScalarDistribution):
     from_distribution
         Alternative constructor from an existing distribution.
 
+    from_codes
+        Alternative constructor from integer-coded outcomes.
+
     atoms
         Returns the atoms of the probability space.
 
@@ -249,6 +359,18 @@ class Distribution(ScalarDistribution):
     copy
         Returns a deep copy of the distribution.
 
+    disable_entropy_table
+        Stop sharing subset entropies between information measures.
+
+    disable_marginal_cache
+        Stop caching marginal distributions.
+
+    enable_entropy_table
+        Share subset entropies between information measures.
+
+    enable_marginal_cache
+        Cache the marginal distributions returned by `marginal`.
+
     outcome_length
         Returns the length of the outcomes in the distribution.
 
@@ -264,6 +386,9 @@ class Distribution(ScalarDistribution):
     has_outcome
         Returns `True` is the distribution has `outcome` in the sample space.
 
+    is_compact
+        Returns `True` if the outcomes are stored as integer codes.
+
     is_dense
         Returns `True` if the distribution is dense.
 
@@ -285,9 +410,15 @@ class Distribution(ScalarDistribution):
     marginal
         Returns a marginal distribution of the specified random variables.
 
+    marginal_cache_info
+        Returns hit and miss statistics of the marginal cache.
+
     marginalize
         Returns a marginal distribution after marginalizing random variables.
 
+    make_compact
+        Store the outcomes as integer codes into the alphabets.
+
     make_dense
         Add all null outcomes to the pmf.
 
@@ -329,6 +460,10 @@ class Distribution(ScalarDistribution):
     """
     ## Unadvertised attributes
     _sample_space = None
+    _codes = None
+    _entropy_table = None
+    _share_entropy_table = False
+    _marginal_cache = None
     _mask = None
     _meta = None
     _outcome_class = None
@@ -598,6 +733,228 @@ class Distribution(ScalarDistribution):
         self._mask = mask
         return mask
 
+    def _outcome_codes(self):
+        """
+        Returns the outcomes encoded as columns of small integers.
+
+        Each random variable is encoded separately. For compact distributions,
+        these are the stored codes into the alphabets. Otherwise, codes are
+        assigned in the order in which symbols first appear in `outcomes`, and
+        the result is cached until `outcomes` is replaced, which every
+        mutating operation does.
+
+        Returns
+        -------
+        codes : list of np.ndarray, each with shape (len(outcomes),)
+            For each random variable, the code of its symbol in each outcome.
+        symbols : list of sequences
+            For each random variable, the symbol corresponding to each code.
+
+        """
+        if self.is_compact():
+            return list(self.outcomes.codes), list(self.outcomes.alphabets)
+
+        if self._codes is not None and self._codes[0] is self.outcomes:
+            return self._codes[1], self._codes[2]
+
+        n, L = len(self.outcomes), self.outcome_length()
+        codes = [np.empty(n, dtype=int) for _ in range(L)]
+        symbols = [[] for _ in range(L)]
+        for i, column in enumerate(zip(*self.outcomes)):
+            symbols[i] = list(OrderedDict.fromkeys(column))
+            lookup = dict(zip(symbols[i], range(len(symbols[i]))))
+            codes[i] = np.fromiter(map(lookup.__getitem__, column), int, n)
+
+        self._codes = (self.outcomes, codes, symbols)
+        return codes, symbols
+
+    def _compact_sample_space(self):
+        """
+        Raises an exception if the outcomes cannot be stored compactly.
+
+        Compact storage requires a Cartesian product sample space whose
+        alphabets are plain sequences of symbols.
+
+        """
+        ss = self._sample_space
+        if not isinstance(ss, CartesianProduct) or \
+           any(isinstance(alphabet, SampleSpace) for alphabet in ss.alphabets):
+            msg = 'Compact distributions require a Cartesian product sample '
+            msg += 'space of plain alphabets.'
+            raise ditException(msg)
+
+    def is_compact(self):
+        """
+        Returns `True` if the outcomes are stored as integer codes.
+
+        """
+        return isinstance(self.outcomes, CompactOutcomes)
+
+    def _alphabet_codes(self):
+        """
+        Returns the outcomes encoded as indexes into the sample space.
+
+        The sample space must be a Cartesian product of plain alphabets.
+
+        Returns
+        -------
+        codes : list of np.ndarray, each with shape (len(outcomes),)
+            For each random variable, the index of its symbol in its alphabet
+            of the sample space, for each outcome.
+
+        """
+        codes, symbols = self._outcome_codes()
+        if self.is_compact():
+            return codes
+
+        alphabets = self._sample_space.alphabets
+        columns = []
+        for c, symbols_i, alphabet in zip(codes, symbols, alphabets):
+            lookup = dict(zip(alphabet, range(len(alphabet))))
+            rank = np.array([lookup[symbol] for symbol in symbols_i], dtype=int)
+            columns.append(rank[c])
+        return columns
+
+    def _expand_outcomes(self):
+        """
+        Store compact outcomes as a tuple of outcomes, in-place.
+
+        """
+        if self.is_compact():
+            outcomes = tuple(self.outcomes)
+            self.outcomes = outcomes
+            self._outcomes_index = dict(zip(outcomes, range(len(outcomes))))
+
+    def make_compact(self):
+        """
+        Store the outcomes as integer codes into the alphabets, in-place.
+
+        Instead of a tuple of outcomes and a dictionary indexing them, a
+        compact distribution stores one small unsigned integer array per
+        random variable. Outcomes are then built only when accessed. Further
+        marginals and conditional distributions are computed on the codes,
+        and are themselves compact whenever their outcomes are not nested.
+
+        Raises
+        ------
+        ditException
+            If the sample space is not a Cartesian product of plain alphabets.
+
+        """
+        if self.is_compact():
+            return
+
+        self._compact_sample_space()
+
+        columns = self._alphabet_codes()
+        alphabets = self._sample_space.alphabets
+        outcomes = CompactOutcomes(columns, alphabets, self._outcome_class,
+                                   length=len(self.outcomes))
+        self.outcomes = outcomes
+        self._outcomes_index = CompactIndex(outcomes)
+        self._codes = None
+
+    def enable_marginal_cache(self, maxsize=128):
+        """
+        Cache the marginal distributions returned by `marginal`.
+
+        Marginals are keyed by the indexes of their random variables and the
+        base of the distribution. Every in-place modification made through
+        the distribution's methods clears the cache. Modifying `pmf` directly
+        does not, unless the array is replaced altogether.
+
+        Parameters
+        ----------
+        maxsize : int
+            The maximum number of marginals to keep. When exceeded, the least
+            recently used marginal is discarded.
+
+        See Also
+        --------
+        disable_marginal_cache, marginal_cache_info
+
+        """
+        self._marginal_cache = _MarginalCache(maxsize)
+
+    def disable_marginal_cache(self):
+        """
+        Stop caching marginal distributions, and discard the cached ones.
+
+        """
+        self._marginal_cache = None
+
+    def marginal_cache_info(self):
+        """
+        Returns statistics about the marginal cache.
+
+        Returns
+        -------
+        info : CacheInfo, None
+            A named tuple of (hits, misses, maxsize, currsize), or `None` if
+            the cache is not enabled.
+
+        """
+        if self._marginal_cache is None:
+            return None
+        return self._marginal_cache.info()
+
+    def enable_entropy_table(self):
+        """
+        Share one table of subset entropies between information measures.
+
+        Measures built on subset entropies, such as the TSE complexity, the
+        CAEKL mutual information, the information profiles and
+        `dit.evaluate`, then fill in and reuse a single `EntropyTable` kept
+        on the distribution, rather than each starting from scratch. The
+        table keeps a dense copy of the pmf of up to 2**22 values alive, so
+        call `disable_entropy_table` to release it once it is no longer
+        needed. Every in-place modification made through the distribution's
+        methods discards the table. Modifying `pmf` directly does not, unless
+        the array is replaced altogether.
+
+        See Also
+        --------
+        disable_entropy_table, dit.shannon.shared_entropy_table
+
+        """
+        self._share_entropy_table = True
+
+    def disable_entropy_table(self):
+        """
+        Stop sharing subset entropies, and release the shared table.
+
+        """
+        self._share_entropy_table = False
+        self._entropy_table = None
+
+    def _clear_caches(self):
+        """
+        Discards all cached marginals, if the cache is enabled, and the
+        shared entropy table.
+
+        """
+        if self._marginal_cache is not None:
+            self._marginal_cache.clear()
+        self._entropy_table = None
+
+    def _cached_copy(self):
+        """
+        Returns a copy of a cached marginal, sharing its immutable parts.
+
+        """
+        from copy import deepcopy
+
+        d = self.__class__.__new__(self.__class__)
+        d.__dict__.update(self.__dict__)
+        d._meta = dict(self._meta)
+        d.pmf = np.array(self.pmf, copy=True)
+        if isinstance(self._outcomes_index, dict):
+            d._outcomes_index = dict(self._outcomes_index)
+        d._sample_space = deepcopy(self._sample_space)
+        if self._rvs is not None:
+            d._rvs = dict(self._rvs)
+        return d
+
     @classmethod
     def from_distribution(cls, dist, base=None, prng=None):
         """
@@ -680,6 +1037,213 @@ class Distribution(ScalarDistribution):
         """
         return cls(*zip(*np.ndenumerate(ndarray)), base=base, prng=prng)
 
+    @classmethod
+    def from_codes(cls, codes, alphabets, pmf=None, base=None, prng=None,
+                   outcome_class=tuple, sort=True, sparse=True,
+                   validate=True):
+        """
+        Construct a compact Distribution from integer-coded outcomes.
+
+        Parameters
+        ----------
+        codes : np.ndarray, shape (n, k)
+            Each row is an outcome, where the ith column is the index of the
+            ith symbol in `alphabets[i]`. Rows need not be unique, and the
+            probabilities of repeated rows are added together.
+        alphabets : sequence of sequences
+            The alphabet of each random variable.
+        pmf : sequence, None
+            The probability of each row of `codes`. If `None`, then each row
+            is taken to be one equally likely sample, and the distribution is
+            the empirical distribution of the rows.
+        base : 'linear', 'e', or float
+            Optionally, specify the base of `pmf`. If `None`, then the pmf is
+            assumed to be linear if it is a valid linear pmf, as in __init__.
+        prng : RandomState
+            A pseudo-random number generator with a `rand` method which can
+            generate random numbers. For now, this is assumed to be something
+            with an API compatible to NumPy's RandomState class. If `None`,
+            then we initialize to dit.math.prng.
+        outcome_class : class
+            The class of the outcomes, for when they are built.
+        sort : bool
+            If `True`, then each alphabet is sorted before it is finalized.
+        sparse : bool
+            If `True`, null outcomes are removed. Otherwise, the distribution
+            is made dense.
+        validate : bool
+            If `True`, then validate the probabilities of the distribution.
+
+        Returns
+        -------
+        d : Distribution
+            The compact distribution.
+
+        Raises
+        ------
+        InvalidOutcome
+            If any code is not a valid index into its alphabet.
+
+        """
+        codes = np.asarray(codes, dtype=int)
+        if codes.ndim != 2 or codes.shape[1] != len(alphabets):
+            msg = '`codes` must have one column per alphabet.'
+            raise InvalidDistribution(msg)
+        if len(codes) == 0:
+            msg = '`codes` must contain at least one outcome.'
+            raise InvalidDistribution(msg)
+
+        alphabets = [tuple(alphabet) for alphabet in alphabets]
+        sizes = np.array([len(alphabet) for alphabet in alphabets], dtype=int)
+        bad = (codes < 0) | (codes >= sizes)
+        if bad.any():
+            row = np.nonzero(bad.any(axis=1))[0][0]
+            raise InvalidOutcome(tuple(codes[row]))
+
+        columns = list(codes.T)
+        if sort:
+            for i, alphabet in enumerate(alphabets):
+                order = sorted(range(len(alphabet)), key=alphabet.__getitem__)
+                rank = np.empty(len(order), dtype=int)
+                rank[order] = np.arange(len(order))
+                alphabets[i] = tuple(alphabet[j] for j in order)
+                columns[i] = rank[columns[i]]
+
+        if pmf is None:
+            pmf = np.ones(len(codes)) / len(codes)
+            ops = LinearOperations()
+        else:
+            pmf = np.asarray(pmf, dtype=float)
+            if len(pmf) != len(codes):
+                msg = "Unequal lengths for `pmf` and `codes`"
+                raise InvalidDistribution(msg)
+            if base is None:
+                from .validate import is_pmf
+                if is_pmf(pmf, LinearOperations()):
+                    base = 'linear'
+                else:
+                    base = ditParams['base']
+            ops = get_ops(base)
+
+        # Aggregate repeated rows, which also sorts them by the sample space.
+        uniques, inverse = group_codes(columns, len(codes))
+        pmf = add_reduce_groups(ops, pmf, inverse, len(uniques))
+
+        outcomes = CompactOutcomes(uniques.T, alphabets, outcome_class)
+        product = get_product_func(outcome_class)
+        sample_space = CartesianProduct(alphabets, product)
+        d = _make_distribution(outcomes, pmf, base=ops.get_base(),
+                               sample_space=sample_space, prng=prng,
+                               sparse=True)
+        if sparse:
+            d.make_sparse()
+        else:
+            d.make_dense()
+
+        if validate:
+            # The codes were checked above, so the outcomes are valid.
+            d.validate(outcomes=False)
+
+        return d
+
+    @classmethod
+    def from_dense_pmf(cls, pmf, sample_space, base='linear', prng=None,
+                       compact=True):
+        """
+        Construct a dense Distribution from a trusted pmf over a sample space.
+
+        This is an unsafe, but fast, constructor, meant for pmfs computed
+        numerically, such as the result of an optimization, over a known
+        Cartesian product sample space. Nothing is validated, normalized,
+        sorted or copied, so if it is used incorrectly, the data structure
+        will be inconsistent. The caller must guarantee that:
+
+            0) `pmf` is a valid pmf in `base`.
+            1) `pmf` has the shape `sample_space.alphabet_sizes`, or is flat
+               and ordered like the sample space.
+
+        The sample space and its alphabets are shared by reference, and so is
+        the memory of `pmf` whenever it is a contiguous array of floats.
+
+        Parameters
+        ----------
+        pmf : np.ndarray
+            The probability of every outcome in the sample space.
+        sample_space : CartesianProduct
+            The sample space of the distribution.
+        base : 'linear', 'e', or float
+            The base of `pmf`. If `None`, then the default base is assumed.
+            Defaults to 'linear'.
+        prng : RandomState
+            A pseudo-random number generator with a `rand` method which can
+            generate random numbers. For now, this is assumed to be something
+            with an API compatible to NumPy's RandomState class. If `None`,
+            then we initialize to dit.math.prng.
+        compact : bool
+            If `True`, the outcomes are integer coded, as with `make_compact`,
+            and each outcome is only built when it is accessed. Otherwise,
+            they are a tuple, as usual, which costs O(|sample_space|) Python
+            objects. Defaults to `True`.
+
+        Returns
+        -------
+        d : Distribution
+            The new, dense, distribution.
+
+        Notes
+        -----
+        Outcomes are never compact when some alphabet is itself a sample
+        space.
+
+        Examples
+        --------
+        >>> ss = CartesianProduct([(0, 1), (0, 1)])
+        >>> d = Distribution.from_dense_pmf(np.array([.5, 0, 0, .5]), ss)
+        >>> d[(1, 1)]
+        0.5
+
+        """
+        d = cls.__new__(cls)
+
+        # Call init function of BaseDistribution, not of Distribution.
+        # This sets the prng.
+        super(ScalarDistribution, d).__init__(prng)
+
+        d._meta['is_joint'] = True
+        d._meta['is_numerical'] = True
+        d._meta['is_sparse'] = False
+
+        if base is None:
+            base = ditParams['base']
+        d.ops = get_ops(base)
+
+        klass = sample_space._outcome_class
+        d._outcome_class = klass
+        d._outcome_ctor = get_outcome_ctor(klass)
+        d._product = sample_space._product
+
+        d.pmf = np.asarray(pmf, dtype=float).reshape(-1)
+
+        alphabets = sample_space.alphabets
+        if any(isinstance(alphabet, SampleSpace) for alphabet in alphabets):
+            outcomes = tuple(sample_space)
+            d.outcomes = outcomes
+            d._outcomes_index = dict(zip(outcomes, range(len(outcomes))))
+        else:
+            outcomes = CompactOutcomes.from_product(alphabets, klass)
+            d.outcomes = outcomes
+            d._outcomes_index = CompactIndex(outcomes)
+        d.alphabet = alphabets
+        d._sample_space = sample_space
+
+        d._mask = d._new_mask()
+        d.rvs = [[i] for i in range(d.outcome_length())]
+
+        if not compact:
+            d._expand_outcomes()
+
+        return d
+
     @classmethod
     def from_rv_discrete(cls, ssrv, prng=None):
         """
@@ -741,6 +1305,8 @@ class Distribution(ScalarDistribution):
             # Then, the outcome is not in the sample space.
             raise InvalidOutcome(outcome)
 
+        self._clear_caches()
+
         idx = self._outcomes_index.get(outcome, None)
         new_outcome = idx is None
 
@@ -751,6 +1317,24 @@ class Distribution(ScalarDistribution):
             # if the value was zero, but we have choosen to let setting always
             # "set" and deleting always "delete".
             self.pmf[idx] = value
+        elif self.is_compact():
+            # Insert the codes of the new outcome at its place in the order of
+            # the sample space, which is the order of the raveled codes.
+            outcomes, pmf = self.outcomes, self.pmf
+            keys = outcomes.ravel()
+            if len(keys) > 1 and np.any(keys[1:] < keys[:-1]):
+                order = np.argsort(keys, kind='mergesort')
+                outcomes = outcomes.take(order)
+                pmf, keys = pmf[order], keys[order]
+
+            codes = outcomes.encode(outcome)
+            sizes = tuple(len(alphabet) for alphabet in self.alphabet)
+            key = np.ravel_multi_index(codes, sizes) if codes else 0
+            pos = int(np.searchsorted(keys, key))
+
+            self.outcomes = outcomes.insert(pos, codes)
+            self._outcomes_index = CompactIndex(self.outcomes)
+            self.pmf = np.insert(np.asarray(pmf, dtype=float), pos, value)
         else:
             # Thus, the outcome is new in a sparse distribution. Even if the
             # value is zero, we still set the value and add it to pmf.
@@ -769,6 +1353,29 @@ class Distribution(ScalarDistribution):
             self._outcomes_index = index
             self.pmf = np.array(pmf, dtype=float)
 
+    def __delitem__(self, outcome):
+        """
+        Deletes `outcome` from the distribution.
+
+        See ScalarDistribution.__delitem__ for details.
+
+        """
+        self._clear_caches()
+
+        if not self.is_compact() or self.is_dense():
+            return super(Distribution, self).__delitem__(outcome)
+
+        if not self.has_outcome(outcome, null=True):
+            raise InvalidOutcome(outcome)
+
+        idx = self._outcomes_index.get(outcome, None)
+        if idx is not None:
+            keep = np.ones(len(self.outcomes), dtype=bool)
+            keep[idx] = False
+            self.outcomes = self.outcomes.take(keep)
+            self._outcomes_index = CompactIndex(self.outcomes)
+            self.pmf = self.pmf[keep]
+
     def _validate_outcomes(self):
         """
         Returns `True` if the outcomes are valid.
@@ -790,6 +1397,11 @@ class Distribution(ScalarDistribution):
         """
         from .validate import validate_sequence
 
+        if self.is_compact():
+            # Codes always index into the alphabets of the sample space.
+            self._compact_sample_space()
+            return True
+
         v = super(Distribution, self)._validate_outcomes()
         # If we survived, then all outcomes have the same class.
         # Now, we just need to make sure that class is a sequence.
@@ -860,8 +1472,6 @@ class Distribution(ScalarDistribution):
         marginal, marginalize
 
         """
-        from array import array
-
         # We allow repeats and want to keep the order. We don't need the names.
         parse = lambda rv: parse_rvs(self, rv, rv_mode=rv_mode,
                                      unique=False, sort=False)[1]
@@ -878,42 +1488,90 @@ class Distribution(ScalarDistribution):
         # Determine how elements of new outcomes are constructed.
         ctor_i = self._outcome_ctor
 
-        # Build the distribution.
-        factory = lambda: array('d')
-        d = defaultdict(factory)
-        for outcome, p in self.zipped():
-            # Build a list of inner outcomes. "c" stands for "constructed".
-            c_outcome = [ctor_i([outcome[i] for i in rv]) for rv in indexes]
-            # Build the outer outcome from the inner outcomes.
-            c_outcome = ctor_o(c_outcome)
-            d[c_outcome].append(p)
-
-        outcomes = tuple(d.keys())
-        pmf = map(np.frombuffer, d.values())
-        pmf = map(self.ops.add_reduce, pmf)
-        pmf = tuple(pmf)
-
         # Preserve the sample space during coalescing.
         sample_spaces = [self._sample_space.coalesce([idxes], extract=True)
                          for idxes in indexes]
         if isinstance(self._sample_space, CartesianProduct):
             sample_space = CartesianProduct(sample_spaces,
                                             product=itertools.product)
+            # Sort now, so that the codes below can follow the final order.
+            sample_space.sort()
+            alphabets = [alphabet for ss in sample_space.alphabets
+                                  for alphabet in ss.alphabets]
             if extract:
                 sample_space = sample_space.alphabets[0]
         else:
+            alphabets = None
             if extract:
                 # There is only one sample space: len(indexes) = 1
                 sample_space = sample_spaces[0]
             else:
                 sample_space = list(zip(*sample_spaces))
 
-        d = Distribution(outcomes, pmf,
-                         base=self.get_base(),
-                         sort=True,
-                         sample_space=sample_space,
-                         sparse=self.is_sparse(),
-                         validate=False)
+        # Each random variable in the new outcomes is a column of codes. With
+        # a Cartesian product, the codes are ranks within the (sorted)
+        # coalesced alphabets, so that sorted code rows are sorted outcomes.
+        codes, symbols = self._outcome_codes()
+        columns = []
+        decoders = []
+        for j, i in enumerate(i for idxes in indexes for i in idxes):
+            if alphabets is None:
+                rank = np.arange(len(symbols[i]))
+            elif isinstance(alphabets[j], SampleSpace):
+                rank = np.array([alphabets[j].index(symbol)
+                                 for symbol in symbols[i]], dtype=int)
+            else:
+                lookup = dict(zip(alphabets[j], range(len(alphabets[j]))))
+                rank = np.array([lookup[symbol] for symbol in symbols[i]],
+                                dtype=int)
+            columns.append(rank[codes[i]])
+            decoders.append(dict(zip(rank.tolist(), symbols[i])))
+
+        # Group identical rows and add up their probabilities.
+        uniques, inverse = group_codes(columns, len(self.pmf))
+        pmf = add_reduce_groups(self.ops, self.pmf, inverse, len(uniques))
+
+        # The outcomes are already in the order of the sample space, unless it
+        # is too large for `sample_space.index` to use 64-bit integers.
+        ordered = alphabets is not None and len(uniques) > 0
+        if ordered:
+            sizes = [alphabet.__len__() for alphabet in alphabets]
+            ordered = all(sizes) and reduce(mul, sizes, 1) < 2**63
+
+        if ordered and extract and self.is_compact():
+            # The codes are ranks within the alphabets, so they are kept.
+            outcomes = CompactOutcomes(uniques.T, alphabets,
+                                       self._outcome_class, len(uniques))
+        else:
+            # Build the new outcomes, one column of symbols at a time.
+            columns = [list(map(decoder.__getitem__, uniques[:, j].tolist()))
+                       for j, decoder in enumerate(decoders)]
+            inner = []
+            for idxes in indexes:
+                group, columns = columns[:len(idxes)], columns[len(idxes):]
+                if group:
+                    inner.append(list(map(ctor_i, zip(*group))))
+                else:
+                    inner.append([ctor_i(())] * len(uniques))
+            outcomes = tuple(map(ctor_o, zip(*inner)))
+
+        if ordered:
+            d = _make_distribution(outcomes, pmf,
+                                   base=self.get_base(),
+                                   sample_space=sample_space,
+                                   sparse=True)
+            d.alphabet = tuple(sample_space.alphabets)
+            if self.is_sparse():
+                d.make_sparse()
+            else:
+                d.make_dense()
+        else:
+            d = Distribution(outcomes, pmf,
+                             base=self.get_base(),
+                             sort=True,
+                             sample_space=sample_space,
+                             sparse=self.is_sparse(),
+                             validate=False)
 
         # We do not set the rv names, since these are new random variables.
 
@@ -923,14 +1581,13 @@ class Distribution(ScalarDistribution):
 
         return d
 
-    def condition_on(self, crvs, rvs=None, rv_mode=None, extract=False):
+    def condition_on(self, crvs, rvs=None, rv_mode=None, extract=False,
+                     lazy=False):
         """
         Returns distributions conditioned on random variables ``crvs``.
 
         Optionally, ``rvs`` specifies which random variables should remain.
 
-        NOTE: Eventually this will return a conditional distribution.
-
         Parameters
         ----------
         crvs : list
@@ -951,13 +1608,18 @@ class Distribution(ScalarDistribution):
             If the length of either ``crvs`` or ``rvs`` is 1 and ``extract`` is
             ``True``, then instead of the new outcomes being 1-tuples, we
             extract the sole element to create scalar distributions.
+        lazy : bool
+            If ``True``, then the conditional distributions are returned as a
+            ConditionalDistribution, backed by a 2D array of the conditional
+            pmfs, whose distributions are constructed only when accessed.
 
         Returns
         -------
         cdist : dist
             The distribution of the conditioned random variables.
-        dists : list of distributions
-            The conditional distributions for each outcome in ``cdist``.
+        dists : list, ConditionalDistribution
+            The conditional distributions for each outcome in ``cdist``. This
+            is a ConditionalDistribution if ``lazy`` is ``True``.
 
         Examples
         --------
@@ -985,6 +1647,8 @@ class Distribution(ScalarDistribution):
         >>> pXY, pZgXY = pXYZ.condition_on([0, 1], rv_mode='indexes')
 
         """
+        from .npcdist import ConditionalDistribution
+
         crvs, cindexes = parse_rvs(self, crvs, rv_mode, unique=True, sort=True)
         if rvs is None:
             indexes = set(range(self.outcome_length())) - set(cindexes)
@@ -1016,45 +1680,43 @@ class Distribution(ScalarDistribution):
 
         cdist = d.marginal(cindexes, rv_mode=RV_MODES.INDICES)
         dist = d.marginal(indexes, rv_mode=RV_MODES.INDICES)
-        sample_space = dist._sample_space
-        rv_names = dist.get_rv_names()
 
         ops = d.ops
-        base = ops.get_base()
         ctor = d._outcome_ctor
 
-        # A list of indexes of conditioned outcomes for each joint outcome.
-        # These are the indexes of w in the pmf of P(w) for each ws in P(ws).
-        cidx = cdist._outcomes_index
-        coutcomes = [cidx[ctor([o[i] for i in cindexes])] for o in d.outcomes]
+        # Group the joint outcomes by their codes, and look up each distinct
+        # outcome only once in the marginal distributions.
+        codes, symbols = d._outcome_codes()
+
+        def positions(marginal, idxes):
+            # Marginals keep the random variables in their original order.
+            idxes = sorted(idxes)
+            uniques, inverse = group_codes([codes[i] for i in idxes], len(d))
+            index = marginal._outcomes_index
+            lookup = [index[ctor([symbols[i][c] for i, c in zip(idxes, row)])]
+                      for row in uniques.tolist()]
+            return np.array(lookup, dtype=int)[inverse]
+
+        # The indexes of w in the pmf of P(w) for each ws in P(ws).
+        coutcomes = positions(cdist, cindexes)
 
-        # A list of indexes of outcomes for each joint outcome.
-        # These are the indexes of s in the pmf of P(s) for each ws in P(ws).
-        idx = dist._outcomes_index
-        outcomes = [idx[ctor([o[i] for i in indexes])] for o in d.outcomes]
+        # The indexes of s in the pmf of P(s) for each ws in P(ws).
+        outcomes = positions(dist, indexes)
 
-        cprobs = np.array([ops.invert(cdist.pmf[i]) for i in coutcomes])
+        cprobs = np.array([ops.invert(p) for p in cdist.pmf])[coutcomes]
         probs = ops.mult(d.pmf, cprobs)
 
-        # Now build the distributions
+        # Now build the conditional pmf array.
         pmfs = np.empty((len(cdist), len(dist)), dtype=float)
         pmfs.fill(ops.zero)
-        for i, (coutcome, outcome) in enumerate(zip(coutcomes, outcomes)):
-            pmfs[coutcome, outcome] = probs[i]
-        dists = [Distribution(dist.outcomes, pmfs[i], sparse=sparse,
-                 base=base, sample_space=sample_space, validate=False)
-                 for i in range(pmfs.shape[0])]
-
-        # Set the masks and r.v. names for each conditional distribution.
-        for dd in dists:
-            dd._new_mask(from_mask=dist._mask)
-            dd.set_rv_names(rv_names)
-
-        if extract:
-            if len(cindexes) == 1:
-                cdist = ScalarDistribution.from_distribution(cdist)
-            if len(indexes) == 1:
-                dists = [ScalarDistribution.from_distribution(d) for d in dists]
+        pmfs[coutcomes, outcomes] = probs
+
+        if extract and len(cindexes) == 1:
+            cdist = ScalarDistribution.from_distribution(cdist)
+        dists = ConditionalDistribution(cdist, pmfs, dist, sparse=sparse,
+                                        extract=extract and len(indexes) == 1)
+        if not lazy:
+            dists = list(dists)
 
         return cdist, dists
 
@@ -1197,6 +1859,165 @@ class Distribution(ScalarDistribution):
 
         return h
 
+    def _dense_marginal(self, indexes):
+        """
+        Returns a marginal distribution computed directly from the pmf.
+
+        This is possible only when the pmf contains every outcome of a
+        Cartesian product sample space, in which case the pmf can be reshaped
+        to the alphabet sizes and the marginalized random variables summed
+        out along their axes. No outcomes are iterated over.
+
+        Parameters
+        ----------
+        indexes : tuple
+            The sorted, unique indexes of the random variables to keep.
+
+        Returns
+        -------
+        d : Distribution, None
+            The marginal distribution, without its mask and random variable
+            names set. If the fast path is not applicable, `None` is returned.
+
+        """
+        ss = self._sample_space
+        if not isinstance(ss, CartesianProduct):
+            return None
+        if len(self.pmf) == 0 or len(self.pmf) != ss.__len__():
+            return None
+
+        # Nested sample spaces sort in-place, so we leave them to coalesce().
+        if any(isinstance(ss.alphabets[i], SampleSpace) for i in indexes):
+            return None
+
+        # The pmf order must agree with the sorted marginal sample space.
+        sample_space = ss.coalesce([indexes], extract=True)
+        alphabets = sample_space.alphabets
+        try:
+            sample_space.sort()
+        except TypeError:
+            return None
+        if sample_space.alphabets != alphabets:
+            return None
+
+        # The pmf need not be stored in the order of the sample space, as
+        # with `sort=False`, so place each probability at its outcome's index.
+        outcomes = self.outcomes
+        try:
+            if self.is_compact() and outcomes.alphabets == ss.alphabets:
+                positions = ss.ravel(list(outcomes.codes))
+            else:
+                positions = ss.index_many(outcomes)
+        except ValueError:
+            return None
+        pmf = self.pmf
+        if np.any(positions != np.arange(len(pmf))):
+            pmf = np.empty(len(pmf), dtype=float)
+            pmf[positions] = self.pmf
+
+        pmf = pmf.reshape(ss.alphabet_sizes)
+        # Reduce one axis at a time, as logaddexp does not support a tuple of
+        # axes. Going in reverse keeps the remaining axis numbers valid.
+        for axis in reversed(range(len(ss.alphabet_sizes))):
+            if axis not in indexes:
+                pmf = self.ops.add_reduce(pmf, axis=axis)
+        pmf = np.atleast_1d(pmf).ravel()
+
+        if self.is_compact():
+            outcomes = CompactOutcomes.from_product(alphabets,
+                                                    self._outcome_class)
+        else:
+            outcomes = tuple(sample_space)
+        d = _make_distribution(outcomes, pmf,
+                               base=self.get_base(),
+                               sample_space=sample_space,
+                               sparse=False)
+        if self.is_sparse():
+            d.make_sparse()
+
+        return d
+
+    def make_dense(self):
+        """
+        Make pmf contain all outcomes in the sample space.
+
+        This does not change the sample space.
+
+        Returns
+        -------
+        n : int
+            The number of null outcomes added.
+
+        """
+        self._clear_caches()
+
+        if not self.is_compact():
+            ss = self._sample_space
+            if not isinstance(ss, CartesianProduct) or len(self) == 0:
+                return super(Distribution, self).make_dense()
+
+            # Place the pmf at the index of each outcome in the sample space.
+            L = len(self)
+            outcomes = tuple(ss)
+            pmf = np.empty(len(outcomes), dtype=float)
+            pmf.fill(self.ops.zero)
+            pmf[ss.index_many(self.outcomes)] = self.pmf
+            self.pmf = pmf
+            self.outcomes = outcomes
+            self._outcomes_index = dict(zip(outcomes, range(len(outcomes))))
+
+            self._meta['is_sparse'] = False
+            return len(self) - L
+
+        L = len(self)
+        # The raveled codes are the positions in the dense pmf.
+        pmf = np.empty(len(self._sample_space), dtype=float)
+        pmf.fill(self.ops.zero)
+        pmf[self.outcomes.ravel()] = self.pmf
+        self.outcomes = CompactOutcomes.from_product(self.alphabet,
+                                                     self._outcome_class)
+        self._outcomes_index = CompactIndex(self.outcomes)
+        self.pmf = pmf
+
+        self._meta['is_sparse'] = False
+        n = len(self) - L
+
+        return n
+
+    def make_sparse(self, trim=True):
+        """
+        Allow the pmf to omit null outcomes.
+
+        This does not change the sample space.
+
+        Parameters
+        ----------
+        trim : bool
+            If `True`, then remove all null outcomes from the pmf.
+
+        Returns
+        -------
+        n : int
+            The number of null outcomes removed.
+
+        """
+        self._clear_caches()
+
+        if not self.is_compact():
+            return super(Distribution, self).make_sparse(trim=trim)
+
+        L = len(self)
+
+        if trim:
+            keep = ~np.isclose(self.pmf, self.ops.zero)
+            self.outcomes = self.outcomes.take(keep)
+            self._outcomes_index = CompactIndex(self.outcomes)
+            self.pmf = np.array(self.pmf[keep], dtype=float)
+
+        self._meta['is_sparse'] = True
+        n = L - len(self)
+        return n
+
     def marginal(self, rvs, rv_mode=None):
         """
         Returns a marginal distribution.
@@ -1225,14 +2046,24 @@ class Distribution(ScalarDistribution):
         # after coalesce has finished.
         rvs, indexes = parse_rvs(self, rvs, rv_mode, unique=True, sort=True)
 
-        ## Eventually, add in a method specialized for dense distributions.
-        ## This one would work only with the pmf, and not the outcomes.
-
-        # Marginalization is a special case of coalescing where there is only
-        # one new random variable and it is composed of a strict subset of
-        # the original random variables, with no duplicates, that maintains
-        # the order of the original random variables.
-        d = self.coalesce([indexes], rv_mode=RV_MODES.INDICES, extract=True)
+        cache = self._marginal_cache
+        if cache is not None:
+            key = (tuple(indexes), self.get_base())
+            d = cache.get(key, self.pmf)
+            if d is not None:
+                return d._cached_copy()
+
+        # When the pmf covers the entire Cartesian product sample space, we
+        # can work only with the pmf, and not the outcomes.
+        d = self._dense_marginal(indexes)
+
+        if d is None:
+            # Marginalization is a special case of coalescing where there is
+            # only one new random variable and it is composed of a strict
+            # subset of the original random variables, with no duplicates,
+            # that maintains the order of the original random variables.
+            d = self.coalesce([indexes], rv_mode=RV_MODES.INDICES,
+                              extract=True)
 
         # Handle parts of d that are not settable through initialization.
 
@@ -1250,6 +2081,10 @@ class Distribution(ScalarDistribution):
         # Set the mask
         L = self.outcome_length()
         d._mask = tuple(False if i in indexes else True for i in range(L))
+
+        if cache is not None:
+            cache.set(key, d._cached_copy())
+
         return d
 
     def marginalize(self, rvs, rv_mode=None):
@@ -1282,6 +2117,30 @@ class Distribution(ScalarDistribution):
         d = self.marginal(marginal_indexes, rv_mode=RV_MODES.INDICES)
         return d
 
+    def normalize(self):
+        """
+        Normalize the distribution, in-place.
+
+        Returns
+        -------
+        z : float
+            The previous normalization constant.  This will be negative if
+            the distribution represents log probabilities.
+
+        """
+        self._clear_caches()
+        return super(Distribution, self).normalize()
+
+    def set_base(self, base):
+        """
+        Changes the base of the distribution, in-place.
+
+        See ScalarDistribution.set_base for details.
+
+        """
+        self._clear_caches()
+        super(Distribution, self).set_base(base)
+
     def set_rv_names(self, rv_names):
         """
         Sets the names of the random variables.
@@ -1293,6 +2152,9 @@ class Distribution(ScalarDistribution):
             names of the random variables in the distribution.
 
         """
+        # Cached marginals carry the old names.
+        self._clear_caches()
+
         if rv_names is None:
             # This is an explicit clearing of the rv names.
             rvs = None
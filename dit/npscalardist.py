@@ -28,7 +28,7 @@ variable. The alphabet for each random variable is a set.
 """
 import numbers
 from collections import defaultdict
-from itertools import product
+from itertools import compress, product
 
 from .distribution import BaseDistribution
 from .exceptions import (
@@ -40,11 +40,61 @@ from .exceptions import (
 from .math import get_ops, LinearOperations
 from .params import ditParams
 from .helpers import flatten, reorder
-from .samplespace import BaseSampleSpace, ScalarSampleSpace
+from .samplespace import BaseSampleSpace, CartesianProduct, ScalarSampleSpace
 
 import numpy as np
 
 
+# Sparse factors are only made dense if their product has at most this many
+# outcomes. Otherwise, the product iterates over their outcomes.
+_DENSE_PRODUCT_LIMIT = 2**16
+
+
+def _dense_product(dists):
+    """
+    Returns whether the product of `dists` should be computed densely.
+
+    That is the case if every distribution is already dense, or if the sample
+    space of the product is small.
+
+    """
+    if all(dist.is_dense() for dist in dists):
+        return True
+    size = 1
+    for dist in dists:
+        size *= len(dist._sample_space)
+    return size <= _DENSE_PRODUCT_LIMIT
+
+
+def _product_factor(dist):
+    """
+    Returns the alphabets and dense pmf of `dist`, for use in a product.
+
+    The outcomes of a product are flattened, so `dist` can only be a factor
+    if each of its symbols flattens to itself. Otherwise, `None` is returned.
+
+    """
+    ss = dist._sample_space
+    if dist.is_joint():
+        if not isinstance(ss, CartesianProduct):
+            return None
+        alphabets = ss.alphabets
+    else:
+        alphabets = [tuple(ss)]
+
+    for alphabet in alphabets:
+        for symbol in alphabet:
+            flat = list(flatten([symbol]))
+            if len(flat) != 1 or flat[0] is not symbol:
+                return None
+
+    if not dist.is_dense():
+        dist = dist.copy()
+        dist.make_dense()
+
+    return alphabets, dist.pmf
+
+
 def _make_distribution(outcomes, pmf=None, sample_space=None,
                             base=None, prng=None, sparse=True):
     """
@@ -1314,10 +1364,24 @@ class ScalarDistribution(BaseDistribution):
         (6, 6)   1/36
         """
         if isinstance(other, ScalarDistribution):
-            from .npdist import Distribution # pylint: disable=cyclic-import
+            # pylint: disable=cyclic-import
+            from .npdist import Distribution, _independent_product
             # Copy to make sure we don't lose precision when converting.
             d2 = other.copy(base=self.get_base())
 
+            if _dense_product([self, d2]):
+                factors = [_product_factor(self), _product_factor(d2)]
+            else:
+                factors = [None]
+            if None not in factors:
+                # The product pmf is the outer product of the dense pmfs.
+                d = _independent_product(factors, self.ops)
+                d.make_sparse()
+                if not any(isinstance(x, Distribution) and x.is_compact()
+                           for x in (self, other)):
+                    d._expand_outcomes()
+                return d
+
             dist = defaultdict(float)
             for (o1, p1), (o2, p2) in product(self.zipped(), d2.zipped()):
                 dist[tuple(flatten((o1, o2)))] += self.ops.mult(p1, p2)
@@ -1775,19 +1839,15 @@ class ScalarDistribution(BaseDistribution):
 
         if trim:
             zero = self.ops.zero
-            outcomes = []
-            pmf = []
-            for outcome, prob in self.zipped():
-                if not np.isclose(prob, zero):
-                    outcomes.append(outcome)
-                    pmf.append(prob)
+            keep = ~np.isclose(self.pmf, zero)
+            outcomes = tuple(compress(self.outcomes, keep))
 
             # Update the outcomes and the outcomes index.
-            self.outcomes = tuple(outcomes)
+            self.outcomes = outcomes
             self._outcomes_index = dict(zip(outcomes, range(len(outcomes))))
 
             # Update the probabilities.
-            self.pmf = np.array(pmf)
+            self.pmf = np.array(self.pmf[keep], dtype=float)
 
         self._meta['is_sparse'] = True
         n = L - len(self)
@@ -8,5 +8,5 @@ from .disequilibrium import *
 from .extropy import extropy
 from .lautum_information import lautum_information
 from .perplexity import perplexity
-from .renyi_entropy import renyi_entropy
-from .tsallis_entropy import tsallis_entropy
+from .renyi_entropy import renyi_entropy, renyi_entropy_spectrum
+from .tsallis_entropy import tsallis_entropy, tsallis_entropy_spectrum
@@ -6,13 +6,19 @@ from __future__ import division
 
 import numpy as np
 
-from ..helpers import normalize_rvs
+from ..exceptions import ditException
+from ..helpers import copypmf, normalize_rvs
 from ..utils import flatten
 from ..multivariate import entropy
 
 __all__ = ('renyi_entropy',
+           'renyi_entropy_spectrum',
           )
 
+# Orders within this distance of 1 use the first order expansion about the
+# Shannon entropy, which is more accurate there than the power sum.
+_NEAR_ONE = 1e-5
+
 
 def renyi_entropy(dist, order, rvs=None, rv_mode=None):
     """
@@ -69,3 +75,179 @@ def renyi_entropy(dist, order, rvs=None, rv_mode=None):
         H_a = 1/(1-order) * np.log2((pmf**order).sum())
 
     return H_a
+
+
+def _spectrum_pmf(dist, rvs=None, rv_mode=None):
+    """
+    Returns the linear pmfs, one per row, whose spectra are computed.
+
+    Parameters
+    ----------
+    dist : Distribution, DistributionBatch, np.ndarray
+        A distribution, a batch of distributions, or an array of pmfs whose
+        last axis runs over outcomes.
+    rvs : list, None
+        The random variables to marginalize onto, once. If None, then all
+        random variables are used.
+    rv_mode : str, None
+        Specifies how to interpret `rvs`.
+
+    Returns
+    -------
+    pmf : np.ndarray, shape (..., k)
+        The linear pmfs.
+    """
+    # Avoid a circular import.
+    from ..npbatch import DistributionBatch
+
+    if isinstance(dist, DistributionBatch):
+        if rvs is not None:
+            rvs = list(flatten(dist._normalize([rvs], None, rv_mode)[0]))
+            return dist._marginal_pmf(rvs)
+        return dist.pmf
+
+    if isinstance(dist, np.ndarray):
+        if rvs is not None:
+            msg = "`rvs` cannot be given for an array of pmfs."
+            raise ditException(msg)
+        return np.asarray(dist, dtype=float)
+
+    if dist.is_joint() and rvs is not None:
+        rvs = list(flatten(normalize_rvs(dist, [rvs], None, rv_mode)[0]))
+        dist = dist.marginal(rvs, rv_mode)
+    return copypmf(dist, base='linear')
+
+
+def _log_power_sums(pmf, orders):
+    """
+    Returns ln(sum(p**a)) for each pmf and finite order a, via log-sum-exp.
+
+    Parameters
+    ----------
+    pmf : np.ndarray, shape (..., k)
+        The linear pmfs.
+    orders : np.ndarray, shape (m,)
+        The finite orders.
+
+    Returns
+    -------
+    sums : np.ndarray, shape (..., m)
+        The log power sums. Outcomes of zero probability are excluded, so
+        the order 0 counts the support.
+    """
+    support = pmf > 0
+    logp = np.log(np.where(support, pmf, 1))
+    high = np.where(support, logp, -np.inf).max(axis=-1, keepdims=True)
+    low = np.where(support, logp, np.inf).min(axis=-1, keepdims=True)
+    # The largest term of each sum is that of the largest probability for
+    # positive orders, and of the smallest for negative orders.
+    top = np.where(orders >= 0, orders * high, orders * low)
+    terms = orders[:, np.newaxis] * logp[..., np.newaxis, :]
+    # Mask before exponentiating, as the terms of null outcomes can overflow.
+    terms = np.where(support[..., np.newaxis, :],
+                     terms - top[..., np.newaxis], -np.inf)
+    return top + np.log(np.exp(terms).sum(axis=-1))
+
+
+def _log_moments(pmf):
+    """
+    Returns the Shannon entropy, in nats, and the second moment of ln(p).
+
+    Parameters
+    ----------
+    pmf : np.ndarray, shape (..., k)
+        The linear pmfs.
+
+    Returns
+    -------
+    H : np.ndarray, shape (...)
+        -sum(p ln(p)).
+    M : np.ndarray, shape (...)
+        sum(p ln(p)**2).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logp = np.where(pmf > 0, np.log(np.where(pmf > 0, pmf, 1)), 0)
+    return -(pmf * logp).sum(axis=-1), (pmf * logp**2).sum(axis=-1)
+
+
+def _orders(orders, negative=False):
+    """
+    Returns `orders` as a 1D float array, checking that they are valid.
+    """
+    orders = np.atleast_1d(np.asarray(orders, dtype=float))
+    if orders.ndim != 1:
+        msg = "`orders` must be a 1D array."
+        raise ValueError(msg)
+    if np.isnan(orders).any() or (orders == -np.inf).any():
+        msg = "`orders` must be real numbers or np.inf"
+        raise ValueError(msg)
+    if not negative and (orders < 0).any():
+        msg = "`orders` must be non-negative real numbers"
+        raise ValueError(msg)
+    return orders
+
+
+def renyi_entropy_spectrum(dist, orders, rvs=None, rv_mode=None):
+    """
+    Compute the Renyi entropy of every order in `orders`.
+
+    The marginal is computed once, and every order is evaluated from its
+    log-probabilities with a single broadcast log-sum-exp.
+
+    Parameters
+    ----------
+    dist : Distribution, DistributionBatch, np.ndarray
+        The distribution to take the Renyi entropies of, a batch of
+        distributions, or an array of linear pmfs whose last axis runs over
+        outcomes.
+    orders : array-like of floats >= 0
+        The orders of the Renyi entropy. np.inf is allowed.
+    rvs : list, None
+        The indexes of the random variable used to calculate the Renyi entropy
+        of. If None, then the Renyi entropy is calculated over all random
+        variables.
+    rv_mode : str, None
+        Specifies how to interpret `rvs`. Valid options are: {'indices',
+        'names'}. If equal to 'indices', then the elements of `rvs` are
+        interpreted as random variable indices. If equal to 'names', the the
+        elements are interpreted as random variable names. If `None`, then the
+        value of `dist._rv_mode` is consulted, which defaults to 'indices'.
+
+    Returns
+    -------
+    H_a : np.ndarray, shape (len(orders),) or (..., len(orders))
+        The Renyi entropy, in bits, of each order. For batches and arrays of
+        pmfs, the leading axes are those of the pmfs.
+
+    Raises
+    ------
+    ditException
+        Raised if `rvs` contain non-existant random variables.
+    ValueError
+        Raised if `orders` are not non-negative floats.
+
+    Notes
+    -----
+    Order 0 is the log of the size of the support, and orders within 1e-5
+    of 1 use the expansion H - (a - 1) Var[ln p] / 2 about the Shannon
+    entropy H, which avoids dividing a vanishing power sum by 1 - a.
+    """
+    orders = _orders(orders)
+    pmf = _spectrum_pmf(dist, rvs, rv_mode)
+
+    finite = np.isfinite(orders)
+    a = np.where(finite, orders, 0)
+    near = np.abs(a - 1) < _NEAR_ONE
+    sums = _log_power_sums(pmf, np.where(near, 0, a))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        H_a = sums / (1 - a)
+
+    H, M = _log_moments(pmf)
+    H, M = H[..., np.newaxis], M[..., np.newaxis]
+    shannon = H - (a - 1) * (M - H**2) / 2
+    H_a = np.where(near, shannon, H_a)
+
+    H_inf = -np.log(pmf.max(axis=-1))[..., np.newaxis]
+    H_a = np.where(finite, H_a, H_inf)
+
+    return H_a / np.log(2)
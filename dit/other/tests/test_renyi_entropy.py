@@ -8,9 +8,9 @@ import pytest
 
 import numpy as np
 
-from dit import Distribution
+from dit import Distribution, DistributionBatch, random_distribution
 from dit.example_dists import uniform
-from dit.other import renyi_entropy
+from dit.other import renyi_entropy, renyi_entropy_spectrum
 
 
 @pytest.mark.parametrize('alpha', [0, 1/2, 1, 2, 5, np.inf])
@@ -42,3 +42,46 @@ def test_renyi_entropy_3(alpha):
     d = uniform(8)
     with pytest.raises(ValueError):
         renyi_entropy(d, alpha)
+
+
+def test_renyi_entropy_spectrum_1():
+    """
+    Test that the spectrum matches the Renyi entropy of each order.
+    """
+    d = random_distribution(3, 3, prng=np.random.RandomState(0))
+    orders = [0, 1/2, 1 - 1e-7, 1, 1 + 1e-6, 2, 300, np.inf]
+    H = renyi_entropy_spectrum(d, orders, [0, 1])
+    for a, H_a in zip(orders, H):
+        assert H_a == pytest.approx(renyi_entropy(d, a, [0, 1]))
+
+
+def test_renyi_entropy_spectrum_2():
+    """
+    Test batches and arrays of pmfs.
+    """
+    d1 = random_distribution(2, 2, prng=np.random.RandomState(0))
+    d2 = random_distribution(2, 2, prng=np.random.RandomState(1))
+    batch = DistributionBatch.from_distributions([d1, d2])
+    orders = [0, 2, np.inf]
+    H = renyi_entropy_spectrum(batch, orders, [1])
+    assert H.shape == (2, 3)
+    assert np.allclose(H[1], renyi_entropy_spectrum(d2, orders, [1]))
+    H = renyi_entropy_spectrum(np.array([[1/2, 1/2, 0], [1, 0, 0]]), orders)
+    assert np.allclose(H, [[1, 1, 1], [0, 0, 0]])
+
+
+def test_renyi_entropy_spectrum_3():
+    """
+    Test that negative orders raise ValueErrors.
+    """
+    with pytest.raises(ValueError):
+        renyi_entropy_spectrum(uniform(8), [1, -1])
+
+
+def test_renyi_entropy_spectrum_4():
+    """
+    Test large orders of a pmf with a null outcome.
+    """
+    pmf = np.array([1/10]*10 + [0])
+    H = renyi_entropy_spectrum(pmf, [400, 1000])
+    assert np.allclose(H, np.log2(10))
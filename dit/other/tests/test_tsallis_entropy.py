@@ -9,7 +9,7 @@ import pytest
 import numpy as np
 
 from dit import Distribution
-from dit.other import tsallis_entropy
+from dit.other import tsallis_entropy, tsallis_entropy_spectrum
 
 
 @pytest.mark.parametrize('q', np.arange(-2, 2.5, 0.5))
@@ -23,3 +23,35 @@ def test_tsallis_entropy_1(q):
     S_B = tsallis_entropy(d, q, [1])
     pa_prop = S_A + S_B + (1-q)*S_A*S_B
     assert S_AB == pytest.approx(pa_prop)
+
+
+def test_tsallis_entropy_spectrum_1():
+    """
+    Test that the spectrum matches the Tsallis entropy of each order.
+    """
+    d = Distribution(['00', '01', '02', '10', '11', '12'], [1/12]*4 + [1/3]*2)
+    orders = np.array([-2, 0, 1/2, 1 - 1e-7, 1, 1 + 1e-6, 2, 300])
+    S = tsallis_entropy_spectrum(d, orders, [1])
+    for q, S_q in zip(orders, S):
+        assert S_q == pytest.approx(tsallis_entropy(d, q, [1]))
+    assert tsallis_entropy_spectrum(d, [np.inf]) == pytest.approx(0)
+
+
+def test_tsallis_entropy_spectrum_2():
+    """
+    Test arrays of pmfs, and invalid orders.
+    """
+    pmf = np.array([[1/2, 1/2, 0], [1/4, 1/4, 1/2]])
+    S = tsallis_entropy_spectrum(pmf, [0, 2])
+    assert np.allclose(S, [[1, 1/2], [2, 5/8]])
+    with pytest.raises(ValueError):
+        tsallis_entropy_spectrum(pmf, [-np.inf])
+
+
+def test_tsallis_entropy_spectrum_3():
+    """
+    Test a large order of a pmf with a null outcome.
+    """
+    pmf = np.array([1/10]*10 + [0])
+    S = tsallis_entropy_spectrum(pmf, [400])
+    assert S == pytest.approx([1/399])
@@ -9,8 +9,11 @@ import numpy as np
 from ..helpers import normalize_rvs
 from ..utils import flatten
 from ..multivariate import entropy
+from .renyi_entropy import (_NEAR_ONE, _log_moments, _log_power_sums, _orders,
+                            _spectrum_pmf)
 
 __all__ = ('tsallis_entropy',
+           'tsallis_entropy_spectrum',
           )
 
 
@@ -61,3 +64,66 @@ def tsallis_entropy(dist, order, rvs=None, rv_mode=None):
         S_q = 1/(order - 1) * (1 - (pmf**order).sum())
 
     return S_q
+
+
+def tsallis_entropy_spectrum(dist, orders, rvs=None, rv_mode=None):
+    """
+    Compute the Tsallis entropy of every order in `orders`.
+
+    The marginal is computed once, and every order is evaluated from its
+    log-probabilities with a single broadcast log-sum-exp.
+
+    Parameters
+    ----------
+    dist : Distribution, DistributionBatch, np.ndarray
+        The distribution to take the Tsallis entropies of, a batch of
+        distributions, or an array of linear pmfs whose last axis runs over
+        outcomes.
+    orders : array-like of floats
+        The orders of the Tsallis entropy. np.inf is allowed.
+    rvs : list, None
+        The indexes of the random variable used to calculate the Tsallis
+        entropy of. If None, then the Tsallis entropy is calculated over all
+        random variables.
+    rv_mode : str, None
+        Specifies how to interpret `rvs`. Valid options are: {'indices',
+        'names'}. If equal to 'indices', then the elements of `rvs` are
+        interpreted as random variable indices. If equal to 'names', the the
+        elements are interpreted as random variable names. If `None`, then the
+        value of `dist._rv_mode` is consulted, which defaults to 'indices'.
+
+    Returns
+    -------
+    S_q : np.ndarray, shape (len(orders),) or (..., len(orders))
+        The Tsallis entropy of each order. For batches and arrays of pmfs,
+        the leading axes are those of the pmfs.
+
+    Raises
+    ------
+    ditException
+        Raised if `rvs` contain non-existant random variables.
+    ValueError
+        Raised if `orders` are not real numbers.
+
+    Notes
+    -----
+    Outcomes of zero probability are excluded, so order 0 is the size of the
+    support less one. Order np.inf is 0, and
+    orders within 1e-5 of 1 use the expansion S - (q - 1) E[ln(p)**2] / 2
+    about the Shannon entropy S, in nats.
+    """
+    orders = _orders(orders, negative=True)
+    pmf = _spectrum_pmf(dist, rvs, rv_mode)
+
+    finite = np.isfinite(orders)
+    q = np.where(finite, orders, 0)
+    near = np.abs(q - 1) < _NEAR_ONE
+    sums = _log_power_sums(pmf, np.where(near, 0, q))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        S_q = -np.expm1(sums) / (q - 1)
+
+    S, M = _log_moments(pmf)
+    shannon = S[..., np.newaxis] - (q - 1) * M[..., np.newaxis] / 2
+    S_q = np.where(near, shannon, S_q)
+
+    return np.where(finite, S_q, 0.0)
@@ -8,9 +8,8 @@ import numpy as np
 
 from .pid import BasePID
 
-from .. import modify_outcomes
 from ..algorithms import maxent_dist
-from ..utils import flatten, powerset
+from ..local import local_coinformation, local_mutual_information
 
 
 def i_ccs(d, inputs, output):
@@ -38,53 +37,25 @@ def i_ccs(d, inputs, output):
     d = d.coalesce(inputs + (output,))
     marginals = [vars[:-1]] + [[i, vars[-1]] for i in vars[:-1]]
     d = maxent_dist(d, marginals)
-    d = modify_outcomes(d, lambda o: tuple(o))
-    sub_vars = [var for var in powerset(vars) if var]
-    sub_dists = {var: d.marginal(var) for var in sub_vars}
+    pmf = d.pmf
 
-    def pmi(input_, output):
-        """
-        Compute the pointwise mutual information.
-
-        Parameters
-        ----------
-        input_ : iterable
-            The input variable.
-        output : iterable
-            The output variable.
-
-        Returns
-        -------
-        pmi : dict
-            A dictionary mapping events to pointwise mutual information values.
-        """
-        jdist = sub_dists[(input_, output)]
-        idist = sub_dists[(input_,)]
-        odist = sub_dists[(output,)]
-        return {e: np.log2(jdist[e] / (idist[(e[0],)] * odist[(e[1],)])) for e in jdist.outcomes}
-
-    pmis = {tuple(marg): pmi(marg[0], marg[1]) for marg in marginals[1:]}
-
-    inputs_dist = sub_dists[tuple(vars[:-1])]
-    output_dist = sub_dists[(vars[-1],)]
-    joint_pmis = {e: np.log2(d[e]/(inputs_dist[e[:-1]]*output_dist[(e[-1],)])) for e in d.outcomes}
-
-    coinfos = {e: np.log2(np.prod(
-        [sub_dists[sub_var][tuple(e[i] for i in flatten(sub_var))] ** ((-1) ** len(sub_var)) for sub_var in sub_vars]))
-               for e in d.outcomes}
+    # Pointwise values, aligned with the outcomes of `d`.
+    output_ = [vars[-1]]
+    pmis = [local_mutual_information(d, [var], output_) for var in vars[:-1]]
+    joint_pmi = local_mutual_information(d, vars[:-1], output_)
+    coinfo = local_coinformation(d, [[var] for var in vars])
 
     # fix the sign of things close to zero
-    for pmi in pmis.values():
-        for e, val in pmi.items():
-            if np.isclose(val, 0.0):  # pragma: no cover
-                pmi[e] = 0.0
-    for e, val in coinfos.items():
-        if np.isclose(val, 0.0):
-            coinfos[e] = 0.0
+    for pmi in pmis:
+        pmi[np.isclose(pmi, 0.0)] = 0.0
+    coinfo[np.isclose(coinfo, 0.0)] = 0.0
+
+    sign = np.sign(coinfo)
+    agree = sign == np.sign(joint_pmi)
+    for pmi in pmis:
+        agree &= sign == np.sign(pmi)
 
-    i = sum(d[e] * coinfos[e] for e in d.outcomes if
-            all(np.sign(coinfos[e]) == np.sign(pmi[tuple(e[i] for i in marg)]) for marg, pmi in pmis.items()) \
-            and np.sign(coinfos[e]) == np.sign(joint_pmis[e]))
+    i = np.dot(pmf[agree], coinfo[agree])
 
     return i
 
@@ -29,13 +29,15 @@ def s_i(d, input_, output, output_value):
     s : float
         The specific information
     """
-    pp_s, pp_a_s = d.condition_on(output, rvs=input_)
+    # Both conditional pmf arrays index the input by the outcomes of P(input_).
+    pp_s, pp_a_s = d.condition_on(output, rvs=input_, lazy=True)
     p_s = pp_s[output_value]
-    p_a_s = pp_a_s[pp_s.outcomes.index(output_value)]
-    pp_a, pp_s_a = d.condition_on(input_, rvs=output)
-    p_s_a = {a: pp[output_value] for a, pp in zip(pp_a.outcomes, pp_s_a)}
+    p_a_s = pp_a_s.to_array(base='linear')[pp_s._outcomes_index[output_value]]
+    pp_a, pp_s_a = d.condition_on(input_, rvs=output, lazy=True)
+    p_s_a = pp_s_a.to_array(base='linear')
+    p_s_a = p_s_a[:, pp_s_a.dist._outcomes_index[output_value]]
 
-    return np.nansum([p_a_s[a] * np.log2(psa / p_s) for a, psa in p_s_a.items()])
+    return np.nansum(p_a_s * np.log2(p_s_a / p_s))
 
 
 def i_min(d, inputs, output):
@@ -0,0 +1,252 @@
+"""
+Evaluate many information measures of one distribution at once.
+
+Reports typically compute dozens of measures of the same distribution, and
+each measure parses its random variables and computes its marginals on its
+own. For every measure that can read its entropies from an `EntropyTable`,
+`evaluate` first collects the subsets of random variables it looks up. It then
+computes each of those marginals once, summing every one out of the smallest
+marginal already computed which contains it, and evaluates the measures from
+the shared table. Other measures are called directly.
+"""
+
+from __future__ import division
+
+from .exceptions import ditException
+from .helpers import normalize_rvs
+from .multivariate import (caekl_mutual_information,
+                           coinformation,
+                           dual_total_correlation,
+                           entropy as multivariate_entropy,
+                           residual_entropy,
+                           total_correlation,
+                           tse_complexity,
+                          )
+from .shannon import (conditional_entropy,
+                      entropy,
+                      mutual_information,
+                      shared_entropy_table,
+                     )
+
+__all__ = ('evaluate',
+          )
+
+
+def _table_entropy(table, rvs=None, rv_mode=None):
+    """
+    `dit.shannon.entropy`, looked up in `table`.
+    """
+    return table.entropy(rvs, rv_mode=rv_mode)
+
+
+def _table_conditional_entropy(table, rvs_X, rvs_Y, rv_mode=None):
+    """
+    `dit.shannon.conditional_entropy`, looked up in `table`.
+    """
+    return table.conditional_entropy(rvs_X, rvs_Y, rv_mode=rv_mode)
+
+
+def _table_mutual_information(table, rvs_X, rvs_Y, rv_mode=None):
+    """
+    `dit.shannon.mutual_information`, looked up in `table`.
+    """
+    H_X = table.entropy(rvs_X, rv_mode=rv_mode)
+    H_Y = table.entropy(rvs_Y, rv_mode=rv_mode)
+    H_XY = table.entropy(list(rvs_X) + list(rvs_Y), rv_mode=rv_mode)
+    return H_X + H_Y - H_XY
+
+
+def _plan_entropy(table, rvs=None, rv_mode=None):
+    """
+    The subsets looked up by `_table_entropy`.
+    """
+    return {table._full if rvs is None else table._mask(rvs, rv_mode)}
+
+
+def _plan_conditional_entropy(table, rvs_X, rvs_Y, rv_mode=None):
+    """
+    The subsets looked up by `_table_conditional_entropy`.
+    """
+    X = table._mask(rvs_X, rv_mode)
+    Y = table._mask(rvs_Y, rv_mode)
+    return {X | Y, Y}
+
+
+def _plan_mutual_information(table, rvs_X, rvs_Y, rv_mode=None):
+    """
+    The subsets looked up by `_table_mutual_information`.
+    """
+    X = table._mask(rvs_X, rv_mode)
+    Y = table._mask(rvs_Y, rv_mode)
+    return {X, Y, X | Y}
+
+
+def _groups(table, rvs, crvs, rv_mode):
+    """
+    The masks of the groups `rvs`, of their union and of `crvs`.
+    """
+    rvs, crvs, rv_mode = normalize_rvs(table.dist, rvs, crvs, rv_mode)
+    groups = [table._mask(rv, rv_mode) for rv in rvs]
+    union = 0
+    for group in groups:
+        union |= group
+    return groups, union, table._mask(crvs, rv_mode)
+
+
+def _plan_joint_entropy(table, rvs=None, crvs=None, rv_mode=None):
+    """
+    The subsets looked up by `multivariate.entropy`.
+    """
+    _, union, Z = _groups(table, rvs, crvs, rv_mode)
+    return {union | Z, Z}
+
+
+def _plan_total_correlation(table, rvs=None, crvs=None, rv_mode=None):
+    """
+    The subsets looked up by `total_correlation`.
+    """
+    groups, union, Z = _groups(table, rvs, crvs, rv_mode)
+    return {group | Z for group in groups} | {union | Z, Z}
+
+
+def _plan_dual_total_correlation(table, rvs=None, crvs=None, rv_mode=None):
+    """
+    The subsets looked up by `dual_total_correlation` and `residual_entropy`.
+    """
+    groups, union, Z = _groups(table, rvs, crvs, rv_mode)
+    return {union & ~group | Z for group in groups} | {union | Z, Z}
+
+
+def _plan_unions(table, rvs=None, crvs=None, rv_mode=None):
+    """
+    The subsets looked up by `coinformation`: every union of the groups, with
+    `crvs`.
+    """
+    groups, _, Z = _groups(table, rvs, crvs, rv_mode)
+    masks = [Z]
+    for group in groups:
+        masks.extend([mask | group for mask in masks])
+    return set(masks)
+
+
+def _plan_subsets(table, rvs=None, crvs=None, rv_mode=None):
+    """
+    The subsets computed by `tse_complexity` and `caekl_mutual_information`:
+    every subset of the random variables involved.
+    """
+    _, union, Z = _groups(table, rvs, crvs, rv_mode)
+    top = union | Z
+    masks = [0]
+    for i in range(table._n):
+        if top & (1 << i):
+            masks.extend([mask | (1 << i) for mask in masks])
+    return set(masks)
+
+
+# The measures which may be evaluated from an entropy table, each with the
+# function returning the subsets it looks up and the function evaluating it.
+_TABLE_MEASURES = {
+    entropy: (_plan_entropy, _table_entropy),
+    conditional_entropy: (_plan_conditional_entropy,
+                          _table_conditional_entropy),
+    mutual_information: (_plan_mutual_information, _table_mutual_information),
+    multivariate_entropy: (_plan_joint_entropy, multivariate_entropy),
+    coinformation: (_plan_unions, coinformation),
+    total_correlation: (_plan_total_correlation, total_correlation),
+    dual_total_correlation: (_plan_dual_total_correlation,
+                             dual_total_correlation),
+    residual_entropy: (_plan_dual_total_correlation, residual_entropy),
+    tse_complexity: (_plan_subsets, tse_complexity),
+    caekl_mutual_information: (_plan_subsets, caekl_mutual_information),
+}
+
+
+def _parse_spec(spec):
+    """
+    Returns the measure and keyword arguments of a measure spec.
+    """
+    if callable(spec):
+        return spec, {}
+    try:
+        measure, kwargs = spec
+    except (TypeError, ValueError):
+        measure, kwargs = None, None
+    if not callable(measure) or not isinstance(kwargs, dict):
+        msg = "{0!r} is not a measure or a (measure, kwargs) pair."
+        raise ditException(msg.format(spec))
+    return measure, kwargs
+
+
+def evaluate(dist, specs):
+    """
+    Evaluate many information measures of `dist`, sharing their marginals.
+
+    Parameters
+    ----------
+    dist : Distribution
+        The joint distribution.
+    specs : list
+        The measures to evaluate. Each is either a measure, such as
+        `dit.multivariate.total_correlation`, called as `measure(dist)`, or
+        a (measure, kwargs) pair, called as `measure(dist, **kwargs)`.
+
+    Returns
+    -------
+    values : list
+        The value of each measure, in the order of `specs`.
+    marginals : list
+        A (rvs, parent, seconds) triple for each marginal computed, in order:
+        the indexes of its random variables, those of the marginal it was
+        summed out of, and the time taken.
+
+    Raises
+    ------
+    ditException
+        Raised if `dist` is not a joint distribution, or if a spec is not a
+        measure or a (measure, kwargs) pair.
+
+    Examples
+    --------
+    >>> d = dit.example_dists.Xor()
+    >>> values, marginals = dit.evaluate(d, [
+    ...     dit.multivariate.coinformation,
+    ...     (dit.shannon.mutual_information, {'rvs_X': [0], 'rvs_Y': [1]}),
+    ... ])
+    >>> values
+    [-1.0, 0.0]
+    >>> [rvs for rvs, parent, seconds in marginals]
+    [(0, 1, 2), (0, 1), (0, 2), (1, 2), (0,), (1,), (2,)]
+
+    Notes
+    -----
+    The measures of the `dit.shannon` and `dit.multivariate` modules which
+    accept an `EntropyTable`, as well as `entropy`, `conditional_entropy` and
+    `mutual_information`, are evaluated from the entropy table shared with
+    other measures of `dist`. Any other measure is called with `dist`.
+
+    """
+    if not dist.is_joint():
+        msg = "Planned evaluation requires a joint distribution."
+        raise ditException(msg)
+
+    specs = [_parse_spec(spec) for spec in specs]
+
+    table = shared_entropy_table(dist)
+    masks = set()
+    for measure, kwargs in specs:
+        if measure in _TABLE_MEASURES:
+            plan, _ = _TABLE_MEASURES[measure]
+            masks.update(plan(table, **kwargs))
+    subsets = [[i for i in range(table._n) if mask & (1 << i)]
+               for mask in masks]
+    marginals = table.compute_subsets(subsets, rv_mode='indices')
+
+    values = []
+    for measure, kwargs in specs:
+        if measure in _TABLE_MEASURES:
+            _, evaluate_table = _TABLE_MEASURES[measure]
+            values.append(evaluate_table(table, **kwargs))
+        else:
+            values.append(measure(dist, **kwargs))
+
+    return values, marginals
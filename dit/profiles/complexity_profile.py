@@ -23,13 +23,13 @@ class ComplexityProfile(BaseProfile):
 
         Implementation Notes
         --------------------
-        This make use of the ShannonPartition. There may be more efficient
-        methods.
+        This make use of the ShannonPartition, which shares its entropies with
+        other measures of the same distribution.
         """
         sp = ShannonPartition(self.dist)
         profile = defaultdict(float)
-        for atom in sp.get_atoms(string=False):
-            profile[len(atom[0])] += sp[atom]
+        for atom, value in sp.atoms.items():
+            profile[len(atom[0])] += value
         levels = reversed(sorted(profile))
         next(levels) # skip the middle
         for level in levels:
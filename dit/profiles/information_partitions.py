@@ -11,7 +11,7 @@ from six import with_metaclass
 
 from collections import defaultdict
 
-from itertools import combinations, islice, permutations
+from itertools import combinations, permutations
 
 import prettytable
 
@@ -21,8 +21,10 @@ import networkx as nx
 
 from .. import ditParams
 from ..algorithms import maxent_dist
+from ..math.combinatorics import (subset_sizes, subset_transform,
+                                  superset_transform)
 from ..other import extropy
-from ..shannon import entropy
+from ..shannon import EntropyTable, entropy, shared_entropy_table
 from ..utils import powerset
 
 __all__ = ['ShannonPartition',
@@ -31,22 +33,6 @@ __all__ = ['ShannonPartition',
           ]
 
 
-### TODO: enable caching on this?
-def poset_lattice(elements):
-    """
-    Return the Hasse diagram of the lattice induced by `elements`.
-    """
-    child = lambda a, b: a.issubset(b) and (len(b) - len(a) == 1)
-
-    lattice = nx.DiGraph()
-
-    for a, b in combinations(powerset(elements), 2):
-        if child(set(a), set(b)):
-            lattice.add_edge(b, a)
-
-    return lattice
-
-
 def constraint_lattice(elements):
     """
     Return a lattice of constrained marginals, with k=1 at the bottom and
@@ -146,34 +132,47 @@ class BaseInformationPartition(with_metaclass(ABCMeta, object)):
         if not rvs:
             rvs = tuple(range(self.dist.outcome_length()))
 
-        self._lattice = poset_lattice(rvs)
-        rlattice = self._lattice.reverse()
-        Hs = {}
-        Is = {}
-        atoms = {}
-        new_atoms = {}
+        # Subsets of `rvs` are indexed by bitmasks, bit i standing for rvs[i].
+        sizes = subset_sizes(len(rvs))
 
         # Entropies
-        for node in self._lattice:
-            Hs[node] = self._measure(self.dist, node) # pylint: disable=no-member
+        Hs = self._measures(rvs)
 
         # Subset-sum type thing, basically co-information calculations.
-        for node in self._lattice:
-            Is[node] = sum((-1)**(len(rv)+1)*Hs[rv] for rv in nx.dfs_preorder_nodes(self._lattice, node))
+        Is = subset_transform((-1)**(sizes + 1) * Hs)
 
         # Mobius inversion of the above, resulting in the Shannon atoms.
-        for node in list(nx.topological_sort(self._lattice))[:-1]:
-            kids = islice(nx.dfs_preorder_nodes(rlattice, node), 1, None)
-            atoms[node] = Is[node] - sum(atoms[child] for child in kids)
+        atoms = superset_transform(Is, inverse=True)
 
         # get the atom indices in proper format
-        for atom, value in atoms.items():
+        new_atoms = {}
+        for mask in range(1, len(atoms)):
+            atom = tuple(rv for i, rv in enumerate(rvs) if mask >> i & 1)
             a_rvs = tuple((_,) for _ in atom)
             a_crvs = tuple(sorted(set(rvs) - set(atom)))
-            new_atoms[(a_rvs, a_crvs)] = value
+            new_atoms[(a_rvs, a_crvs)] = atoms[mask]
 
         self.atoms = new_atoms
 
+    def _measures(self, rvs):
+        """
+        Compute the measure of each subset of `rvs`.
+
+        Parameters
+        ----------
+        rvs : tuple
+            The random variables.
+
+        Returns
+        -------
+        values : np.ndarray, shape (2**len(rvs),)
+            The measure of each subset, indexed by bitmask over `rvs`.
+        """
+        nodes = [()]
+        for rv in rvs:
+            nodes.extend([node + (rv,) for node in nodes])
+        return np.array([self._measure(self.dist, node) for node in nodes]) # pylint: disable=no-member
+
     def __getitem__(self, item):
         """
         Return the value of any information measure.
@@ -252,6 +251,44 @@ class ShannonPartition(BaseInformationPartition):
     _measure = staticmethod(entropy)
     unit = 'bits'
 
+    def __init__(self, dist):
+        """
+        Construct an I-Diagram of `dist`.
+
+        Parameters
+        ----------
+        dist : distribution, EntropyTable
+            The distribution to partition, or an entropy table of it.
+        """
+        if isinstance(dist, EntropyTable):
+            self._table, dist = dist, dist.dist
+        else:
+            self._table = None
+        super(ShannonPartition, self).__init__(dist)
+
+    def _measures(self, rvs):
+        """
+        Look up the entropy of each subset of `rvs` in an `EntropyTable`.
+
+        Every subset of the random variables is needed, so all their entropies
+        are computed in a single sweep. Unless a table was given, the table
+        shared by all users of `dist` is used, if sharing is enabled.
+
+        Parameters
+        ----------
+        rvs : tuple
+            The random variables.
+
+        Returns
+        -------
+        values : np.ndarray, shape (2**len(rvs),)
+            The entropy of each subset, indexed by bitmask over `rvs`.
+        """
+        if self._table is None:
+            self._table = shared_entropy_table(self.dist)
+        self._table.compute()
+        return self._table.vector(rvs)
+
     @staticmethod
     def _symbol(rvs, crvs):
         """
@@ -73,6 +73,15 @@ def test_sp4():
     assert str(ip) == string
 
 
+def test_sp5():
+    """ Test the atoms of many variables against the coinformation """
+    d = n_mod_m(7, 2)
+    sp = ShannonPartition(d)
+    assert len(sp.atoms) == 2**7 - 1
+    assert sp[((0,), (1,), (2,), (3,), (4,), (5,), (6,)), ()] == pytest.approx(I(d))
+    assert sp[((0,), (1,)), (2, 3)] == pytest.approx(I(d, [[0], [1]], [2, 3]))
+
+
 def test_ep1():
     """
     Test against known values.
@@ -13,6 +13,7 @@ from .. import Distribution
 from ..algorithms.minimal_sufficient_statistic import mss
 from ..exceptions import ditException
 from ..multivariate import entropy, total_correlation
+from ..samplespace import CartesianProduct
 from ..utils import flatten
 
 
@@ -447,7 +448,8 @@ class IBCurve(object):
 
         for beta in self.betas[::-1]:
             q_xyzt, x0 = get_opt(beta, x0)
-            d = Distribution.from_ndarray(q_xyzt)
+            sample_space = CartesianProduct([range(n) for n in q_xyzt.shape])
+            d = Distribution.from_dense_pmf(q_xyzt, sample_space)
             complexities.append(total_correlation(d, [x, t], z))
             entropies.append(entropy(d, x, z))
             relevances.append(total_correlation(d, [y, t], z))
@@ -8,8 +8,10 @@ import pytest
 
 import numpy as np
 
-from dit import Distribution
-from dit.rate_distortion.rate_distortion import RateDistortionHamming
+from dit import Distribution, random_distribution
+from dit.divergences.pmf import conditional_maximum_correlation
+from dit.rate_distortion.rate_distortion import (RateDistortionHamming,
+                                                 RateDistortionMaximumCorrelation)
 
 
 def test_rd():
@@ -19,4 +21,17 @@ def test_rd():
     dist = Distribution(['0', '1'], [1/2, 1/2])
     rd = RateDistortionHamming.functional()
     r, d = rd(dist, beta=0.0)
-    assert d == pytest.approx(0.5, abs=1e-5)
\ No newline at end of file
+    assert d == pytest.approx(0.5, abs=1e-5)
+
+
+def test_rd_maximum_correlation():
+    """
+    Test that the maximum correlation distortion is between X and the
+    statistic, given Z, whatever the order of their axes.
+    """
+    dist = random_distribution(2, 3, prng=np.random.RandomState(0))
+    rd = RateDistortionMaximumCorrelation(dist, beta=1.0, rv=[0], crvs=[1])
+    distortion = rd._distortion()
+    pmf = np.random.RandomState(1).dirichlet(np.ones(27)).reshape(3, 3, 3)
+    cmc = conditional_maximum_correlation(pmf.transpose(0, 2, 1))
+    assert distortion(pmf) == pytest.approx(1 - cmc)
@@ -45,7 +45,7 @@ import itertools
 
 from operator import mul
 
-from six.moves import reduce # pylint: disable=redefined-builtin
+from six.moves import map, range, reduce, zip # pylint: disable=redefined-builtin
 
 import numpy as np
 
@@ -327,6 +327,9 @@ class CartesianProduct(SampleSpace):
         shifts.reverse()
         self._shifts = np.array(shifts)
 
+        # Maps from symbols to their index in each alphabet, built on demand.
+        self._lookups = None
+
     def __contains__(self, item):
         try:
             iterator = enumerate(item)
@@ -366,6 +369,24 @@ class CartesianProduct(SampleSpace):
             product = get_product_func(klass)
         return cls(alphabets, product=product)
 
+    def _symbol_index(self, i):
+        """
+        Returns a function mapping symbols to their index in alphabet `i`.
+
+        The function raises a KeyError or ValueError for invalid symbols.
+
+        """
+        alphabet = self.alphabets[i]
+        if isinstance(alphabet, SampleSpace):
+            # Nested sample spaces know how to index their outcomes.
+            return alphabet.index
+
+        if self._lookups is None:
+            self._lookups = [None] * len(self.alphabets)
+        if self._lookups[i] is None:
+            self._lookups[i] = dict(zip(alphabet, range(len(alphabet))))
+        return self._lookups[i].__getitem__
+
     def index(self, item):
         """
         Returns a key for sorting items in the sample space.
@@ -373,15 +394,161 @@ class CartesianProduct(SampleSpace):
         """
         # This works even if alphabets[i] is itself a sample space.
         try:
-            indexes = [self.alphabets[i].index(symbol)
+            if len(item) != len(self.alphabets):
+                raise IndexError
+            indexes = [self._symbol_index(i)(symbol)
                        for i, symbol in enumerate(item)]
-        except (ValueError, IndexError):
+        except (KeyError, ValueError, IndexError, TypeError):
             msg = '{0!r} is not in the sample space'.format(item)
             raise ValueError(msg)
 
+        if not self._fits_int64():
+            shifts = self._big_shifts()
+            return sum(i * shift for i, shift in zip(indexes, shifts))
         idx = np.sum(np.array(indexes) * self._shifts)
         return idx
 
+    def encode(self, outcomes):
+        """
+        Returns the index of each symbol of `outcomes` in its alphabet.
+
+        Parameters
+        ----------
+        outcomes : sequence
+            The outcomes to encode.
+
+        Returns
+        -------
+        codes : list of NumPy arrays
+            For each alphabet, the index of the corresponding symbol of each
+            outcome.
+
+        Raises
+        ------
+        ValueError
+            If any outcome is not in the sample space.
+
+        """
+        n = len(outcomes)
+        L = len(self.alphabets)
+        if n and any(len(outcome) != L for outcome in outcomes):
+            raise ValueError('Outcomes have an invalid length.')
+
+        codes = [np.empty(n, dtype=int) for _ in range(L)]
+        for i, column in enumerate(zip(*outcomes)):
+            try:
+                codes[i] = np.fromiter(map(self._symbol_index(i), column),
+                                       int, n)
+            except (KeyError, ValueError, TypeError):
+                msg = 'Outcomes contain symbols not in the sample space.'
+                raise ValueError(msg)
+        return codes
+
+    def index_many(self, outcomes):
+        """
+        Returns the index of each of `outcomes` in the sample space.
+
+        This is the vectorized equivalent of `index`.
+
+        Parameters
+        ----------
+        outcomes : sequence
+            The outcomes to index.
+
+        Returns
+        -------
+        idx : NumPy array, shape (len(outcomes),)
+            The index of each outcome.
+
+        Raises
+        ------
+        ValueError
+            If any outcome is not in the sample space.
+
+        """
+        if not self.alphabets:
+            return np.zeros(len(outcomes), dtype=int)
+        return self.ravel(self.encode(outcomes))
+
+    def ravel(self, codes):
+        """
+        Returns the indexes in the sample space of integer-coded outcomes.
+
+        Parameters
+        ----------
+        codes : sequence of NumPy arrays
+            For each alphabet, the index of the corresponding symbol of each
+            outcome.
+
+        Returns
+        -------
+        idx : NumPy array
+            The index of each outcome. If the sample space is too large for
+            64-bit integers, then this is an array of Python integers.
+
+        See Also
+        --------
+        unravel
+
+        """
+        if self._fits_int64():
+            return np.ravel_multi_index(tuple(codes), self.alphabet_sizes)
+
+        idx = 0
+        for c, shift in zip(codes, self._big_shifts()):
+            idx = idx + np.asarray(c, dtype=object) * shift
+        return idx
+
+    def unravel(self, idx):
+        """
+        Returns the integer-coded outcomes at indexes `idx` of the sample space.
+
+        Parameters
+        ----------
+        idx : NumPy array
+            The indexes of outcomes in the sample space.
+
+        Returns
+        -------
+        codes : list of NumPy arrays
+            For each alphabet, the index of the corresponding symbol of each
+            outcome.
+
+        See Also
+        --------
+        ravel
+
+        """
+        if self._fits_int64():
+            return list(np.unravel_index(idx, self.alphabet_sizes))
+
+        idx = np.asarray(idx, dtype=object)
+        codes = []
+        for size in reversed(self.alphabet_sizes):
+            idx, c = idx // size, idx % size
+            codes.append(c.astype(int))
+        codes.reverse()
+        return codes
+
+    def _fits_int64(self):
+        """
+        Returns `True` if every index in the sample space fits in an int64.
+
+        """
+        # `_length` may have silently overflowed, so use Python integers.
+        return reduce(mul, self.alphabet_sizes, 1) < 2**63
+
+    def _big_shifts(self):
+        """
+        Returns the shifts as Python integers, which do not overflow.
+
+        """
+        shifts = [1]
+        for size in reversed(self.alphabet_sizes[1:]):
+            shifts.append(shifts[-1] * size)
+        shifts.reverse()
+        return shifts
+
     def coalesce(self, rvs, extract=False):
         """
         Returns a new sample space after coalescing the specified indexes.
@@ -462,3 +629,4 @@ class CartesianProduct(SampleSpace):
                 alphabet = tuple(sorted(alphabet))
             alphabets.append(alphabet)
         self.alphabets = tuple(alphabets)
+        self._lookups = None
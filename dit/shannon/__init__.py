@@ -3,5 +3,9 @@ The basic forms of Shannon's information measures.
 """
 
 from .shannon import (
-	entropy, conditional_entropy, mutual_information, entropy_pmf
+	entropy, conditional_entropy, mutual_information, entropy_pmf,
+	conditional_entropy_pmf, mutual_information_pmf, total_correlation_pmf,
+	dual_total_correlation_pmf,
 )
+from .entropy_table import EntropyTable, entropy_backend, shared_entropy_table
+from .pairwise import mutual_information_matrix, mi_matrix
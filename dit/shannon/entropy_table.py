@@ -0,0 +1,609 @@
+"""
+A table of the entropies of subsets of the random variables of a joint
+distribution.
+
+Multivariate measures such as the co-information, the total correlation or the
+TSE complexity are sums of entropies of many subsets of the same variables. An
+`EntropyTable` computes all of those entropies in a single sweep over the
+subset lattice, deriving each marginal from a parent marginal which is only
+one variable larger, rather than marginalizing the full distribution once per
+subset.
+
+Conditional measures are sums of entropies conditioned on the same random
+variables Z. For those, `entropy_backend` builds the joint tensor over the
+random variables involved once, with the outcomes of Z along its first axis,
+and computes each conditional entropy as the p(z) weighted average of the
+entropies of the conditional distributions given each z.
+"""
+
+from __future__ import division
+
+from timeit import default_timer
+
+import numpy as np
+
+from ..exceptions import ditException
+from ..helpers import group_codes, normalize_rvs, parse_rvs
+from .shannon import _axes_entropy, conditional_entropy
+
+__all__ = ('EntropyTable',
+           'entropy_backend',
+           'shared_entropy_table',
+          )
+
+
+class EntropyTable(object):
+    """
+    The entropies H[S] of subsets S of the random variables of a distribution.
+
+    Subsets are identified by bitmasks over the random variable indexes of the
+    distribution. The entropies of the requested family of subsets are computed
+    when the table is constructed, or by `compute`; any other subset is
+    computed, and cached, on first access.
+
+    Attributes
+    ----------
+    dist : Distribution
+        The distribution whose entropies are tabulated.
+
+    """
+
+    # Marginals are summed as dense arrays over the observed symbols when the
+    # product of the alphabet sizes is at most this large, and as sparse
+    # integer codes otherwise.
+    _dense_limit = 2**22
+
+    def __init__(self, dist, subsets=None, rv_mode=None):
+        """
+        Compute the entropies of a family of subsets of the random variables.
+
+        Parameters
+        ----------
+        dist : Distribution
+            The joint distribution.
+        subsets : list, None
+            A list of lists of random variables. Every subset of each of these
+            is computed up front, so that the family is closed downwards. If
+            None, then the entropies of all 2^n subsets are computed.
+        rv_mode : str, None
+            Specifies how to interpret the elements of `subsets`. Valid options
+            are: {'indices', 'names'}. If equal to 'indices', then the elements
+            are interpreted as random variable indices. If equal to 'names',
+            the the elements are interpreted as random variable names. If
+            `None`, then the value of `dist._rv_mode` is consulted.
+
+        Raises
+        ------
+        ditException
+            Raised if `dist` is not a joint distribution.
+
+        """
+        if not dist.is_joint():
+            msg = "The entropy table requires a joint distribution."
+            raise ditException(msg)
+
+        self.dist = dist
+        self._n = dist.outcome_length()
+        self._full = (1 << self._n) - 1
+
+        if dist.is_log():
+            self._scale = np.log2(dist.get_base(numerical=True))
+        else:
+            self._scale = 1
+
+        pmf = np.asarray(dist.pmf, dtype=float)
+        if dist.is_log():
+            pmf = dist.get_base(numerical=True)**pmf
+        codes, _ = dist._outcome_codes()
+        sizes = [int(c.max()) + 1 if len(c) else 1 for c in codes]
+
+        # The root of the sweep: all the variables, either as a dense array
+        # with one axis per variable or as a code matrix with one column each.
+        if np.prod(sizes, dtype=float) <= self._dense_limit:
+            index = np.ravel_multi_index(tuple(codes), sizes) if codes else 0
+            root = np.bincount(np.atleast_1d(index), weights=pmf,
+                               minlength=int(np.prod(sizes)))
+            self._root = (True, root.reshape(sizes))
+        else:
+            self._root = (False, (np.column_stack(codes), pmf))
+
+        self._entropies = {}
+        # The largest subsets whose every subset is known.
+        self._closed = set()
+        self._complete = False
+        self.compute(subsets, rv_mode)
+
+    def _mask(self, rvs, rv_mode=None):
+        """
+        Returns the bitmask of the random variables `rvs`.
+        """
+        indexes = parse_rvs(self.dist, list(rvs), rv_mode, unique=False)[1]
+        mask = 0
+        for i in indexes:
+            mask |= 1 << i
+        return mask
+
+    @staticmethod
+    def _drop(node, positions):
+        """
+        Sum the variables at `positions` out of a dense or sparse marginal.
+        """
+        dense, data = node
+        if dense:
+            return dense, data.sum(axis=tuple(positions))
+        codes, pmf = data
+        columns = [codes[:, i] for i in range(codes.shape[1])
+                   if i not in positions]
+        uniques, inverse = group_codes(columns, len(pmf))
+        pmf = np.bincount(inverse, weights=pmf, minlength=len(uniques))
+        return dense, (uniques, pmf)
+
+    def _marginal(self, mask):
+        """
+        Returns the marginal of the subset `mask`, from the full distribution.
+        """
+        positions = [i for i in range(self._n) if not mask & (1 << i)]
+        if not positions:
+            return self._root
+        return self._drop(self._root, positions)
+
+    def _entropy_of(self, node):
+        """
+        The entropy, in bits, of a dense or sparse marginal.
+        """
+        dense, data = node
+        pmf = data.ravel() if dense else data[1]
+        pmf = pmf[pmf > 0]
+        return -np.dot(pmf, np.log2(pmf))
+
+    def _covered(self, mask):
+        """
+        Returns whether the entropies of all subsets of `mask` are known.
+        """
+        return any(mask & ~closed == 0 for closed in self._closed)
+
+    def _sweep(self, top):
+        """
+        Visit every subset of `top` whose entropy is not yet known.
+
+        Variables are removed in increasing index order, so each subset is
+        reached exactly once: from the subset that also contains the variable
+        removed last. Subsets below a fully known set are not visited, and a
+        marginal is only derived for a subset whose entropy is unknown, by
+        summing it out of the nearest marginal derived above it.
+        """
+        # Children are derived when popped, so at most one pending parent
+        # marginal is held per level of the lattice.
+        stack = [(top, 0, self._root, tuple(range(self._n)))]
+        while stack:
+            mask, start, node, kept = stack.pop()
+            if mask not in self._entropies:
+                positions = tuple(pos for pos, i in enumerate(kept)
+                                  if not mask & (1 << i))
+                if positions:
+                    node = self._drop(node, positions)
+                    kept = tuple(i for i in kept if mask & (1 << i))
+                self._entropies[mask] = self._entropy_of(node)
+            for i in range(start, self._n):
+                if mask & (1 << i):
+                    child = mask & ~(1 << i)
+                    if not self._covered(child):
+                        stack.append((child, i + 1, node, kept))
+
+        self._closed = set(m for m in self._closed if m & ~top) | {top}
+        if top == self._full:
+            self._complete = True
+
+    def compute(self, subsets=None, rv_mode=None):
+        """
+        Compute the entropies of a family of subsets, if not already known.
+
+        Parameters
+        ----------
+        subsets : list, None
+            A list of lists of random variables. The entropies of every subset
+            of each of these are computed. If None, then the entropies of all
+            2^n subsets are computed.
+        rv_mode : str, None
+            Specifies how to interpret the elements of `subsets`. Valid options
+            are: {'indices', 'names'}. If `None`, then the value of
+            `dist._rv_mode` is consulted.
+
+        """
+        if self._complete:
+            return
+
+        if subsets is None:
+            masks = {self._full}
+        else:
+            masks = set(self._mask(subset, rv_mode) for subset in subsets)
+        for top in masks:
+            if any(top != m and top & ~m == 0 for m in masks):
+                # Its subsets are visited from a larger set.
+                continue
+            if not self._covered(top):
+                self._sweep(top)
+
+    @staticmethod
+    def _size(node):
+        """
+        The number of entries of a dense or sparse marginal.
+        """
+        dense, data = node
+        return data.size if dense else len(data[1])
+
+    def compute_subsets(self, subsets, rv_mode=None):
+        """
+        Compute the entropies of exactly `subsets`, if not already known.
+
+        The subsets are visited from largest to smallest, and each marginal is
+        summed out of the smallest marginal already computed which contains
+        it. Marginals are only held while a later subset needs them.
+
+        Parameters
+        ----------
+        subsets : list
+            A list of lists of random variables.
+        rv_mode : str, None
+            Specifies how to interpret the elements of `subsets`. Valid options
+            are: {'indices', 'names'}. If `None`, then the value of
+            `dist._rv_mode` is consulted.
+
+        Returns
+        -------
+        log : list
+            A (rvs, parent, seconds) triple for each marginal computed, in
+            order: the indexes of its random variables, those of the marginal
+            it was summed out of, and the time taken.
+
+        """
+        masks = set(self._mask(subset, rv_mode) for subset in subsets)
+        masks -= set(self._entropies)
+        if 0 in masks:
+            # The empty set needs no marginal.
+            masks.remove(0)
+            self._entropies[0] = 0.0
+        masks = sorted(masks, key=lambda mask: bin(mask).count('1'),
+                       reverse=True)
+        order = np.array(masks, dtype=np.int64)
+        indexes = lambda mask: tuple(i for i in range(self._n)
+                                     if mask & (1 << i))
+
+        # Each marginal is held until the last subset which may be summed out
+        # of it has been computed.
+        nodes = {self._full: self._root}
+        last_use = {self._full: len(masks)}
+        log = []
+        for k, mask in enumerate(masks):
+            start = default_timer()
+            parents = [m for m in nodes if mask & ~m == 0]
+            parent = min(parents, key=lambda m: self._size(nodes[m]))
+            positions = [pos for pos, i in enumerate(indexes(parent))
+                         if not mask & (1 << i)]
+            node = nodes[parent]
+            if positions:
+                node = self._drop(node, positions)
+            self._entropies[mask] = self._entropy_of(node)
+
+            later = np.flatnonzero(order[k+1:] & ~mask == 0)
+            if len(later):
+                nodes[mask] = node
+                last_use[mask] = k + 1 + later[-1]
+            for m in [m for m in nodes if last_use[m] <= k]:
+                del nodes[m]
+            log.append((indexes(mask), indexes(parent),
+                        default_timer() - start))
+
+        if len(self._entropies) == 1 << self._n:
+            self._closed = {self._full}
+            self._complete = True
+
+        return log
+
+    def _lookup(self, mask):
+        """
+        Returns the entropy, in bits, of the subset `mask`.
+        """
+        try:
+            return self._entropies[mask]
+        except KeyError:
+            pass
+
+        H = self._entropies[mask] = self._entropy_of(self._marginal(mask))
+        return H
+
+    def __len__(self):
+        """
+        The number of subsets whose entropy has been computed.
+        """
+        return len(self._entropies)
+
+    def __getitem__(self, rvs):
+        """
+        Returns the entropy of the random variables `rvs`.
+        """
+        return self.entropy(rvs)
+
+    def entropy(self, rvs=None, rv_mode=None):
+        """
+        Returns the entropy H[X] over the random variables in `rvs`.
+
+        Parameters
+        ----------
+        rvs : list, None
+            The random variables to compute the entropy of. If None, then the
+            entropy is calculated over all random variables.
+        rv_mode : str, None
+            Specifies how to interpret the elements of `rvs`. Valid options
+            are: {'indices', 'names'}. If `None`, then the value of
+            `dist._rv_mode` is consulted.
+
+        Returns
+        -------
+        H : float
+            The entropy, in bits for linear distributions and in the base of
+            the distribution otherwise.
+
+        """
+        mask = self._full if rvs is None else self._mask(rvs, rv_mode)
+        return self._lookup(mask) / self._scale
+
+    def vector(self, rvs=None, rv_mode=None):
+        """
+        Returns the entropies of all subsets of `rvs`, indexed by bitmask.
+
+        Parameters
+        ----------
+        rvs : list, None
+            The random variables. Entry S of the result is the entropy of the
+            random variables `rvs[i]` for which bit i of S is set. If None,
+            then all the random variables, in index order.
+        rv_mode : str, None
+            Specifies how to interpret the elements of `rvs`. Valid options
+            are: {'indices', 'names'}. If `None`, then the value of
+            `dist._rv_mode` is consulted.
+
+        Returns
+        -------
+        H : np.ndarray, shape (2**len(rvs),)
+            The entropy of each subset.
+
+        """
+        if rvs is None:
+            groups = [[i] for i in range(self._n)]
+            rv_mode = 'indices'
+        else:
+            groups = [[rv] for rv in rvs]
+        return self.group_vector(groups, rv_mode=rv_mode)
+
+    def group_vector(self, groups, crvs=None, rv_mode=None):
+        """
+        Returns the conditional entropies of all unions of `groups`.
+
+        Parameters
+        ----------
+        groups : list
+            A list of lists of random variables. Entry S of the result is the
+            entropy of the union of the groups `groups[i]` for which bit i of
+            S is set.
+        crvs : list, None
+            The random variables to condition on. If None, then no variables
+            are conditioned on.
+        rv_mode : str, None
+            Specifies how to interpret the elements of `groups` and `crvs`.
+            Valid options are: {'indices', 'names'}. If `None`, then the value
+            of `dist._rv_mode` is consulted.
+
+        Returns
+        -------
+        H : np.ndarray, shape (2**len(groups),)
+            The conditional entropy of each union of groups.
+
+        """
+        Z = self._mask(crvs or [], rv_mode)
+        masks = [Z]
+        for group in groups:
+            bits = self._mask(group, rv_mode)
+            masks.extend([mask | bits for mask in masks])
+        H = np.array([self._lookup(mask) for mask in masks])
+        return (H - self._lookup(Z)) / self._scale
+
+    def conditional_entropy(self, rvs_X, rvs_Y, rv_mode=None):
+        """
+        Returns the conditional entropy H[X|Y].
+
+        Parameters
+        ----------
+        rvs_X : list
+            The random variables defining X.
+        rvs_Y : list
+            The random variables defining Y.
+        rv_mode : str, None
+            Specifies how to interpret the elements of `rvs_X` and `rvs_Y`.
+            Valid options are: {'indices', 'names'}. If `None`, then the value
+            of `dist._rv_mode` is consulted.
+
+        Returns
+        -------
+        H_XgY : float
+            The conditional entropy H[X|Y].
+
+        """
+        X = self._mask(rvs_X, rv_mode)
+        Y = self._mask(rvs_Y, rv_mode)
+        if X & ~Y == 0:
+            # Exactly zero, as with `conditional_entropy`.
+            return 0.0
+        return (self._lookup(X | Y) - self._lookup(Y)) / self._scale
+
+
+class _ConditionalTensor(object):
+    """
+    The distribution of a set of random variables given the random variables
+    Z, as a dense tensor with one batch element per outcome of Z.
+    """
+
+    def __init__(self, dist, indexes, crvs):
+        """
+        Parameters
+        ----------
+        dist : Distribution
+            The joint distribution.
+        indexes : list
+            The indexes of the random variables, other than Z, with an axis.
+        crvs : list
+            The indexes of the random variables Z.
+        """
+        self.dist = dist
+        self._axes = dict((i, axis) for axis, i in enumerate(indexes))
+        self._crvs = frozenset(crvs)
+
+        pmf = np.asarray(dist.pmf, dtype=float)
+        if dist.is_log():
+            base = dist.get_base(numerical=True)
+            pmf = base**pmf
+            self._scale = np.log2(base)
+        else:
+            self._scale = 1
+
+        codes, _ = dist._outcome_codes()
+        _, z = group_codes([codes[i] for i in sorted(crvs)], len(pmf))
+        columns = [z] + [codes[i] for i in indexes]
+        sizes = [int(c.max()) + 1 if len(c) else 1 for c in columns]
+        index = np.ravel_multi_index(tuple(columns), sizes)
+        joint = np.bincount(index, weights=pmf, minlength=int(np.prod(sizes)))
+        joint = joint.reshape(sizes)
+
+        self._pz = joint.reshape(sizes[0], -1).sum(axis=1)
+        shape = (-1,) + (1,)*len(indexes)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._tensor = np.nan_to_num(joint / self._pz.reshape(shape))
+        self._cache = {}
+
+    @staticmethod
+    def size(dist, indexes, crvs):
+        """
+        The number of entries of the tensor, at most.
+        """
+        sizes = [len(alphabet) for alphabet in dist.alphabet]
+        z = np.prod([sizes[i] for i in crvs], dtype=float)
+        return min(z, len(dist.pmf)) * np.prod([sizes[i] for i in indexes],
+                                               dtype=float)
+
+    def _entropy(self, axes):
+        """
+        The entropy, in bits, of `axes` given Z.
+        """
+        try:
+            return self._cache[axes]
+        except KeyError:
+            pass
+        H_z = _axes_entropy(self._tensor, len(self._axes), axes)
+        H = self._cache[axes] = np.dot(self._pz, H_z)
+        return H
+
+    def conditional_entropy(self, dist, rvs_X, rvs_Y, rv_mode=None):
+        """
+        Returns the conditional entropy H[X|Y], where Y includes Z.
+
+        Other conditional entropies are computed from `dist` directly.
+        """
+        X = set(parse_rvs(dist, list(rvs_X), rv_mode, unique=False)[1])
+        Y = set(parse_rvs(dist, list(rvs_Y), rv_mode, unique=False)[1])
+        if X <= Y:
+            return 0.0
+        if not self._crvs <= Y or not (X | Y) - self._crvs <= set(self._axes):
+            return conditional_entropy(dist, rvs_X, rvs_Y, rv_mode=rv_mode)
+        XY = frozenset(self._axes[i] for i in (X | Y) - self._crvs)
+        Y = frozenset(self._axes[i] for i in Y - self._crvs)
+        return (self._entropy(XY) - self._entropy(Y)) / self._scale
+
+
+def shared_entropy_table(dist):
+    """
+    Returns the entropy table shared by all users of `dist`.
+
+    If sharing was enabled with `dist.enable_entropy_table()`, the table
+    starts out empty and is kept on the distribution, so entropies computed
+    for one measure or profile are reused by the next. It is replaced once
+    the outcomes or the pmf of `dist` are replaced or modified through its
+    methods, and released by `dist.disable_entropy_table()`. Otherwise, a
+    new, empty table is returned.
+
+    Parameters
+    ----------
+    dist : Distribution
+        The joint distribution.
+
+    Returns
+    -------
+    table : EntropyTable
+        The shared table of `dist`.
+
+    """
+    if not getattr(dist, '_share_entropy_table', False):
+        return EntropyTable(dist, subsets=[])
+
+    cached = dist._entropy_table
+    if cached is not None:
+        outcomes, pmf, table = cached
+        if outcomes is dist.outcomes and pmf is dist.pmf:
+            return table
+
+    table = EntropyTable(dist, subsets=[])
+    dist._entropy_table = (dist.outcomes, dist.pmf, table)
+    return table
+
+
+def entropy_backend(dist, rvs=None, crvs=None, rv_mode=None):
+    """
+    Returns the distribution and conditional entropy function to use for `dist`.
+
+    Parameters
+    ----------
+    dist : Distribution, EntropyTable
+        A distribution, or an entropy table of one.
+    rvs : list, None
+        A list of lists of the random variables the measure is computed over.
+        If None, then each random variable is used.
+    crvs : list, None
+        The random variables the measure conditions on. If None, then no
+        variables are conditioned on.
+    rv_mode : str, None
+        Specifies how to interpret `rvs` and `crvs`. Valid options are:
+        {'indices', 'names'}. If `None`, then the value of `dist._rv_mode` is
+        consulted.
+
+    Returns
+    -------
+    dist : Distribution
+        The distribution.
+    H : function
+        A function with the signature of `conditional_entropy`. If `dist` was
+        an `EntropyTable`, it looks entropies up in the table. Otherwise, if
+        `crvs` is nonempty, entropies conditioned on `crvs` are computed from
+        the distribution of `rvs` given `crvs`, which is built only once.
+
+    """
+    if isinstance(dist, EntropyTable):
+        table = dist
+        def H(dist, rvs_X, rvs_Y, rv_mode=None):
+            """
+            The conditional entropy H[X|Y], looked up in `table`.
+            """
+            return table.conditional_entropy(rvs_X, rvs_Y, rv_mode=rv_mode)
+        return table.dist, H
+
+    if not crvs or not dist.is_joint():
+        return dist, conditional_entropy
+
+    rvs, crvs, rv_mode = normalize_rvs(dist, rvs, crvs, rv_mode)
+    crvs = set(parse_rvs(dist, crvs, rv_mode, unique=False)[1])
+    indexes = set()
+    for rv in rvs:
+        indexes.update(parse_rvs(dist, rv, rv_mode, unique=False)[1])
+    indexes = sorted(indexes - crvs)
+    size = _ConditionalTensor.size(dist, indexes, crvs)
+    if size > EntropyTable._dense_limit:
+        return dist, conditional_entropy
+    return dist, _ConditionalTensor(dist, indexes, crvs).conditional_entropy
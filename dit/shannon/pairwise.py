@@ -0,0 +1,276 @@
+"""
+The mutual information between every pair of many random variables.
+
+Each random variable is reduced to a column of integer codes, one entry per
+outcome or sample, so the joint distribution is never built as a dense array.
+The entropy of every pair with a given first variable is then found with a
+single weighted `np.bincount` over all of the second variables at once, each
+offset into its own range of bins.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+from ..exceptions import ditException
+from ..helpers import group_codes, parse_rvs
+
+__all__ = ('mutual_information_matrix',
+           'mi_matrix',
+          )
+
+
+# The largest number of bins counted by one call to `np.bincount`.
+_BIN_LIMIT = 2**24
+
+
+def _entropies(bins, weights, nbins, nblocks):
+    """
+    The entropies, in bits, of `nblocks` distributions binned side by side.
+
+    Parameters
+    ----------
+    bins : np.ndarray, shape (n, nblocks)
+        The bin of each weight; column j is offset by j * nbins.
+    weights : np.ndarray, shape (n,)
+        The probability of each row.
+    nbins : int
+        The number of bins of each distribution.
+    nblocks : int
+        The number of distributions.
+
+    Returns
+    -------
+    H : np.ndarray, shape (nblocks,)
+        The entropy of each distribution.
+    """
+    weights = np.broadcast_to(weights[:, np.newaxis], bins.shape)
+    p = np.bincount(bins.ravel(), weights=weights.ravel(),
+                    minlength=nbins * nblocks).reshape(nblocks, nbins)
+    terms = np.where(p > 0, -p * np.log2(np.where(p > 0, p, 1)), 0)
+    return terms.sum(axis=1)
+
+
+def _joint_entropies(first, codes, sizes, weights):
+    """
+    The entropies, in bits, of `first` jointly with each column of `codes`.
+
+    Parameters
+    ----------
+    first : np.ndarray, shape (n,)
+        The codes of the first random variable, from 0 to first.max().
+    codes : np.ndarray, shape (n, m)
+        The codes of the second random variables.
+    sizes : np.ndarray, shape (m,)
+        The number of codes of each second random variable.
+    weights : np.ndarray, shape (n,)
+        The probability of each row.
+
+    Returns
+    -------
+    H : np.ndarray, shape (m,)
+        The joint entropy of `first` with each column of `codes`.
+    """
+    n, m = codes.shape
+    H = np.empty(m)
+    if m == 0:
+        return H
+    width = int(sizes.max())
+    nbins = (int(first.max()) + 1) * width
+    if nbins > _BIN_LIMIT:
+        # Too many bins for even one column: group the observed pairs.
+        for j in range(m):
+            _, inverse = group_codes([first, codes[:, j]], n)
+            H[j] = _entropies(inverse[:, np.newaxis], weights,
+                              inverse.max() + 1, 1)[0]
+        return H
+
+    base = first * width
+    step = max(1, min(_BIN_LIMIT // nbins, _BIN_LIMIT // max(n, 1)))
+    for start in range(0, m, step):
+        block = codes[:, start:start + step]
+        offsets = np.arange(block.shape[1]) * nbins
+        bins = base[:, np.newaxis] + block + offsets
+        H[start:start + step] = _entropies(bins, weights, nbins,
+                                           block.shape[1])
+    return H
+
+
+def _rows(args):
+    """
+    The conditional mutual informations of a block of rows of the matrix.
+
+    Parameters
+    ----------
+    args : tuple
+        (rows, codes, sizes, z, weights, H_z, H_iz): the rows to compute, the
+        code matrix of the random variables, their numbers of codes, the codes
+        of the conditioning variables, the probability of each row, H[Z], and
+        H[X_i, Z] for each i.
+
+    Returns
+    -------
+    values : list of np.ndarray
+        For each row i, I[X_i : X_j | Z] for each j > i.
+    """
+    rows, codes, sizes, z, weights, H_z, H_iz = args
+    values = []
+    for i in rows:
+        first = z * sizes[i] + codes[:, i]
+        H_ijz = _joint_entropies(first, codes[:, i+1:], sizes[i+1:], weights)
+        values.append(H_iz[i] + H_iz[i+1:] - H_ijz - H_z)
+    return values
+
+
+def _codes(dist, rvs, crvs, rv_mode):
+    """
+    Reduce a distribution or data matrix to columns of integer codes.
+
+    Returns
+    -------
+    codes : np.ndarray, shape (n, len(rvs))
+        The codes of each random variable in `rvs`.
+    z : np.ndarray, shape (n,)
+        The codes of the outcomes of `crvs`.
+    weights : np.ndarray, shape (n,)
+        The probability of each row.
+    scale : float
+        The number of bits in one unit of the result.
+    """
+    if hasattr(dist, 'is_joint'):
+        if not dist.is_joint():
+            msg = "The mutual information matrix requires a joint distribution."
+            raise ditException(msg)
+        columns, _ = dist._outcome_codes()
+        weights = np.asarray(dist.pmf, dtype=float)
+        if dist.is_log():
+            base = dist.get_base(numerical=True)
+            weights = base**weights
+            scale = np.log2(base)
+        else:
+            scale = 1
+        if rvs is None:
+            rvs = list(range(len(columns)))
+        else:
+            rvs = parse_rvs(dist, rvs, rv_mode, unique=False)[1]
+        crvs = parse_rvs(dist, crvs or [], rv_mode, unique=False)[1]
+    else:
+        data = np.asarray(dist)
+        if data.ndim != 2:
+            msg = "Data must be a 2D array with one column per variable."
+            raise ditException(msg)
+        columns = [np.unique(column, return_inverse=True)[1].ravel()
+                   for column in data.T]
+        weights = np.ones(len(data)) / len(data)
+        scale = 1
+        if rvs is None:
+            rvs = list(range(data.shape[1]))
+        crvs = list(crvs or [])
+        for i in list(rvs) + crvs:
+            if not 0 <= i < data.shape[1]:
+                msg = "Column {0} is not one of the {1} columns of the data."
+                raise ditException(msg.format(i, data.shape[1]))
+
+    n = len(weights)
+    codes = np.column_stack([columns[i] for i in rvs] or [np.zeros(n, int)])
+    codes = codes[:, :len(rvs)].astype(np.int64)
+    z = group_codes([columns[i] for i in crvs], n)[1].astype(np.int64)
+    return codes, z, weights, scale
+
+
+def mutual_information_matrix(dist, rvs=None, crvs=None, rv_mode=None,
+                              processes=None):
+    """
+    Returns the (conditional) mutual information between every pair of `rvs`.
+
+    Parameters
+    ----------
+    dist : Distribution, np.ndarray
+        The joint distribution, or a data matrix of samples with one row per
+        sample and one column per random variable, whose plug-in estimate is
+        used.
+    rvs : list, None
+        The random variables X_i. If None, then every random variable, or
+        every column of the data.
+    crvs : list, None
+        The random variables Z to condition on. If None, then no variables
+        are conditioned on.
+    rv_mode : str, None
+        Specifies how to interpret `rvs` and `crvs` for a distribution. Valid
+        options are: {'indices', 'names'}. If equal to 'indices', then the
+        elements of `crvs` and `rvs` are interpreted as random variable
+        indices. If equal to 'names', the the elements are interpreted as
+        random variable names. If `None`, then the value of `dist._rv_mode`
+        is consulted, which defaults to 'indices'. Data columns are always
+        given by index.
+    processes : int, None
+        If given, the rows of the matrix are split between this many worker
+        processes.
+
+    Returns
+    -------
+    I : np.ndarray, shape (len(rvs), len(rvs))
+        The symmetric matrix of I[X_i : X_j | Z], whose diagonal holds the
+        entropies H[X_i | Z]. It is in bits for linear distributions and data,
+        and in the base of the distribution otherwise.
+
+    Raises
+    ------
+    ditException
+        Raised if `dist` is not a joint distribution or a 2D data matrix, or
+        if `rvs` or `crvs` contain non-existant random variables.
+
+    Examples
+    --------
+    >>> d = dit.example_dists.Xor()
+    >>> dit.shannon.mutual_information_matrix(d)
+    array([[1., 0., 0.],
+           [0., 1., 0.],
+           [0., 0., 1.]])
+    >>> dit.shannon.mutual_information_matrix(d, [0, 1], [2])
+    array([[1., 1.],
+           [1., 1.]])
+
+    Notes
+    -----
+    The entropies of all pairs (X_i, X_j) with j > i are found with a single
+    weighted bincount per row i, so the cost is that of len(rvs)**2 / 2
+    passes over the outcomes, or samples.
+    """
+    codes, z, weights, scale = _codes(dist, rvs, crvs, rv_mode)
+    n, m = codes.shape
+    sizes = codes.max(axis=0) + 1 if n else np.ones(m, dtype=np.int64)
+    kz = int(z.max()) + 1 if n else 1
+
+    H_z = _entropies(z[:, np.newaxis], weights, kz, 1)[0]
+    H_iz = _joint_entropies(z, codes, sizes, weights)
+
+    rows = np.arange(m - 1)
+    if processes is None:
+        values = _rows((rows, codes, sizes, z, weights, H_z, H_iz))
+    else:
+        from multiprocessing import Pool
+
+        blocks = [rows[k::processes] for k in range(processes)]
+        tasks = [(block, codes, sizes, z, weights, H_z, H_iz)
+                 for block in blocks if len(block)]
+        pool = Pool(processes)
+        try:
+            results = pool.map(_rows, tasks)
+        finally:
+            pool.close()
+            pool.join()
+        values = [None] * (m - 1)
+        for task, result in zip(tasks, results):
+            for i, value in zip(task[0], result):
+                values[i] = value
+
+    I = np.zeros((m, m))
+    I[np.diag_indices(m)] = H_iz - H_z
+    for i, value in enumerate(values):
+        I[i, i+1:] = value
+        I[i+1:, i] = value
+    return I / scale
+
+
+mi_matrix = mutual_information_matrix
@@ -3,7 +3,8 @@ Some basic Shannon information quantities.
 
 """
 
-from ..math import LogOperations
+from ..exceptions import ditException
+from ..math import LogOperations, get_ops
 from ..helpers import RV_MODES
 
 import numpy as np
@@ -163,3 +164,240 @@ def mutual_information(dist, rvs_X, rvs_Y, rv_mode=None):
     H_XY = entropy(dist, set(rvs_X) | set(rvs_Y), rv_mode=rv_mode)
     I = H_X + H_Y - H_XY
     return I
+
+
+def _prepare_pmf(pmf, ndim, base):
+    """
+    Normalize a joint pmf whose trailing `ndim` axes are random variables.
+
+    Parameters
+    ----------
+    pmf : array-like, shape (..., k_1, ..., k_ndim)
+        The joint pmf, or counts, with leading batch axes.
+    ndim : int, None
+        The number of random variable axes. If None, every axis is one.
+    base : 'linear', 'e', or float
+        The base of `pmf`.
+
+    Returns
+    -------
+    pmf : NumPy array
+        The linear probabilities, normalized over the random variable axes.
+    ndim : int
+        The number of random variable axes.
+    scale : float
+        The number of bits in one unit of the base of `pmf`.
+
+    """
+    pmf = np.asarray(pmf, dtype=float)
+    if ndim is None:
+        ndim = pmf.ndim
+    elif not 0 <= ndim <= pmf.ndim:
+        msg = "`ndim` must be between 0 and {0}, not {1}."
+        raise ditException(msg.format(pmf.ndim, ndim))
+
+    ops = get_ops(base)
+    if ops.get_base() == 'linear':
+        scale = 1
+    else:
+        b = ops.get_base(numerical=True)
+        pmf = b**pmf
+        scale = np.log2(b)
+
+    total = pmf.sum(axis=tuple(range(pmf.ndim - ndim, pmf.ndim)), keepdims=True)
+    return pmf / total, ndim, scale
+
+
+def _axes_entropy(pmf, ndim, axes):
+    """
+    Returns the entropy, in bits, of the random variable axes `axes`.
+
+    Parameters
+    ----------
+    pmf : NumPy array, shape (..., k_1, ..., k_ndim)
+        The normalized joint pmf.
+    ndim : int
+        The number of random variable axes.
+    axes : iterable
+        The random variable axes, from 0 to ndim - 1, to keep.
+
+    Returns
+    -------
+    H : NumPy array, shape (...)
+        The entropy of the marginal over `axes`, for each batch element.
+
+    """
+    axes = set(axes)
+    for axis in axes:
+        if not 0 <= axis < ndim:
+            msg = "Axis {0} is not one of the {1} random variable axes."
+            raise ditException(msg.format(axis, ndim))
+
+    offset = pmf.ndim - ndim
+    drop = tuple(offset + i for i in range(ndim) if i not in axes)
+    p = pmf.sum(axis=drop) if drop else pmf
+    terms = np.where(p > 0, -p * np.log2(np.where(p > 0, p, 1)), 0)
+    return terms.sum(axis=tuple(range(offset, p.ndim)))
+
+
+def _groups(rvs, ndim):
+    """
+    Returns the random variable groups, defaulting to one per axis.
+    """
+    if rvs is None:
+        return [[i] for i in range(ndim)]
+    return [list(rv) for rv in rvs]
+
+
+def conditional_entropy_pmf(pmf, rvs_X, rvs_Y, ndim=None, base='linear'):
+    """
+    Returns the conditional entropy H[X|Y] of a joint pmf.
+
+    Parameters
+    ----------
+    pmf : array-like, shape (..., k_1, ..., k_ndim)
+        The joint pmf, with one axis per random variable, preceded by any
+        number of batch axes. Linear pmfs need not be normalized, so counts
+        may be passed directly.
+    rvs_X : list
+        The random variable axes defining X, from 0 to ndim - 1.
+    rvs_Y : list
+        The random variable axes defining Y, from 0 to ndim - 1.
+    ndim : int, None
+        The number of trailing axes of `pmf` that are random variables. If
+        None, then every axis is a random variable.
+    base : 'linear', 'e', or float
+        The base of `pmf`. The result is in bits for linear pmfs, and in the
+        units of `base` otherwise.
+
+    Returns
+    -------
+    H_XgY : float or NumPy array, shape (...)
+        The conditional entropy H[X|Y], for each batch element.
+
+    """
+    pmf, ndim, scale = _prepare_pmf(pmf, ndim, base)
+    H_XY = _axes_entropy(pmf, ndim, set(rvs_X) | set(rvs_Y))
+    H_Y = _axes_entropy(pmf, ndim, rvs_Y)
+    return (H_XY - H_Y) / scale
+
+
+def mutual_information_pmf(pmf, rvs_X, rvs_Y, crvs=None, ndim=None,
+                           base='linear'):
+    """
+    Returns the (conditional) mutual information I[X:Y|Z] of a joint pmf.
+
+    Parameters
+    ----------
+    pmf : array-like, shape (..., k_1, ..., k_ndim)
+        The joint pmf, with one axis per random variable, preceded by any
+        number of batch axes. Linear pmfs need not be normalized, so counts
+        may be passed directly.
+    rvs_X : list
+        The random variable axes defining X, from 0 to ndim - 1.
+    rvs_Y : list
+        The random variable axes defining Y, from 0 to ndim - 1.
+    crvs : list, None
+        The random variable axes defining Z. If None, then no variables are
+        conditioned on.
+    ndim : int, None
+        The number of trailing axes of `pmf` that are random variables. If
+        None, then every axis is a random variable.
+    base : 'linear', 'e', or float
+        The base of `pmf`. The result is in bits for linear pmfs, and in the
+        units of `base` otherwise.
+
+    Returns
+    -------
+    I : float or NumPy array, shape (...)
+        The mutual information I[X:Y|Z], for each batch element.
+
+    """
+    pmf, ndim, scale = _prepare_pmf(pmf, ndim, base)
+    Z = set(crvs or [])
+    H_XZ = _axes_entropy(pmf, ndim, Z | set(rvs_X))
+    H_YZ = _axes_entropy(pmf, ndim, Z | set(rvs_Y))
+    H_XYZ = _axes_entropy(pmf, ndim, Z | set(rvs_X) | set(rvs_Y))
+    H_Z = _axes_entropy(pmf, ndim, Z)
+    return (H_XZ + H_YZ - H_XYZ - H_Z) / scale
+
+
+def total_correlation_pmf(pmf, rvs=None, crvs=None, ndim=None, base='linear'):
+    """
+    Returns the (conditional) total correlation of a joint pmf.
+
+    Parameters
+    ----------
+    pmf : array-like, shape (..., k_1, ..., k_ndim)
+        The joint pmf, with one axis per random variable, preceded by any
+        number of batch axes. Linear pmfs need not be normalized, so counts
+        may be passed directly.
+    rvs : list, None
+        A list of lists of random variable axes, one list per group. If None,
+        then each random variable axis is its own group.
+    crvs : list, None
+        The random variable axes to condition on. If None, then no variables
+        are conditioned on.
+    ndim : int, None
+        The number of trailing axes of `pmf` that are random variables. If
+        None, then every axis is a random variable.
+    base : 'linear', 'e', or float
+        The base of `pmf`. The result is in bits for linear pmfs, and in the
+        units of `base` otherwise.
+
+    Returns
+    -------
+    T : float or NumPy array, shape (...)
+        The total correlation, for each batch element.
+
+    """
+    pmf, ndim, scale = _prepare_pmf(pmf, ndim, base)
+    rvs = _groups(rvs, ndim)
+    Z = set(crvs or [])
+    H_Z = _axes_entropy(pmf, ndim, Z)
+    parts = sum(_axes_entropy(pmf, ndim, Z | set(rv)) - H_Z for rv in rvs)
+    joint = _axes_entropy(pmf, ndim, Z.union(*rvs)) - H_Z
+    return (parts - joint) / scale
+
+
+def dual_total_correlation_pmf(pmf, rvs=None, crvs=None, ndim=None,
+                               base='linear'):
+    """
+    Returns the (conditional) dual total correlation of a joint pmf.
+
+    Parameters
+    ----------
+    pmf : array-like, shape (..., k_1, ..., k_ndim)
+        The joint pmf, with one axis per random variable, preceded by any
+        number of batch axes. Linear pmfs need not be normalized, so counts
+        may be passed directly.
+    rvs : list, None
+        A list of lists of random variable axes, one list per group. If None,
+        then each random variable axis is its own group.
+    crvs : list, None
+        The random variable axes to condition on. If None, then no variables
+        are conditioned on.
+    ndim : int, None
+        The number of trailing axes of `pmf` that are random variables. If
+        None, then every axis is a random variable.
+    base : 'linear', 'e', or float
+        The base of `pmf`. The result is in bits for linear pmfs, and in the
+        units of `base` otherwise.
+
+    Returns
+    -------
+    B : float or NumPy array, shape (...)
+        The dual total correlation, for each batch element.
+
+    """
+    pmf, ndim, scale = _prepare_pmf(pmf, ndim, base)
+    rvs = _groups(rvs, ndim)
+    Z = set(crvs or [])
+    everything = Z.union(*rvs)
+    H_all = _axes_entropy(pmf, ndim, everything)
+    joint = H_all - _axes_entropy(pmf, ndim, Z)
+    residual = 0
+    for i, rv in enumerate(rvs):
+        others = Z.union(*(rvs[:i] + rvs[i+1:]))
+        residual = residual + H_all - _axes_entropy(pmf, ndim, others)
+    return (joint - residual) / scale
@@ -0,0 +1,202 @@
+"""
+Tests for dit.shannon.entropy_table.
+"""
+
+from __future__ import division
+
+import pytest
+
+import numpy as np
+
+from itertools import combinations
+
+from dit import Distribution as D, ScalarDistribution as SD
+from dit.example_dists import Xor, n_mod_m
+from dit.exceptions import ditException
+from dit.multivariate import (caekl_mutual_information,
+                              coinformation,
+                              dual_total_correlation,
+                              residual_entropy,
+                              total_correlation,
+                              tse_complexity)
+from dit.profiles import ShannonPartition
+from dit.shannon import (EntropyTable, conditional_entropy, entropy,
+                         entropy_backend, shared_entropy_table)
+
+
+def _dist():
+    outcomes = ['0000', '0011', '0101', '0110', '1001', '1010', '1100', '1111',
+                '1110']
+    pmf = [1/10]*8 + [1/5]
+    return D(outcomes, pmf)
+
+
+def test_all_subsets():
+    """ Test that every subset is tabulated and correct """
+    d = _dist()
+    table = EntropyTable(d)
+    assert len(table) == 2**4
+    for k in range(5):
+        for rvs in combinations(range(4), k):
+            assert table[rvs] == pytest.approx(entropy(d, rvs))
+    assert table.entropy() == pytest.approx(entropy(d))
+
+
+def test_sparse(monkeypatch):
+    """ Test the code based marginals """
+    d = _dist()
+    table = EntropyTable(d)
+    monkeypatch.setattr(EntropyTable, '_dense_limit', 1)
+    sparse = EntropyTable(d)
+    assert not sparse._root[0]
+    for k in range(5):
+        for rvs in combinations(range(4), k):
+            assert sparse[rvs] == pytest.approx(table[rvs])
+
+
+def test_family():
+    """ Test that only the down-closure of the requested subsets is computed """
+    d = _dist()
+    table = EntropyTable(d, subsets=[[0, 1], [1, 2]])
+    assert len(table) == 6
+    assert table[[1, 2]] == pytest.approx(entropy(d, [1, 2]))
+    assert table[[0, 2, 3]] == pytest.approx(entropy(d, [0, 2, 3]))
+    assert len(table) == 7
+
+
+def test_compute():
+    """ Test filling in a table after construction """
+    d = _dist()
+    table = EntropyTable(d, subsets=[])
+    assert len(table) == 0
+    table.compute([[0, 1, 2]])
+    assert len(table) == 8
+    table.compute()
+    assert len(table) == 16
+
+
+def test_compute_reuse():
+    """ Test that repeated calls to compute leave known subsets alone """
+    d = _dist()
+    table = EntropyTable(d, subsets=[])
+    table.compute([[0, 1, 2]])
+    table.compute([[0, 1], [1, 2]])
+    assert len(table) == 8
+    assert table.compute_subsets([[0, 1], [1, 2], [0, 2]]) == []
+    table.compute()
+    table.compute([[0, 3], [1, 2, 3]])
+    assert len(table) == 16
+    subsets = [rvs for k in range(5) for rvs in combinations(range(4), k)]
+    assert table.compute_subsets(subsets) == []
+
+
+def test_shared():
+    """ Test that the shared table is reused until the pmf changes """
+    d = _dist()
+    assert shared_entropy_table(d) is not shared_entropy_table(d)
+    d.enable_entropy_table()
+    table = shared_entropy_table(d)
+    assert shared_entropy_table(d) is table
+    outcome = d.outcomes[0]
+    d[outcome] = 0
+    d.normalize()
+    table2 = shared_entropy_table(d)
+    assert table2 is not table
+    assert table2[[0]] == pytest.approx(entropy(d, [0]))
+    d.disable_entropy_table()
+    assert d._entropy_table is None
+    assert shared_entropy_table(d) is not table2
+
+
+def test_shared_reuse():
+    """ Test that a second measure reuses the shared table """
+    d = _dist()
+    d.enable_entropy_table()
+    tse = tse_complexity(d)
+    table = shared_entropy_table(d)
+    assert len(table) == 2**4
+    caekl = caekl_mutual_information(d)
+    assert shared_entropy_table(d) is table
+    assert len(table) == 2**4
+    d.disable_entropy_table()
+    assert tse == pytest.approx(tse_complexity(d))
+    assert caekl == pytest.approx(caekl_mutual_information(d))
+
+
+def test_names_and_base():
+    """ Test random variable names and log distributions """
+    d = Xor()
+    d.set_rv_names('XYZ')
+    d.set_base(3)
+    table = EntropyTable(d)
+    assert table['XY'] == pytest.approx(entropy(d, 'XY'))
+    assert table.conditional_entropy('Z', 'XY') == 0.0
+    H = conditional_entropy(d, 'X', 'Z')
+    assert table.conditional_entropy('X', 'Z') == pytest.approx(H)
+
+
+def test_scalar():
+    """ Test that scalar distributions are rejected """
+    with pytest.raises(ditException):
+        EntropyTable(SD([.5, .5]))
+
+
+@pytest.mark.parametrize('measure', [
+    coinformation,
+    total_correlation,
+    dual_total_correlation,
+    residual_entropy,
+    tse_complexity,
+    caekl_mutual_information,
+])
+def test_measures(measure):
+    """ Test that measures give the same values from a table """
+    d = n_mod_m(4, 2)
+    table = EntropyTable(d)
+    assert measure(table) == pytest.approx(measure(d))
+    value = measure(d, [[0], [1]], [2])
+    assert measure(table, [[0], [1]], [2]) == pytest.approx(value)
+
+
+def test_shannon_partition():
+    """ Test that the I-diagram can be built from a table """
+    d = _dist()
+    sp1 = ShannonPartition(d)
+    sp2 = ShannonPartition(EntropyTable(d))
+    for atom, value in sp1.atoms.items():
+        assert sp2.atoms[atom] == pytest.approx(value)
+
+
+@pytest.mark.parametrize('measure', [
+    coinformation,
+    total_correlation,
+    dual_total_correlation,
+    residual_entropy,
+])
+def test_conditional_tensor(measure):
+    """ Test conditional measures computed from the conditional tensor """
+    d = _dist()
+    d.set_rv_names('WXYZ')
+    H = lambda d, X, Y, rv_mode=None: conditional_entropy(d, X, Y, rv_mode)
+    _, H_tensor = entropy_backend(d, ['W', 'X'], 'YZ')
+    assert H_tensor is not conditional_entropy
+    for X, Y in [('W', 'YZ'), ('WX', 'YZ'), ('W', 'XYZ'), ('W', 'X')]:
+        assert H_tensor(d, X, Y) == pytest.approx(H(d, X, Y))
+    assert H_tensor(d, 'Y', 'YZ') == 0.0
+
+    value = measure(d, ['W', 'X'], 'YZ')
+    assert value == pytest.approx(measure(EntropyTable(d), ['W', 'X'], 'YZ'))
+    d.set_base(3)
+    assert measure(d, ['W', 'X'], 'YZ') == pytest.approx(value / np.log2(3))
+
+
+def test_compute_subsets():
+    """ Test computing exactly a family of subsets """
+    d = _dist()
+    table = EntropyTable(d, subsets=[])
+    log = table.compute_subsets([[0, 1, 2], [0, 1], [2], []])
+    assert len(table) == 4
+    assert [(rvs, parent) for rvs, parent, _ in log] == [
+        ((0, 1, 2), (0, 1, 2, 3)), ((0, 1), (0, 1, 2)), ((2,), (0, 1, 2))]
+    assert table[[2]] == pytest.approx(entropy(d, [2]))
+    assert table.compute_subsets([[0, 1]]) == []
@@ -0,0 +1,62 @@
+"""
+Tests for dit.shannon.pairwise.
+"""
+
+from __future__ import division
+
+import pytest
+
+import numpy as np
+
+from dit import Distribution as D, ScalarDistribution as SD, random_distribution
+from dit.example_dists import Xor
+from dit.exceptions import ditException
+from dit.multivariate import coinformation, entropy
+from dit.shannon import mi_matrix, mutual_information_matrix
+
+
+def test_mi_matrix1():
+    """ Test against the mutual information of each pair """
+    d = random_distribution(4, 3, prng=np.random.RandomState(0))
+    d.set_rv_names('WXYZ')
+    I = mutual_information_matrix(d, 'WXY', 'Z')
+    for i, X in enumerate('WXY'):
+        assert I[i, i] == pytest.approx(entropy(d, X, 'Z'))
+        for j, Y in enumerate('WXY'):
+            if i != j:
+                assert I[i, j] == pytest.approx(coinformation(d, [X, Y], 'Z'))
+
+
+def test_mi_matrix2():
+    """ Test a known value """
+    d = Xor()
+    assert np.allclose(mi_matrix(d), np.eye(3))
+    assert np.allclose(mi_matrix(d, [0, 1], [2]), 1)
+    d.set_base(3)
+    assert np.allclose(mi_matrix(d), np.eye(3) * np.log(2) / np.log(3))
+
+
+def test_mi_matrix3():
+    """ Test data matrices """
+    data = np.array([[0, 5, 1], [1, 7, 1], [1, 7, 0], [0, 5, 0]])
+    I = mi_matrix(data)
+    d = D(['001', '111', '110', '000'], [1/4]*4)
+    assert np.allclose(I, mi_matrix(d))
+    assert I[0, 1] == pytest.approx(1)
+    assert I[0, 2] == pytest.approx(0)
+
+
+def test_mi_matrix4():
+    """ Test that worker processes give the same matrix """
+    data = np.random.RandomState(0).randint(0, 3, size=(100, 6))
+    assert np.allclose(mi_matrix(data, processes=2), mi_matrix(data))
+
+
+def test_mi_matrix5():
+    """ Test invalid input """
+    with pytest.raises(ditException):
+        mi_matrix(SD([1/2, 1/2]))
+    with pytest.raises(ditException):
+        mi_matrix(np.zeros(4))
+    with pytest.raises(ditException):
+        mi_matrix(np.zeros((4, 2)), [0, 2])
@@ -9,10 +9,16 @@ import pytest
 import numpy as np
 
 from dit import Distribution as D, ScalarDistribution as SD
+from dit.exceptions import ditException
+from dit.multivariate import dual_total_correlation, total_correlation
 from dit.shannon import (entropy as H,
                          mutual_information as I,
                          conditional_entropy as CH,
-                         entropy_pmf)
+                         entropy_pmf,
+                         conditional_entropy_pmf,
+                         mutual_information_pmf,
+                         total_correlation_pmf,
+                         dual_total_correlation_pmf)
 
 
 def test_entropy_pmf1d():
@@ -89,3 +95,59 @@ def test_CH1():
     assert CH(d, [0], [1, 2]) == pytest.approx(0.0)
     assert CH(d, [0, 1], [2]) == pytest.approx(1.0)
     assert CH(d, [0], [0]) == pytest.approx(0.0)
+
+
+def _pmf_dist(pmf):
+    """ Build a distribution over the axes of a linear pmf """
+    outcomes = list(np.ndindex(*pmf.shape))
+    return D(outcomes, pmf.ravel())
+
+
+def test_pmf_kernels():
+    """ Test the pmf kernels against the distribution measures """
+    pmf = np.random.RandomState(0).dirichlet(np.ones(24)).reshape(2, 3, 4)
+    d = _pmf_dist(pmf)
+    ce = CH(d, [0], [1, 2])
+    assert conditional_entropy_pmf(pmf, [0], [1, 2]) == pytest.approx(ce)
+    mi = I(d, [0], [2])
+    assert mutual_information_pmf(pmf, [0], [2]) == pytest.approx(mi)
+    cmi = H(d, [0, 1]) + H(d, [1, 2]) - H(d) - H(d, [1])
+    assert mutual_information_pmf(pmf, [0], [2], [1]) == pytest.approx(cmi)
+    tc = total_correlation(d, [[0], [2]], [1])
+    assert total_correlation_pmf(pmf) == pytest.approx(total_correlation(d))
+    assert total_correlation_pmf(pmf, [[0], [2]], [1]) == pytest.approx(tc)
+    dtc = dual_total_correlation(d)
+    assert dual_total_correlation_pmf(pmf) == pytest.approx(dtc)
+
+
+def test_pmf_kernels_batch():
+    """ Test broadcasting over batch axes, with counts """
+    counts = np.random.RandomState(1).randint(0, 10, size=(5, 2, 3, 3))
+    tc = total_correlation_pmf(counts, ndim=2)
+    assert tc.shape == (5, 2)
+    for idx in np.ndindex(5, 2):
+        d = _pmf_dist(counts[idx] / counts[idx].sum())
+        assert tc[idx] == pytest.approx(total_correlation(d))
+    mi = mutual_information_pmf(counts, [0], [1], ndim=4)
+    assert mi.shape == ()
+
+
+def test_pmf_kernels_log():
+    """ Test log pmfs """
+    pmf = np.array([[1/2, 0], [1/4, 1/4]])
+    H_XgY = conditional_entropy_pmf(pmf, [0], [1])
+    I_XY = mutual_information_pmf(pmf, [0], [1])
+    with np.errstate(divide='ignore'):
+        H_e = conditional_entropy_pmf(np.log(pmf), [0], [1], base='e')
+        I_2 = mutual_information_pmf(np.log2(pmf), [0], [1], base=2)
+    assert H_e == pytest.approx(H_XgY*np.log(2))
+    assert I_2 == pytest.approx(I_XY)
+
+
+def test_pmf_kernels_bad_axes():
+    """ Test axes outside the random variables """
+    pmf = np.ones((2, 2, 2))
+    with pytest.raises(ditException):
+        conditional_entropy_pmf(pmf, [2], [0], ndim=2)
+    with pytest.raises(ditException):
+        total_correlation_pmf(pmf, ndim=4)
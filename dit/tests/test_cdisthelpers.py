@@ -55,3 +55,17 @@ def test_bad_marginal():
     pY = dit.Distribution(['0', '1', '2'], [.25, 0, .75])
     pY.make_dense()
     pYXZ = dit.joint_from_factors(pY, pXZgY, strict=False)
+
+
+def test_joint_from_edited_factors():
+    d = dit.Distribution(['00', '01', '10', '11'], [0.25] * 4)
+    pX, pYgX = d.condition_on([0])
+    assert isinstance(pYgX, list)
+    pYgX[0]['0'] = 1.0
+    pYgX[0]['1'] = 0.0
+    pXY = dit.joint_from_factors(pX, pYgX)
+    assert np.allclose([pXY[o] for o in ['00', '01', '10', '11']],
+                       [0.5, 0.0, 0.25, 0.25])
+
+    pX, pYgX = d.condition_on([0], lazy=True)
+    assert dit.joint_from_factors(pX, pYgX).is_approx_equal(d)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for dit.compact.
+"""
+
+import pytest
+
+import numpy as np
+
+from dit.compact import CompactIndex, CompactOutcomes
+
+
+def test_outcomes():
+    outcomes = CompactOutcomes([[0, 1, 1], [1, 0, 1]], ['01', 'ab'], str)
+    assert outcomes.codes[0].dtype == np.uint8
+    assert len(outcomes) == 3
+    assert outcomes[1] == '1a'
+    assert list(outcomes) == ['0b', '1a', '1b']
+    assert outcomes[1:] == ('1a', '1b')
+    assert outcomes.index('1b') == 2
+    assert '0a' not in outcomes
+    with pytest.raises(ValueError):
+        outcomes.index('0a')
+
+
+def test_from_product():
+    outcomes = CompactOutcomes.from_product([(0, 1), (0, 1, 2)], tuple)
+    assert list(outcomes) == [(i, j) for i in range(2) for j in range(3)]
+    assert np.array_equal(outcomes.ravel(), np.arange(6))
+
+
+def test_index():
+    outcomes = CompactOutcomes([[1, 0, 1], [1, 1, 0]], ['01', '01'], str)
+    index = CompactIndex(outcomes)
+    assert index['11'] == 0
+    assert index['01'] == 1
+    assert index['10'] == 2
+    assert index.get('00') is None
+    assert index.get('0') is None
+    assert index.get(0) is None
+    assert len(index) == 3
+
+
+def test_hash_and_cached_index():
+    outcomes = CompactOutcomes([[0, 1, 1], [1, 0, 1]], ['01', 'ab'], str)
+    assert hash(outcomes) == hash(('0b', '1a', '1b'))
+    assert {outcomes: 1}[('0b', '1a', '1b')] == 1
+    assert '1a' in outcomes
+    index = outcomes._get_index()
+    assert outcomes.index('1b') == 2
+    assert outcomes._get_index() is index
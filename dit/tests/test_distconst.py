@@ -319,6 +319,44 @@ def test_rvfunctions_toolarge():
         rvf.from_partition(partition)
 
 
+def test_rvfunctions_from_codes():
+    outcomes = [''.join(o) for o in itertools.product('abc', repeat=2)]
+    d = dit.Distribution(outcomes, [1/9]*9)
+    rvf = dit.RVFunctions(d)
+    func = rvf.from_codes(lambda codes: (codes[0] + codes[1]) % 3, 'xyz')
+    assert func('bc') == 'x'
+    d2 = dit.insert_rvf(d, func, index=0)
+    assert d2.outcomes[:4] == ('xaa', 'xbc', 'xcb', 'yab')
+    assert d2.alphabet == (('x', 'y', 'z'), ('a', 'b', 'c'), ('a', 'b', 'c'))
+
+
+def test_rvfunctions_from_table():
+    d = dit.Distribution([(0, 0), (0, 1), (1, 1)], [1/3]*3)
+    rvf = dit.RVFunctions(d)
+    func = rvf.from_table([[2, 0], [1, 1]], ['p', 'q', 'r'])
+    d2 = dit.insert_rvf(d, func)
+    assert d2.outcomes == ((0, 0, 'r'), (0, 1, 'p'), (1, 1, 'q'))
+    assert func((1, 0)) == ('q',)
+
+
+def test_rvfunctions_mapping_missing():
+    d = dit.Distribution(['00', '11'], [1/2, 1/2])
+    rvf = dit.RVFunctions(d)
+    func = rvf.from_mapping({'00': '0'})
+    with pytest.raises(KeyError):
+        dit.insert_rvf(d, func)
+
+
+def test_rvfunctions_compact():
+    d = dit.uniform_distribution(3, 2)
+    d.make_compact()
+    rvf = dit.RVFunctions(d)
+    d2 = dit.insert_rvf(d, [rvf.xor([0, 1]), rvf.from_hexes('0')])
+    assert d2.is_compact()
+    assert d2.outcomes[1] == (0, 0, 1, 0, 0)
+    assert d2[(0, 0, 0, 0, 1)] == pytest.approx(1/8)
+
+
 def test_insert_rvf1():
     # Test multiple insertion.
     d = dit.uniform_distribution(2, 2)
@@ -424,6 +462,40 @@ def test_product_with_rvs2():
     assert d_truth.is_approx_equal(d_iid)
 
 
+def test_product_with_rvs3():
+    """
+    Test product_distribution() keeps the order of the rvs specification.
+
+    """
+    d = dit.Distribution(['00', '11', '12'], [1/2, 1/4, 1/4])
+    d_iid = dit.product_distribution(d, [[1], [0]])
+    assert d_iid.outcomes == ('00', '01', '10', '11', '20', '21')
+    assert d_iid['10'] == pytest.approx(1/8)
+
+
+def test_product_wide_sparse():
+    """
+    Test product_distribution() does not densify a wide, sparse distribution.
+
+    """
+    d = dit.Distribution(['0'*32, '1'*32], [1/2, 1/2])
+    d_iid = dit.product_distribution(d, [range(16), range(16, 32)])
+    assert len(d_iid) == 4
+    assert d_iid['0'*16 + '1'*16] == pytest.approx(1/4)
+
+
+def test_product_log():
+    """
+    Test product_distribution() with log probabilities.
+
+    """
+    d = dit.example_dists.Xor()
+    d.set_base(2)
+    d_iid = dit.product_distribution(d)
+    assert d_iid.get_base() == 2
+    assert np.allclose(d_iid.pmf, -3)
+
+
 def test_product_with_badrvs():
     """
     Test product_distribution() with overlapping rvs specification.
@@ -358,5 +358,5 @@ def test_really_big_words():
     pmf = [1/2]*2
     d = Distribution(outcomes, pmf)
     d = d.coalesce([range(30), range(30, 60), range(60, 90)])
-    new_outcomes = (('10'*15,)*3, ('01'*15,)*3)
+    new_outcomes = (('01'*15,)*3, ('10'*15,)*3)
     assert d.outcomes == new_outcomes
@@ -6,10 +6,13 @@ from __future__ import division
 
 import pytest
 
-from dit import Distribution
+import numpy as np
+
+from dit import Distribution, ScalarDistribution
 from dit.exceptions import ditException, InvalidDistribution, InvalidOutcome
 from dit.helpers import construct_alphabets, get_product_func, parse_rvs, \
-                        reorder, normalize_pmfs, numerical_test
+                        reorder, normalize_pmfs, numerical_test, \
+                        outcome_columns, align_pmfs
 
 
 def test_construct_alphabets1():
@@ -88,4 +91,41 @@ def test__numerical_test2():
     # A bad distribution is one with a non-numerical alphabet
     d = Distribution([(0, '0'), (1, '0'), (2, '1'), (3, '1')], [1/8, 1/8, 3/8, 3/8])
     with pytest.raises(TypeError):
-        numerical_test(d)
\ No newline at end of file
+        numerical_test(d)
+
+def test_outcome_columns1():
+    """ Test the union of joint outcomes, over different alphabets """
+    d1 = Distribution(['00', '01', '11'], [1/2, 1/4, 1/4])
+    d2 = Distribution(['10', '01', '22'], [1/3, 1/3, 1/3])
+    outcomes, columns = outcome_columns([d1, d2])
+    assert sorted(outcomes) == ['00', '01', '10', '11', '22']
+    for d, cols in zip([d1, d2], columns):
+        assert [outcomes[i] for i in cols] == list(d.outcomes)
+
+
+def test_outcome_columns2():
+    """ Test the union of scalar outcomes """
+    d1 = ScalarDistribution([1, 2], [1/2, 1/2])
+    d2 = ScalarDistribution([2, 3], [1/2, 1/2])
+    outcomes, columns = outcome_columns([d1, d2])
+    assert outcomes == [1, 2, 3]
+    assert [list(cols) for cols in columns] == [[0, 1], [1, 2]]
+
+
+def test_align_pmfs():
+    """ Test that aligned pmfs are linear and zero off of the support """
+    d1 = Distribution(['00', '11'], [1/2, 1/2])
+    d1.set_base(2)
+    d2 = Distribution(['01', '11'], [1/4, 3/4])
+    outcomes, pmfs = align_pmfs([d1, d2])
+    pmfs = dict(zip(outcomes, pmfs.T))
+    assert np.allclose([pmfs[o] for o in ['00', '01', '11']],
+                       [[1/2, 0], [0, 1/4], [1/2, 3/4]])
+
+
+def test_normalize_pmfs():
+    """ Test pmfs over the union of two supports """
+    d1 = Distribution(['0', '1'], [1/2, 1/2])
+    d2 = Distribution(['1', '2'], [1/4, 3/4])
+    p, q = normalize_pmfs(d1, d2)
+    assert np.allclose(sorted(zip(p, q)), [(0, 3/4), (1/2, 0), (1/2, 1/4)])
@@ -0,0 +1,140 @@
+"""
+Tests for dit.npbatch.
+"""
+
+from __future__ import division
+
+import pytest
+
+import numpy as np
+
+from dit import Distribution, DistributionBatch
+from dit.divergences import kullback_leibler_divergence
+from dit.exceptions import ditException
+from dit.example_dists import Xor
+from dit.multivariate import coinformation, entropy, total_correlation
+from dit.samplespace import CartesianProduct
+from dit.shannon import mutual_information
+
+
+def random_dists(n=5, seed=0):
+    prng = np.random.RandomState(seed)
+    outcomes = ['000', '001', '010', '011', '100', '101', '110', '111']
+    dists = []
+    for _ in range(n):
+        d = Distribution(outcomes, prng.dirichlet(np.ones(8)))
+        d.set_rv_names('XYZ')
+        dists.append(d)
+    return dists
+
+
+def test_from_distributions():
+    dists = random_dists()
+    batch = DistributionBatch.from_distributions(dists)
+    assert len(batch) == 5
+    assert batch.get_rv_names() == ('X', 'Y', 'Z')
+    for d, e in zip(dists, batch):
+        assert d.is_approx_equal(e)
+
+
+def test_from_distributions_union():
+    d1 = Distribution(['00', '11'], [1/2, 1/2])
+    d2 = Distribution(['01', '12'], [1/4, 3/4])
+    batch = DistributionBatch.from_distributions([d1, d2])
+    assert batch.sample_space.alphabets == (('0', '1'), ('0', '1', '2'))
+    assert batch.pmf.shape == (2, 6)
+    assert batch[1]['12'] == pytest.approx(3/4)
+    assert batch[1]['02'] == 0
+
+
+def test_from_distributions_invalid():
+    with pytest.raises(ditException):
+        DistributionBatch.from_distributions([])
+    ss = CartesianProduct(['01', '01'])
+    with pytest.raises(ditException):
+        DistributionBatch.from_distributions([Distribution(['02'], [1])], ss)
+
+
+def test_init_invalid():
+    ss = CartesianProduct(['01', '01'])
+    with pytest.raises(ditException):
+        DistributionBatch(np.ones((2, 3)) / 3, ss)
+
+
+def test_marginal():
+    dists = random_dists()
+    batch = DistributionBatch.from_distributions(dists)
+    marginals = batch.marginal('ZX')
+    assert marginals.get_rv_names() == ('X', 'Z')
+    for d, m in zip(dists, marginals):
+        assert d.marginal('XZ').is_approx_equal(m)
+
+
+@pytest.mark.parametrize(('rvs', 'crvs'), [
+    (None, None),
+    (['X'], None),
+    (['X', 'Y'], ['Z']),
+])
+def test_entropy(rvs, crvs):
+    dists = random_dists()
+    batch = DistributionBatch.from_distributions(dists)
+    H = [entropy(d, rvs, crvs) for d in dists]
+    assert np.allclose(batch.entropy(rvs, crvs), H)
+
+
+@pytest.mark.parametrize(('rvs', 'crvs'), [
+    (None, None),
+    (['X', 'Y'], None),
+    (['XY', 'Z'], None),
+    (['X', 'Y'], ['Z']),
+])
+def test_coinformation_total_correlation(rvs, crvs):
+    dists = random_dists()
+    batch = DistributionBatch.from_distributions(dists)
+    I = [coinformation(d, rvs, crvs) for d in dists]
+    T = [total_correlation(d, rvs, crvs) for d in dists]
+    assert np.allclose(batch.coinformation(rvs, crvs), I)
+    assert np.allclose(batch.total_correlation(rvs, crvs), T)
+
+
+def test_mutual_information():
+    dists = random_dists()
+    batch = DistributionBatch.from_distributions(dists)
+    I = [mutual_information(d, 'X', 'YZ') for d in dists]
+    assert np.allclose(batch.mutual_information('X', 'YZ'), I)
+    I = [coinformation(d, ['X', 'Y'], 'Z') for d in dists]
+    assert np.allclose(batch.mutual_information('X', 'Y', 'Z'), I)
+
+
+def test_xor():
+    batch = DistributionBatch.from_distributions([Xor(), Xor()])
+    assert np.allclose(batch.coinformation(), -1)
+    assert np.allclose(batch.mutual_information([0], [1], [2]), 1)
+
+
+@pytest.mark.parametrize(('rvs', 'crvs'), [
+    (None, None),
+    (['X', 'Y'], None),
+    (['X'], ['Z']),
+])
+def test_kullback_leibler_divergence(rvs, crvs):
+    dists = random_dists()
+    other = random_dists(seed=1)
+    batch = DistributionBatch.from_distributions(dists)
+    DKL = [kullback_leibler_divergence(d, o, rvs, crvs)
+           for d, o in zip(dists, other)]
+    others = DistributionBatch.from_distributions(other)
+    assert np.allclose(batch.kullback_leibler_divergence(others, rvs, crvs), DKL)
+
+    DKL = [kullback_leibler_divergence(d, other[0], rvs, crvs) for d in dists]
+    dkl = batch.kullback_leibler_divergence(other[0], rvs, crvs)
+    assert np.allclose(dkl, DKL)
+
+
+def test_kullback_leibler_divergence_infinite():
+    d1 = Distribution(['0', '1'], [1/2, 1/2])
+    d2 = Distribution(['0', '1'], [1, 0])
+    batch = DistributionBatch.from_distributions([d1, d2])
+    dkl = batch.kullback_leibler_divergence(d2)
+    assert dkl[0] == np.inf
+    assert dkl[1] == pytest.approx(0)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for dit.npcdist.
+"""
+
+from __future__ import division
+
+import pytest
+
+import numpy as np
+
+import dit
+from dit.exceptions import InvalidOutcome
+from dit.npcdist import ConditionalDistribution
+
+
+def test_condition_on_array():
+    """ Test the array of conditional distributions and its lookups """
+    d = dit.example_dists.Xor()
+    pX, pYZgX = d.condition_on([0], lazy=True)
+    assert isinstance(pYZgX, ConditionalDistribution)
+    assert pYZgX.pmf.shape == (2, 4)
+    assert pYZgX.dist.outcomes == ('00', '01', '10', '11')
+    assert np.allclose(pYZgX.pmf, [[1/2, 0, 0, 1/2], [0, 1/2, 1/2, 0]])
+    assert len(pYZgX) == 2
+    assert pYZgX[1].outcomes == ('01', '10')
+    assert pYZgX[-1] is pYZgX[1]
+    assert pYZgX.given('0').outcomes == ('00', '11')
+    with pytest.raises(InvalidOutcome):
+        pYZgX.given('2')
+    with pytest.raises(IndexError):
+        pYZgX[2]
+
+
+@pytest.mark.parametrize('base', ['linear', 2, 'e'])
+def test_entropy(base):
+    """ Test the conditional entropies against dit.shannon """
+    d = dit.random_distribution(3, 3)
+    d.set_rv_names('XYZ')
+    d.set_base(base)
+    pX, pYZgX = d.condition_on('X', lazy=True)
+    H = dit.shannon.conditional_entropy(d, 'YZ', 'X')
+    I = dit.shannon.mutual_information(d, 'X', 'YZ')
+    assert pYZgX.entropy() == pytest.approx(H)
+    assert pYZgX.mutual_information() == pytest.approx(I)
+    Hs = [dit.shannon.entropy(dd) for dd in pYZgX]
+    assert np.allclose(pYZgX.entropies(), Hs)
+
+
+def test_to_array():
+    """ Test the conditional pmf array over the outcomes """
+    d = dit.Distribution(['00', '01', '10'], [1/3] * 3)
+    pX, pYgX = d.condition_on([0], lazy=True)
+    assert np.allclose(pYgX.to_array(), [[1/2, 1/2], [1, 0]])
+    pX = d.copy().marginal([0])
+    pX, pYgX = pX.condition_on([0], rvs=[], lazy=True)
+    assert pYgX.to_array().shape == (2, 1)
+
+
+def test_to_array_dense():
+    """ Test the conditional pmf array over the whole sample space """
+    d = dit.Distribution(['000', '011', '101'], [1/3] * 3)
+    pX, pYgX = d.condition_on([0], lazy=True)
+    assert pYgX.dist.outcomes == ('00', '01', '11')
+    assert np.allclose(pYgX.to_array(), [[1/2, 0, 1/2], [0, 1, 0]])
+    dense = pYgX.to_array(dense=True)
+    assert np.allclose(dense, [[1/2, 0, 0, 1/2], [0, 1, 0, 0]])
+    with np.errstate(divide='ignore'):
+        assert np.array_equal(pYgX.to_array(base=2, dense=True), np.log2(dense))
+
+
+def test_extract():
+    """ Test extracting scalar distributions """
+    d = dit.example_dists.Xor()
+    pX, pYgX = d.condition_on([0], rvs=[1], extract=True, lazy=True)
+    assert not pX.is_joint()
+    assert not pYgX[0].is_joint()
@@ -17,6 +17,7 @@ import scipy.stats as sps
 from dit.npdist import Distribution, ScalarDistribution, _make_distribution
 from dit.exceptions import ditException, InvalidDistribution, InvalidOutcome
 from dit.samplespace import CartesianProduct
+from dit.shannon import entropy
 
 from itertools import product
 
@@ -145,6 +146,30 @@ def test_make_distribution():
     assert d.outcomes == ('0', '1')
 
 
+def test_from_dense_pmf1():
+    pmf = np.arange(1, 13).reshape(2, 3, 2) / 78
+    ss = CartesianProduct([range(2), range(3), range(2)])
+    d = Distribution.from_dense_pmf(pmf, ss)
+    assert d.is_dense()
+    assert d._sample_space is ss
+    assert d.alphabet is ss.alphabets
+    assert np.shares_memory(d.pmf, pmf)
+    assert d.is_approx_equal(Distribution.from_ndarray(pmf))
+    assert d.is_compact()
+    assert hash(d.outcomes) == hash(tuple(d.outcomes))
+    d = Distribution.from_dense_pmf(pmf, ss, compact=False)
+    assert isinstance(d.outcomes, tuple)
+
+
+def test_from_dense_pmf2():
+    pmf = np.log2([1/2, 0, 0, 1/2])
+    ss = CartesianProduct(['01', '01'], product=product)
+    d = Distribution.from_dense_pmf(pmf, ss, base=2)
+    d.make_sparse()
+    assert d.outcomes == (('0', '0'), ('1', '1'))
+    assert d[('0', '0')] == pytest.approx(-1)
+
+
 def test_setitem1():
     d = Distribution(['0', '1'], [1/2, 1/2])
     with pytest.raises(InvalidOutcome):
@@ -168,6 +193,40 @@ def test_coalesce():
     assert d.outcome_length() == 2
 
 
+@pytest.mark.parametrize('base', ['linear', 2, 'e'])
+def test_coalesce_repeats(base):
+    outcomes = ['000', '011', '101', '110', '111']
+    pmf = [1/8, 1/8, 1/4, 1/4, 1/4]
+    d = Distribution(outcomes, pmf)
+    d.set_base(base)
+    d2 = d.coalesce([[2, 0], [1, 1]])
+    assert d2.outcomes == (('00', '00'), ('01', '11'), ('10', '11'),
+                           ('11', '00'), ('11', '11'))
+    d2.set_base('linear')
+    assert np.allclose(d2.pmf, [1/8, 1/4, 1/8, 1/4, 1/4])
+
+
+def test_coalesce_extract():
+    outcomes = [(0, 'a'), (1, 'b'), (2, 'a')]
+    pmf = [1/2, 1/4, 1/4]
+    d = Distribution(outcomes, pmf)
+    d2 = d.coalesce([[1, 0, 1]], extract=True)
+    assert d2.outcomes == (('a', 0, 'a'), ('a', 2, 'a'), ('b', 1, 'b'))
+    assert np.allclose(d2.pmf, [1/2, 1/4, 1/4])
+
+
+def test_coalesce_codes():
+    outcomes = ['00', '11']
+    pmf = [1/2, 1/2]
+    d = Distribution(outcomes, pmf, sample_space=['00', '01', '10', '11'])
+    d2 = d.coalesce([[1]], extract=True)
+    assert d2.outcomes == ('0', '1')
+    d['01'] = 1/2
+    d2 = d.coalesce([[0, 1]], extract=True)
+    assert d2.outcomes == ('00', '01', '11')
+    assert np.allclose(d2.pmf, [1/2, 1/2, 1/2])
+
+
 def test_copy():
     outcomes = ['0', '1']
     pmf = [1/2, 1/2]
@@ -242,3 +301,147 @@ def test_from_rv():
     d1 = Distribution.from_rv_discrete(rv)
     d2 = Distribution([(1,), (2,)], [3/10, 7/10])
     assert d1.is_approx_equal(d2)
+
+
+@pytest.mark.parametrize('base', ['linear', 2, 'e'])
+@pytest.mark.parametrize('rvs', [[0], [1, 3], [0, 1, 2, 3], []])
+def test_marginal_dense(base, rvs):
+    outcomes = list(product('012', repeat=4))
+    pmf = np.arange(1, 82) / 3321
+    d = Distribution(outcomes, pmf, sparse=False)
+    d.set_base(base)
+    d1 = d.marginal(rvs)
+    d2 = d.coalesce([rvs], extract=True)
+    assert d1.is_dense()
+    assert d1.outcomes == d2.outcomes
+    assert np.allclose(d1.pmf, d2.pmf)
+
+
+def test_marginal_dense_unsorted():
+    outcomes = [(1, 1), (0, 0), (0, 1), (1, 0)]
+    ss = CartesianProduct([[0, 1], [0, 1]])
+    d = Distribution(outcomes, [.4, .1, .2, .3], sort=False, sample_space=ss)
+    assert np.allclose(d.marginal([0]).pmf, [.3, .7])
+    assert np.allclose(d.marginal([1]).pmf, [.4, .6])
+    assert entropy(d, [0]) == pytest.approx(0.8812908992306927)
+
+
+def test_marginal_dense_sparse():
+    outcomes = ['000', '011', '101', '110']
+    pmf = [1/2, 1/2, 0, 0]
+    d = Distribution(outcomes, pmf, sparse=False)
+    d.make_sparse(trim=False)
+    d1 = d.marginal([0])
+    assert d1.is_sparse()
+    assert d1.outcomes == ('0',)
+
+
+def test_make_compact():
+    outcomes = ['000', '011', '101', '110']
+    pmf = [1/4] * 4
+    d = Distribution(outcomes, pmf)
+    d.make_compact()
+    assert d.is_compact()
+    assert d.outcomes == tuple(outcomes)
+    assert d['011'] == pytest.approx(1/4)
+    assert d['001'] == 0
+    assert '001' not in d
+    d2 = d.marginal([0, 2])
+    assert d2.is_compact()
+    assert d2.outcomes == ('00', '01', '10', '11')
+    assert np.allclose(d2.pmf, [1/4] * 4)
+
+
+def test_compact_mutation():
+    d = Distribution(['00', '11'], [1/2, 1/2])
+    d.make_compact()
+    d['01'] = 0
+    assert d.outcomes == ('00', '01', '11')
+    del d['01']
+    assert d.outcomes == ('00', '11')
+    d.make_dense()
+    assert d.is_compact()
+    assert d.outcomes == ('00', '01', '10', '11')
+    assert np.allclose(d.pmf, [1/2, 0, 0, 1/2])
+    d.make_sparse()
+    assert d.outcomes == ('00', '11')
+
+
+def test_compact_insert():
+    d = Distribution(['01', '12', '20'], [1/3] * 3)
+    d.make_compact()
+    for outcome in ['22', '00', '11', '02']:
+        d[outcome] = 0
+    assert d.outcomes == ('00', '01', '02', '11', '12', '20', '22')
+    assert np.allclose(d.pmf, [0, 1/3, 0, 0, 1/3, 1/3, 0])
+    assert d['20'] == pytest.approx(1/3)
+
+
+def test_compact_condition_on():
+    outcomes = ['000', '011', '101', '110']
+    pmf = [1/4] * 4
+    d = Distribution(outcomes, pmf)
+    d.make_compact()
+    cdist, dists = d.condition_on([0])
+    assert cdist.outcomes == ('0', '1')
+    assert dists[0].outcomes == ('00', '11')
+    assert dists[1].outcomes == ('01', '10')
+    assert all(np.allclose(dd.pmf, [1/2, 1/2]) for dd in dists)
+
+
+def test_compact_nonproduct():
+    d = Distribution(['00', '11'], [1/2, 1/2], sample_space=['00', '11'])
+    with pytest.raises(ditException):
+        d.make_compact()
+
+
+def test_from_codes():
+    codes = [[0, 1], [1, 0], [0, 1], [2, 2]]
+    d = Distribution.from_codes(codes, ['bac', 'xyz'], outcome_class=str)
+    assert d.is_compact()
+    assert d.outcomes == ('ax', 'by', 'cz')
+    assert np.allclose(d.pmf, [1/4, 1/2, 1/4])
+
+
+def test_from_codes_invalid():
+    with pytest.raises(InvalidOutcome):
+        Distribution.from_codes([[0, 2]], ['01', '01'])
+    with pytest.raises(InvalidDistribution):
+        Distribution.from_codes([[0, 1]], ['01', '01'], pmf=[1/2, 1/2])
+
+
+def test_marginal_cache():
+    d = Distribution(['000', '011', '101', '110'], [1/4] * 4)
+    assert d.marginal_cache_info() is None
+    d.enable_marginal_cache(maxsize=2)
+    d.set_rv_names('XYZ')
+    d1 = d.marginal('XY')
+    d2 = d.marginal('YX')
+    assert d1.is_approx_equal(d2)
+    assert d2.get_rv_names() == ('X', 'Y')
+    info = d.marginal_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    # Modifying a returned marginal does not affect the cache.
+    d2['00'] = 1
+    assert d.marginal('XY')['00'] == pytest.approx(1/4)
+    d.marginal('X')
+    d.marginal('Z')
+    assert d.marginal_cache_info().currsize == 2
+
+
+@pytest.mark.parametrize('mutate', [
+    lambda d: d.__setitem__('000', 1/2),
+    lambda d: d.__delitem__('000'),
+    lambda d: d.make_dense(),
+    lambda d: d.make_sparse(),
+    lambda d: d.set_base(2),
+    lambda d: d.normalize(),
+    lambda d: d.set_rv_names('ABC'),
+])
+def test_marginal_cache_invalidation(mutate):
+    d = Distribution(['000', '011', '101', '110'], [1/4] * 4)
+    d.enable_marginal_cache()
+    d.marginal([0])
+    assert d.marginal_cache_info().currsize == 1
+    mutate(d)
+    assert d.marginal_cache_info().currsize == 0
@@ -306,6 +306,31 @@ def test_matmul():
     assert (d1.__matmul__(d1)).is_approx_equal(d2)
 
 
+def test_matmul_joint():
+    d1 = Distribution(['00', '11'], [1/2, 1/2])
+    d2 = ScalarDistribution([1, 2], [1/4, 3/4])
+    d3 = d1.__matmul__(d2)
+    assert d3.outcomes == (('0', '0', 1), ('0', '0', 2),
+                           ('1', '1', 1), ('1', '1', 2))
+    assert np.allclose(d3.pmf, [1/8, 3/8, 1/8, 3/8])
+
+
+def test_matmul_nested():
+    d1 = ScalarDistribution([(0, 1), (2, 3)], [1/2, 1/2])
+    d2 = uniform_scalar_distribution(range(2))
+    d3 = d1.__matmul__(d2)
+    assert d3.outcomes == ((0, 1, 0), (0, 1, 1), (2, 3, 0), (2, 3, 1))
+    assert np.allclose(d3.pmf, 1/4)
+
+
+def test_matmul_wide_sparse():
+    d1 = Distribution(['0'*40, '1'*40], [1/2, 1/2])
+    d2 = ScalarDistribution([0, 1], [1/2, 1/2])
+    d3 = d1.__matmul__(d2)
+    assert len(d3) == 4
+    assert np.allclose(d3.pmf, 1/4)
+
+
 def test_cmp_fail():
     d1 = uniform_scalar_distribution(range(1,7))
     with pytest.raises(NotImplementedError):
@@ -0,0 +1,103 @@
+"""
+Tests for dit.planner.
+"""
+
+from __future__ import division
+
+import pytest
+
+import numpy as np
+
+from dit import ScalarDistribution as SD, evaluate, random_distribution
+from dit.divergences import kullback_leibler_divergence
+from dit.exceptions import ditException
+from dit.multivariate import (caekl_mutual_information,
+                              coinformation,
+                              dual_total_correlation,
+                              entropy as multivariate_entropy,
+                              residual_entropy,
+                              total_correlation,
+                              tse_complexity)
+from dit.shannon import (conditional_entropy, entropy, mutual_information,
+                         shared_entropy_table)
+
+
+def test_evaluate1():
+    """ Test that planned values match the measures called directly """
+    d = random_distribution(4, 2, prng=np.random.RandomState(0))
+    d.set_rv_names('WXYZ')
+    e = random_distribution(4, 2, prng=np.random.RandomState(1))
+    e.set_rv_names('WXYZ')
+    specs = [
+        entropy,
+        (entropy, {'rvs': 'WX'}),
+        (conditional_entropy, {'rvs_X': 'W', 'rvs_Y': 'XY'}),
+        (mutual_information, {'rvs_X': 'W', 'rvs_Y': 'Z'}),
+        (multivariate_entropy, {'rvs': 'X', 'crvs': 'Z'}),
+        coinformation,
+        (coinformation, {'rvs': ['W', 'X'], 'crvs': 'Y'}),
+        total_correlation,
+        dual_total_correlation,
+        (residual_entropy, {'rvs': ['WX', 'Y']}),
+        tse_complexity,
+        caekl_mutual_information,
+        (kullback_leibler_divergence, {'dist2': e}),
+    ]
+    values, _ = evaluate(d, specs)
+    for (measure, kwargs), value in zip([(s, {}) if callable(s) else s
+                                         for s in specs], values):
+        assert value == pytest.approx(measure(d, **kwargs))
+
+
+def test_evaluate2():
+    """ Test that each marginal is computed once, from a small parent """
+    d = random_distribution(4, 2, prng=np.random.RandomState(0))
+    specs = [
+        (total_correlation, {'rvs': [[0], [1]]}),
+        (mutual_information, {'rvs_X': [0], 'rvs_Y': [1]}),
+        (entropy, {'rvs': [0, 1]}),
+    ]
+    _, marginals = evaluate(d, specs)
+    computed = [rvs for rvs, _, _ in marginals]
+    assert sorted(computed) == [(0,), (0, 1), (1,)]
+    assert dict((rvs, parent) for rvs, parent, _ in marginals)[(0,)] == (0, 1)
+    assert all(seconds >= 0 for _, _, seconds in marginals)
+
+
+def test_evaluate_reductions():
+    """ Test that each subset needed by several measures is summed out once """
+    d = random_distribution(6, 2, prng=np.random.RandomState(0))
+    specs = [tse_complexity, caekl_mutual_information, total_correlation]
+    values, marginals = evaluate(d, specs)
+    computed = [rvs for rvs, _, _ in marginals]
+    # Every nonempty subset is needed, and the empty set needs no marginal.
+    assert len(set(computed)) == len(computed) == 2**6 - 1
+    for measure, value in zip(specs, values):
+        assert value == pytest.approx(measure(d))
+
+
+def test_evaluate_plan():
+    """ Test that the planned subsets are all the measures look up """
+    d = random_distribution(5, 2, prng=np.random.RandomState(0))
+    d.enable_entropy_table()
+    kwargs = {'rvs': [[0, 1], [2]], 'crvs': [3]}
+    specs = [(measure, kwargs) for measure in [coinformation,
+                                               total_correlation,
+                                               dual_total_correlation,
+                                               residual_entropy,
+                                               multivariate_entropy,
+                                               tse_complexity,
+                                               caekl_mutual_information]]
+    specs.append((mutual_information, {'rvs_X': [0], 'rvs_Y': [4]}))
+    _, marginals = evaluate(d, specs)
+    # The empty set needs no marginal, and is not logged.
+    assert len(shared_entropy_table(d)) == len(marginals) + 1
+
+
+def test_evaluate3():
+    """ Test invalid input """
+    d = random_distribution(2, 2)
+    with pytest.raises(ditException):
+        evaluate(d, [(entropy, [0])])
+    with pytest.raises(ditException):
+        evaluate(SD([1/2, 1/2]), [entropy])
@@ -1,6 +1,8 @@
 
 import pytest
 
+import numpy as np
+
 from dit.samplespace import SampleSpace, CartesianProduct
 
 import dit
@@ -112,3 +114,28 @@ def test_nested():
     assert list(ss2) == [(0,'11'), (0,'10'), (0,'01'), (0,'00')]
     ss2.sort()
     assert list(ss2) == [(0,'00'), (0,'01'), (0,'10'), (0,'11')]
+
+
+def test_index_many():
+    ss = CartesianProduct(['ab', '012'], dit.helpers.get_product_func(str))
+    outcomes = ['b2', 'a0', 'a2']
+    idx = ss.index_many(outcomes)
+    assert np.array_equal(idx, [ss.index(o) for o in outcomes])
+    codes = ss.unravel(idx)
+    assert np.array_equal(codes[0], [1, 0, 0])
+    assert np.array_equal(codes[1], [2, 0, 2])
+    assert np.array_equal(ss.ravel(codes), idx)
+    with pytest.raises(ValueError):
+        ss.index_many(['b3'])
+    with pytest.raises(ValueError):
+        ss.index_many(['b'])
+
+
+def test_ravel_huge():
+    ss = CartesianProduct([range(2**20)] * 4)
+    codes = [np.array([1, 2**20 - 1])] * 4
+    idx = ss.ravel(codes)
+    assert idx[0] == 1 + 2**20 + 2**40 + 2**60
+    assert idx[1] == 2**80 - 1
+    unraveled = ss.unravel(idx)
+    assert all(np.array_equal(a, b) for a, b in zip(unraveled, codes))
@@ -12,7 +12,8 @@ import numpy as np
 
 from dit import Distribution, ditParams
 from dit.algorithms.channelcapacity import channel_capacity_joint
-from dit.multivariate import entropy
+from dit.example_dists import n_mod_m
+from dit.multivariate import entropy, tse_complexity_estimate
 from dit.params import reset_params
 from dit.utils.units import ureg
 
@@ -63,3 +64,14 @@ def test_cc():
     reset_params()
     true = ureg.Quantity(0.3219280796196524, ureg.bit)
     assert float(cc) == pytest.approx(true)
+
+
+def test_tuple_estimate():
+    """
+    Test that an estimate and its error have the same units.
+    """
+    d = n_mod_m(4, 2)
+    ditParams['units'] = True
+    tse, error = tse_complexity_estimate(d, samples=2)
+    reset_params()
+    assert tse.units == error.units == ureg.bit